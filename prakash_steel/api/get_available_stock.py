@@ -1,5 +1,7 @@
 import frappe
 
+from prakash_steel.utils.stock_checkpoint import get_stock_as_of
+
 
 @frappe.whitelist()
 def get_available_stock(item_code):
@@ -66,3 +68,18 @@ def get_available_stock_for_warehouse(item_code, warehouse):
             frappe.get_traceback(), "get_available_stock_for_warehouse_error"
         )
         return 0
+
+
+@frappe.whitelist()
+def get_stock_as_of_date(as_of_date, item_codes=None, warehouse=None):
+    """
+    Stock qty per item at the end of as_of_date, optionally for some items
+    (JSON list) and one warehouse.
+
+    Read from the month-end Stock Closing Checkpoint plus the Stock Ledger
+    Entries after it, so historical dates cost the same as recent ones.
+    """
+    if isinstance(item_codes, str):
+        item_codes = frappe.parse_json(item_codes)
+
+    return get_stock_as_of(as_of_date, item_codes=item_codes, warehouse=warehouse)
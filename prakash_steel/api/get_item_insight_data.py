@@ -1,12 +1,68 @@
 import json
-from io import BytesIO
 from typing import Any
 
 import frappe
-from frappe.utils import flt
+from frappe import _
+from frappe.utils import cint, flt
 from frappe.utils.file_manager import save_file
 from frappe.utils.pdf import get_pdf
 
+from prakash_steel.utils import item_search
+from prakash_steel.utils.xlsx_export import (
+    BACKGROUND_EXPORT_ROWS,
+    enqueue_xlsx_export,
+    make_xlsx_file,
+)
+
+INSIGHT_PAGE_LENGTH = 100
+
+# Items per get_item_insight_page call when a background export walks every page
+EXPORT_PAGE_LENGTH = 500
+
+# Sortable metrics for get_item_insight_page, computed per item (alias i) with the same
+# rules as the bulk helpers; missing values sort as 0 / the earliest date
+_IN_RANGE = "(%(from_date)s IS NULL OR %(to_date)s IS NULL OR {column} BETWEEN %(from_date)s AND %(to_date)s)"
+INSIGHT_SORT_FIELDS = {
+    "item_code": "i.name",
+    "last_production_date": f"""IFNULL(CASE
+        WHEN IFNULL(i.custom_desc_code, '') LIKE '%%Bright Bar%%' THEN (
+            SELECT MAX(bbp.production_date) FROM `tabBright Bar Production` bbp
+            WHERE bbp.finished_good = i.name AND bbp.docstatus = 1
+                AND {_IN_RANGE.format(column="bbp.production_date")})
+        ELSE (
+            SELECT MAX(fw.posting_date) FROM `tabFinish Weight` fw
+            WHERE fw.item_code = i.name AND fw.docstatus = 1
+                AND {_IN_RANGE.format(column="fw.posting_date")})
+        END, '1900-01-01')""",
+    "last_sales_date": f"""IFNULL((
+        SELECT MAX(so.transaction_date) FROM `tabSales Order Item` soi
+        INNER JOIN `tabSales Order` so ON so.name = soi.parent
+        WHERE soi.item_code = i.name AND so.docstatus = 1
+            AND so.status NOT IN ('Closed', 'Cancelled')
+            AND {_IN_RANGE.format(column="so.transaction_date")}), '1900-01-01')""",
+    "pending_sales_order_qty": """IFNULL((
+        SELECT SUM(soi.qty - IFNULL(soi.delivered_qty, 0)) FROM `tabSales Order Item` soi
+        INNER JOIN `tabSales Order` so ON so.name = soi.parent
+        WHERE soi.item_code = i.name AND so.docstatus = 1
+            AND so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
+            AND (soi.qty - IFNULL(soi.delivered_qty, 0)) > 0), 0)""",
+    "last_purchase_date": f"""IFNULL((
+        SELECT MAX(po.transaction_date) FROM `tabPurchase Order Item` poi
+        INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
+        WHERE poi.item_code = i.name AND po.docstatus = 1
+            AND po.status NOT IN ('Closed', 'Cancelled')
+            AND {_IN_RANGE.format(column="po.transaction_date")}), '1900-01-01')""",
+    "pending_purchase_order_qty": """IFNULL((
+        SELECT SUM(poi.qty - IFNULL(poi.received_qty, 0)) FROM `tabPurchase Order Item` poi
+        INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
+        WHERE poi.item_code = i.name AND po.docstatus = 1
+            AND po.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
+            AND (poi.qty - IFNULL(poi.received_qty, 0)) > 0), 0)""",
+    "total_stock_on_hand": """IFNULL((
+        SELECT SUM(b.actual_qty) FROM `tabBin` b
+        WHERE b.item_code = i.name AND b.warehouse != 'Rejected Warehouse'), 0)""",
+}
+
 
 @frappe.whitelist()
 def get_item_insight_data(
@@ -76,20 +132,104 @@ def get_item_insight_data(
         )
         # Keep only items that have at least one transaction
         items = [item for item in items if item.name in active_items]
-        if not items:
-            return []
-        # Recompute code lists after filtering
-        all_codes = []
-        rolled_codes = []
-        bright_codes = []
-        for item in items:
-            code = item.name
-            all_codes.append(code)
-            desc = item.custom_desc_code or ""
-            if "Bright Bar" in desc:
-                bright_codes.append(code)
-            else:
-                rolled_codes.append(code)
+
+    return _build_insight_rows(items, from_date, to_date)
+
+
+@frappe.whitelist()
+def get_item_insight_page(
+    from_date=None,
+    to_date=None,
+    item_code=None,
+    item_grade=None,
+    category_name=None,
+    description_code=None,
+    sort_by=None,
+    sort_order="asc",
+    cursor=None,
+    page_length=None,
+):
+    """
+    One page of Item Insight rows, keyset-paginated on (sort value, item code).
+
+    Item filters and the "has a transaction in the date range" check run in SQL, so only
+    the page's items go through the bulk helpers. sort_by is one of INSIGHT_SORT_FIELDS;
+    metric sorts compute just that metric per item in the same query.
+    Returns {data, next_cursor, total}; total is only counted for the first page.
+    """
+    if sort_by not in INSIGHT_SORT_FIELDS:
+        sort_by = "item_code"
+    sort_order = "desc" if (sort_order or "").lower() == "desc" else "asc"
+    page_length = cint(page_length) or INSIGHT_PAGE_LENGTH
+
+    conditions, values = _get_insight_item_conditions(
+        from_date, to_date, item_code, item_grade, category_name, description_code
+    )
+    values["limit"] = page_length + 1
+
+    cursor_clause = ""
+    if cursor:
+        cursor_values = frappe.parse_json(cursor)
+        if not isinstance(cursor_values, list) or len(cursor_values) != 2:
+            frappe.throw(_("Invalid cursor"))
+        values["cursor_value"], values["cursor_name"] = cursor_values
+        comparison = ">" if sort_order == "asc" else "<"
+        cursor_clause = f"WHERE (sort_value, name) {comparison} (%(cursor_value)s, %(cursor_name)s)"
+
+    items = frappe.db.sql(
+        f"""
+        SELECT * FROM (
+            SELECT
+                i.name,
+                i.item_name,
+                i.item_code,
+                i.custom_grade AS item_grade,
+                i.custom_category_name AS category_name,
+                i.custom_desc_code,
+                {INSIGHT_SORT_FIELDS[sort_by]} AS sort_value
+            FROM `tabItem` i
+            WHERE {conditions}
+        ) page
+        {cursor_clause}
+        ORDER BY sort_value {sort_order}, name {sort_order}
+        LIMIT %(limit)s
+        """,
+        values,
+        as_dict=True,
+    )
+
+    next_cursor = None
+    if len(items) > page_length:
+        items = items[:page_length]
+        next_cursor = frappe.as_json([items[-1].sort_value, items[-1].name], indent=None)
+
+    total = None
+    if not cursor:
+        total = frappe.db.sql(f"SELECT COUNT(*) FROM `tabItem` i WHERE {conditions}", values)[0][0]
+
+    return {
+        "data": _build_insight_rows(items, from_date, to_date),
+        "next_cursor": next_cursor,
+        "total": total,
+    }
+
+
+def _build_insight_rows(items, from_date, to_date):
+    """Run the bulk helpers for `items` only and merge them into Item Insight rows (in item order)."""
+    if not items:
+        return []
+
+    all_codes = []
+    rolled_codes = []
+    bright_codes = []
+    for item in items:
+        code = item.name
+        all_codes.append(code)
+        desc = item.custom_desc_code or ""
+        if "Bright Bar" in desc:
+            bright_codes.append(code)
+        else:
+            rolled_codes.append(code)
 
     # ── Bulk fetch all data (few queries instead of N × 6+) ──
     prod_date_map = _bulk_production_dates(
@@ -147,6 +287,69 @@ def get_item_insight_data(
     return result
 
 
+def _get_insight_item_conditions(
+    from_date, to_date, item_code, item_grade, category_name, description_code
+):
+    """
+    WHERE clause over `tabItem` i matching get_item_insight_data's item filters, including
+    the _get_items_with_transactions check when a date range is given.
+    """
+    conditions = ["i.is_stock_item = 1"]
+    # Always bound: the metric sort expressions test them for NULL
+    values = {"from_date": from_date or None, "to_date": to_date or None}
+
+    if item_code:
+        conditions.append("i.name = %(item_code)s")
+        values["item_code"] = item_code
+    if item_grade:
+        conditions.append("i.custom_grade = %(item_grade)s")
+        values["item_grade"] = item_grade
+    if category_name:
+        conditions.append("i.custom_category_name = %(category_name)s")
+        values["category_name"] = category_name
+    if description_code:
+        conditions.append("i.custom_desc_code = %(description_code)s")
+        values["description_code"] = description_code
+
+    if from_date and to_date:
+        conditions.append(
+            """(
+            EXISTS (
+                SELECT 1 FROM `tabSales Order Item` soi
+                INNER JOIN `tabSales Order` so ON so.name = soi.parent
+                WHERE soi.item_code = i.name AND so.docstatus = 1
+                    AND so.status NOT IN ('Closed', 'Cancelled')
+                    AND so.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+            )
+            OR EXISTS (
+                SELECT 1 FROM `tabPurchase Order Item` poi
+                INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
+                WHERE poi.item_code = i.name AND po.docstatus = 1
+                    AND po.status NOT IN ('Closed', 'Cancelled')
+                    AND po.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+            )
+            OR (
+                IFNULL(i.custom_desc_code, '') NOT LIKE '%%Bright Bar%%'
+                AND EXISTS (
+                    SELECT 1 FROM `tabFinish Weight` fw
+                    WHERE fw.item_code = i.name AND fw.docstatus = 1
+                        AND fw.posting_date BETWEEN %(from_date)s AND %(to_date)s
+                )
+            )
+            OR (
+                IFNULL(i.custom_desc_code, '') LIKE '%%Bright Bar%%'
+                AND EXISTS (
+                    SELECT 1 FROM `tabBright Bar Production` bbp
+                    WHERE bbp.finished_good = i.name AND bbp.docstatus = 1
+                        AND bbp.production_date BETWEEN %(from_date)s AND %(to_date)s
+                )
+            )
+        )"""
+        )
+
+    return " AND ".join(conditions), values
+
+
 # ───────────────────────────────────────────────────────────────────────────
 # Bulk helper functions
 # ───────────────────────────────────────────────────────────────────────────
@@ -496,55 +699,19 @@ def _bulk_inventory_data(item_codes):
 @frappe.whitelist()
 def search_items(query, limit=20):
     """
-    Search for items by item code or item name
-    Returns items with their name, item_name, and item_group
+    Search for items by item code, name, grade, category or description code
+    Returns ranked items with their name, item_name, and item_group
     """
-    limit = int(limit)
-
-    # If no query, return top items
-    if not query or query.strip() == "":
-        items = frappe.db.sql(
-            """
-			SELECT 
-				name,
-				item_name,
-				item_group
-			FROM `tabItem`
-			WHERE is_stock_item = 1
-			ORDER BY name
-			LIMIT %(limit)s
-		""",
-            {"limit": limit},
-            as_dict=True,
-        )
-    else:
-        # Search by item code or item name
-        items = frappe.db.sql(
-            """
-			SELECT 
-				name,
-				item_name,
-				item_group
-			FROM `tabItem`
-			WHERE is_stock_item = 1
-				AND (
-					name LIKE %(query)s
-					OR item_name LIKE %(query)s
-				)
-			ORDER BY 
-				CASE 
-					WHEN name LIKE %(exact_query)s THEN 1
-					WHEN item_name LIKE %(exact_query)s THEN 2
-					ELSE 3
-				END,
-				name
-			LIMIT %(limit)s
-		""",
-            {"query": f"%{query}%", "exact_query": f"{query}%", "limit": limit},
-            as_dict=True,
-        )
+    return item_search.search_items(query, limit=cint(limit) or 20)
 
-    return items
+
+@frappe.whitelist()
+def search_items_for_picker(query=None, limit=20):
+    """
+    Debounce-friendly item search: echoes the query so the client can drop replies
+    that arrive after the user has typed further.
+    """
+    return {"query": query or "", "results": item_search.search_items(query, limit=cint(limit) or 20)}
 
 
 @frappe.whitelist()
@@ -562,56 +729,14 @@ def search_item_categories(
     This is used to populate the Category Name suggestions based on the selected Item Grade.
     """
     filters = filters or {}
-    item_grade = filters.get("item_grade")
-
-    if not item_grade:
-        # If no grade selected, fall back to standard Item Category search
-        return frappe.db.sql(
-            """
-			SELECT 
-				name,
-				category_name
-			FROM `tabItem Category`
-			WHERE
-				(name LIKE %(txt)s OR category_name LIKE %(txt)s)
-			ORDER BY name
-			LIMIT %(page_len)s OFFSET %(start)s
-		""",
-            {
-                "txt": f"%{txt}%",
-                "page_len": page_len,
-                "start": start,
-            },
-        )
-
-    return frappe.db.sql(
-        """
-		SELECT DISTINCT
-			ic.name,
-			ic.category_name
-		FROM `tabItem Category` ic
-		INNER JOIN `tabItem` i ON i.custom_category_name = ic.name
-		WHERE
-			i.custom_grade = %(item_grade)s
-			AND (
-				ic.name LIKE %(txt)s
-				OR ic.category_name LIKE %(txt)s
-			)
-		ORDER BY ic.name
-		LIMIT %(page_len)s OFFSET %(start)s
-	""",
-        {
-            "item_grade": item_grade,
-            "txt": f"%{txt}%",
-            "page_len": page_len,
-            "start": start,
-        },
+    return item_search.search_item_categories(
+        txt, item_grade=filters.get("item_grade"), start=cint(start), page_len=cint(page_len) or 20
     )
 
 
 @frappe.whitelist()
 def export_item_insight_excel(filters: str | None = None) -> dict[str, Any]:
-    """Export item insight data to Excel and return file URL."""
+    """Export item insight data to Excel and return file URL (or queue it when large)."""
 
     filters_dict: dict[str, Any] = {}
     if filters:
@@ -620,11 +745,64 @@ def export_item_insight_excel(filters: str | None = None) -> dict[str, Any]:
         except Exception:
             frappe.throw("Invalid filters JSON")
 
-    data = get_item_insight_data(**filters_dict)
+    # Decide with a COUNT before building any rows, so a large export is only built once, in the job
+    item_count = _count_insight_items(filters_dict)
+    if not item_count:
+        frappe.throw("No data to export")
+
+    file_name = "Item Insight Dashboard.xlsx"
+    if item_count > BACKGROUND_EXPORT_ROWS:
+        # The File link is sent with the xlsx_export_ready realtime event
+        return enqueue_xlsx_export(
+            "prakash_steel.api.get_item_insight_data.get_item_insight_sheet",
+            file_name,
+            filters_dict=filters_dict,
+        )
 
+    data = get_item_insight_data(**filters_dict)
     if not data:
         frappe.throw("No data to export")
 
+    sheet_name, columns, rows, header_style = get_item_insight_sheet(filters_dict, data=data)
+    xlsx_buffer = make_xlsx_file(sheet_name, columns, rows, header_style)
+
+    saved_file = save_file(
+        fname=file_name,
+        content=xlsx_buffer.getvalue(),
+        dt=None,
+        dn=None,
+        is_private=1,
+    )
+
+    return {"file_url": saved_file.file_url}
+
+
+def _count_insight_items(filters_dict: dict[str, Any]) -> int:
+    """Number of items get_item_insight_data returns for these filters, from one COUNT query."""
+    conditions, values = _get_insight_item_conditions(
+        filters_dict.get("from_date"),
+        filters_dict.get("to_date"),
+        filters_dict.get("item_code"),
+        filters_dict.get("item_grade"),
+        filters_dict.get("category_name"),
+        filters_dict.get("description_code"),
+    )
+    count = frappe.db.sql(f"SELECT COUNT(*) FROM `tabItem` i WHERE {conditions}", values)[0][0]
+
+    limit = cint(filters_dict.get("limit"))
+    return min(count, limit) if limit else count
+
+
+def get_item_insight_sheet(filters_dict: dict[str, Any], data: list | None = None):
+    """
+    Return (sheet_name, columns, rows, header_style) of the item insight export for make_xlsx_file.
+
+    Without `data` (the background export) the items are read page by page, so only one
+    page of items and its bulk maps are held while the sheet is written.
+    """
+    if data is None:
+        data = _iter_item_insight_pages(filters_dict)
+
     # Define column headers
     column_labels = [
         "Item Code",
@@ -649,144 +827,96 @@ def export_item_insight_excel(filters: str | None = None) -> dict[str, Any]:
         "Projected Qty",
         "Total Stock On Hand",
     ]
+    columns = [{"label": label} for label in column_labels]
+
+    return "Item Insight", columns, _iter_item_insight_rows(data or []), True
+
+
+def _iter_item_insight_pages(filters_dict: dict[str, Any]):
+    """Yield the items of get_item_insight_data in item code order, one get_item_insight_page at a time."""
+    limit = cint(filters_dict.get("limit"))
+    yielded = 0
+    cursor = None
+    while True:
+        page = get_item_insight_page(
+            from_date=filters_dict.get("from_date"),
+            to_date=filters_dict.get("to_date"),
+            item_code=filters_dict.get("item_code"),
+            item_grade=filters_dict.get("item_grade"),
+            category_name=filters_dict.get("category_name"),
+            description_code=filters_dict.get("description_code"),
+            sort_by="item_code",
+            cursor=cursor,
+            page_length=EXPORT_PAGE_LENGTH,
+        )
+        for item in page["data"]:
+            if limit and yielded >= limit:
+                return
+            yielded += 1
+            yield item
+
+        cursor = page["next_cursor"]
+        if not cursor:
+            return
 
-    # Flatten data to include warehouse rows
-    rows = []
+
+def _iter_item_insight_rows(data):
+    """Yield one row per item and warehouse (flattened lazily, so the sheet is written as it is built)."""
     for item in data:
-        warehouse_stock = item.get("warehouse_stock", [])
+        item_values = [
+            item.get("item_code", ""),
+            item.get("item_name", ""),
+            item.get("item_grade", ""),
+            item.get("category_name", ""),
+            (
+                frappe.format(item.get("last_production_date"), {"fieldtype": "Date"})
+                if item.get("last_production_date")
+                else ""
+            ),
+            flt(item.get("last_production_quantity", 0), 2),
+            item.get("last_sales_party", ""),
+            (
+                frappe.format(item.get("last_sales_date"), {"fieldtype": "Date"})
+                if item.get("last_sales_date")
+                else ""
+            ),
+            flt(item.get("last_sales_quantity", 0), 2),
+            flt(item.get("last_sales_rate", 0), 2),
+            flt(item.get("pending_sales_order_qty", 0), 2),
+            item.get("last_purchase_party", ""),
+            (
+                frappe.format(item.get("last_purchase_date"), {"fieldtype": "Date"})
+                if item.get("last_purchase_date")
+                else ""
+            ),
+            flt(item.get("last_purchase_quantity", 0), 2),
+            flt(item.get("last_purchase_rate", 0), 2),
+            flt(item.get("pending_purchase_order_qty", 0), 2),
+        ]
+        total_stock_on_hand = flt(item.get("total_stock_on_hand", 0), 2)
 
+        warehouse_stock = item.get("warehouse_stock", [])
         if warehouse_stock:
             # Create a row for each warehouse
             for wh in warehouse_stock:
-                row = [
-                    item.get("item_code", ""),
-                    item.get("item_name", ""),
-                    item.get("item_grade", ""),
-                    item.get("category_name", ""),
-                    (
-                        frappe.format(
-                            item.get("last_production_date"), {"fieldtype": "Date"}
-                        )
-                        if item.get("last_production_date")
-                        else ""
-                    ),
-                    flt(item.get("last_production_quantity", 0), 2),
-                    item.get("last_sales_party", ""),
-                    (
-                        frappe.format(
-                            item.get("last_sales_date"), {"fieldtype": "Date"}
-                        )
-                        if item.get("last_sales_date")
-                        else ""
-                    ),
-                    flt(item.get("last_sales_quantity", 0), 2),
-                    flt(item.get("last_sales_rate", 0), 2),
-                    flt(item.get("pending_sales_order_qty", 0), 2),
-                    item.get("last_purchase_party", ""),
-                    (
-                        frappe.format(
-                            item.get("last_purchase_date"), {"fieldtype": "Date"}
-                        )
-                        if item.get("last_purchase_date")
-                        else ""
-                    ),
-                    flt(item.get("last_purchase_quantity", 0), 2),
-                    flt(item.get("last_purchase_rate", 0), 2),
-                    flt(item.get("pending_purchase_order_qty", 0), 2),
+                yield [
+                    *item_values,
                     wh.get("warehouse", ""),
                     flt(wh.get("stock_qty", 0), 2),
                     flt(wh.get("committed_stock", 0), 2),
                     flt(wh.get("projected_qty", 0), 2),
-                    flt(item.get("total_stock_on_hand", 0), 2),
+                    total_stock_on_hand,
                 ]
-                rows.append(row)
         else:
             # No warehouses, create single row with empty warehouse fields
-            row = [
-                item.get("item_code", ""),
-                item.get("item_name", ""),
-                item.get("item_grade", ""),
-                item.get("category_name", ""),
-                (
-                    frappe.format(
-                        item.get("last_production_date"), {"fieldtype": "Date"}
-                    )
-                    if item.get("last_production_date")
-                    else ""
-                ),
-                flt(item.get("last_production_quantity", 0), 2),
-                item.get("last_sales_party", ""),
-                (
-                    frappe.format(item.get("last_sales_date"), {"fieldtype": "Date"})
-                    if item.get("last_sales_date")
-                    else ""
-                ),
-                flt(item.get("last_sales_quantity", 0), 2),
-                flt(item.get("last_sales_rate", 0), 2),
-                flt(item.get("pending_sales_order_qty", 0), 2),
-                item.get("last_purchase_party", ""),
-                (
-                    frappe.format(item.get("last_purchase_date"), {"fieldtype": "Date"})
-                    if item.get("last_purchase_date")
-                    else ""
-                ),
-                flt(item.get("last_purchase_quantity", 0), 2),
-                flt(item.get("last_purchase_rate", 0), 2),
-                flt(item.get("pending_purchase_order_qty", 0), 2),
+            yield [
+                *item_values,
                 "",  # warehouse
                 "",  # stock_qty
                 "",  # committed_stock
                 "",  # projected_qty
-                flt(item.get("total_stock_on_hand", 0), 2),
+                total_stock_on_hand,
             ]
-            rows.append(row)
-
-    # Build the xlsx file with header row + data rows using openpyxl (built-in Frappe dep)
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Border, Side
-
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = "Item Insight"
-
-    # Header style
-    header_font = Font(bold=True)
-    header_fill = PatternFill(
-        start_color="D7E4BC", end_color="D7E4BC", fill_type="solid"
-    )
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-
-    # Write headers
-    for col_num, header in enumerate(column_labels, start=1):
-        cell = worksheet.cell(row=1, column=col_num, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.border = thin_border
-
-    # Write data rows
-    for row_num, row_data in enumerate(rows, start=2):
-        for col_num, cell_value in enumerate(row_data, start=1):
-            worksheet.cell(row=row_num, column=col_num, value=cell_value)
-
-    xlsx_buffer = BytesIO()
-    workbook.save(xlsx_buffer)
-    xlsx_buffer.seek(0)
-
-    file_name = "Item Insight Dashboard.xlsx"
-    saved_file = save_file(
-        fname=file_name,
-        content=xlsx_buffer.getvalue(),
-        dt=None,
-        dn=None,
-        is_private=1,
-    )
-
-    return {"file_url": saved_file.file_url}
 
 
 @frappe.whitelist()
@@ -1,11 +1,25 @@
 import frappe
 
+from prakash_steel.utils.item_last_activity import get_item_last_activity
+
 
 @frappe.whitelist()
 def get_last_purchase_invoice_rate(item_code, company=None):
     if not item_code:
         return 0
 
+    # The latest submitted Purchase Invoice Item is kept in Item Last Activity; it answers
+    # directly unless a different company's invoice is the latest one
+    activity = get_item_last_activity(item_code)
+    if activity.get("last_purchase_voucher") and (
+        not company or activity.get("last_purchase_company") == company
+    ):
+        return activity.get("last_purchase_rate") or 0
+
+    if not activity.get("last_purchase_voucher"):
+        # No submitted PI row at all: fall back to the Item master value
+        return frappe.db.get_value("Item", item_code, "last_purchase_rate") or 0
+
     # Fetch the latest submitted Purchase Invoice Item rate.
     # If company is provided from Material Request, keep the result company-specific.
     conditions = ["pii.item_code = %s", "pi.docstatus = 1"]
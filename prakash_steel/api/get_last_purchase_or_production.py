@@ -1,12 +1,14 @@
 import frappe
 
+from prakash_steel.utils.item_last_activity import get_item_last_activity
+
 
 @frappe.whitelist()
 def get_last_purchase_or_production(item_code: str):
     """
     Fetch the latest *either* production or purchase transaction for the item.
 
-    Logic:
+    Logic (latest rows come from Item Last Activity):
     - Check the latest **production** for this item from:
         - `Finish Weight` (rolled production)
         - `Bright Bar Production` (bright bar production)
@@ -23,52 +25,17 @@ def get_last_purchase_or_production(item_code: str):
     if not item_code:
         return {"date": None, "qty": 0}
 
-    # ── Latest production (Finish Weight + Bright Bar Production) ─────────────────
-    prod_rows = frappe.db.sql(
-        """
-        SELECT posting_date AS tx_date, finish_weight AS qty
-        FROM `tabFinish Weight`
-        WHERE item_code = %s AND docstatus = 1
-
-        UNION ALL
-
-        SELECT production_date AS tx_date, fg_weight AS qty
-        FROM `tabBright Bar Production`
-        WHERE finished_good = %s AND docstatus = 1
-
-        ORDER BY tx_date DESC
-        LIMIT 1
-        """,
-        (item_code, item_code),
-        as_dict=True,
-    )
+    # ── Latest production and purchase, kept in Item Last Activity ───────────────
+    return pick_last_purchase_or_production(get_item_last_activity(item_code))
 
-    latest_prod_date = None
-    latest_prod_qty = 0
-    if prod_rows:
-        latest_prod_date = prod_rows[0].get("tx_date")
-        latest_prod_qty = prod_rows[0].get("qty") or 0
 
-    # ── Latest purchase (Purchase Order) ─────────────────────────────────────────
-    po_rows = frappe.db.sql(
-        """
-        SELECT poi.qty, po.transaction_date
-        FROM `tabPurchase Order Item` poi
-        INNER JOIN `tabPurchase Order` po ON poi.parent = po.name
-        WHERE poi.item_code = %s
-          AND po.docstatus = 1
-        ORDER BY po.transaction_date DESC, po.creation DESC
-        LIMIT 1
-        """,
-        (item_code,),
-        as_dict=True,
-    )
+def pick_last_purchase_or_production(activity):
+    """Return {date, qty} of the later of the last production and last Purchase Order."""
+    latest_prod_date = activity.get("last_production_date")
+    latest_prod_qty = activity.get("last_production_qty") or 0
 
-    latest_po_date = None
-    latest_po_qty = 0
-    if po_rows:
-        latest_po_date = po_rows[0].get("transaction_date")
-        latest_po_qty = po_rows[0].get("qty") or 0
+    latest_po_date = activity.get("last_po_date")
+    latest_po_qty = activity.get("last_po_qty") or 0
 
     # ── Decide which one is latest ───────────────────────────────────────────────
     if latest_prod_date and (not latest_po_date or latest_prod_date > latest_po_date):
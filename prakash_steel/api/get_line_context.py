@@ -0,0 +1,143 @@
+import frappe
+
+from prakash_steel.api.get_last_purchase_or_production import (
+	pick_last_purchase_or_production,
+)
+
+# Same exclusion as get_available_stock_for_warehouse
+EXCLUDED_WAREHOUSES = ("Rejected Warehouse",)
+
+
+@frappe.whitelist()
+def get_line_context(item_codes, company=None, warehouse=None):
+	"""
+	Line context for every item of a Sales Order / Material Request in one call.
+
+	Replaces the per-row calls to get_last_sales_invoice_rate,
+	get_last_sales_invoice_sold_qty, get_last_purchase_invoice_rate,
+	get_last_purchase_or_production and get_available_stock, with the same values.
+
+	Returns:
+	    dict keyed by item_code with:
+	        - last_sale_rate, last_sold_qty
+	        - last_purchase_rate (company-specific when company is given)
+	        - last_purchase_or_production: {date, qty}
+	        - available_stock: stock across all warehouses
+	        - warehouse_stock: stock in `warehouse` (only when warehouse is given)
+	"""
+	if isinstance(item_codes, str):
+		item_codes = frappe.parse_json(item_codes)
+
+	item_codes = list({item_code for item_code in item_codes or [] if item_code})
+	if not item_codes:
+		return {}
+
+	activities = _get_activities(item_codes)
+	purchase_rates = _get_last_purchase_rates(item_codes, activities, company)
+	stock = _get_stock(item_codes)
+	warehouse_stock = _get_stock(item_codes, warehouse) if warehouse else None
+
+	context = {}
+	for item_code in item_codes:
+		activity = activities.get(item_code) or {}
+		context[item_code] = {
+			"last_sale_rate": activity.get("last_sale_rate") or 0,
+			"last_sold_qty": activity.get("last_sale_qty") or 0,
+			"last_purchase_rate": purchase_rates.get(item_code) or 0,
+			"last_purchase_or_production": pick_last_purchase_or_production(activity),
+			"available_stock": stock.get(item_code) or 0,
+		}
+		if warehouse_stock is not None:
+			context[item_code]["warehouse_stock"] = warehouse_stock.get(item_code) or 0
+
+	return context
+
+
+def _get_activities(item_codes):
+	rows = frappe.db.sql(
+		"""
+        SELECT *
+        FROM `tabItem Last Activity`
+        WHERE name IN %(item_codes)s
+        """,
+		{"item_codes": tuple(item_codes)},
+		as_dict=True,
+	)
+	return {row.name: row for row in rows}
+
+
+def _get_last_purchase_rates(item_codes, activities, company=None):
+	"""Same rules as get_last_purchase_invoice_rate, resolved for all items at once."""
+	rates = {}
+	company_lookup = []
+	for item_code in item_codes:
+		activity = activities.get(item_code) or {}
+		if not activity.get("last_purchase_voucher"):
+			continue
+		if not company or activity.get("last_purchase_company") == company:
+			rates[item_code] = activity.get("last_purchase_rate")
+		else:
+			# The latest invoice belongs to another company
+			company_lookup.append(item_code)
+
+	if company_lookup:
+		rows = frappe.db.sql(
+			"""
+            SELECT item_code, rate
+            FROM (
+                SELECT
+                    pii.item_code, pii.rate,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY pii.item_code
+                        ORDER BY pi.posting_date DESC, pi.posting_time DESC, pii.creation DESC
+                    ) AS row_no
+                FROM `tabPurchase Invoice Item` pii
+                INNER JOIN `tabPurchase Invoice` pi
+                    ON pi.name = pii.parent
+                WHERE pi.docstatus = 1
+                    AND pi.company = %(company)s
+                    AND pii.item_code IN %(item_codes)s
+            ) ranked
+            WHERE row_no = 1
+            """,
+			{"company": company, "item_codes": tuple(company_lookup)},
+			as_dict=True,
+		)
+		rates.update({row.item_code: row.rate for row in rows if row.rate is not None})
+
+	# No submitted PI row: fall back to the Item master value
+	missing = [item_code for item_code in item_codes if rates.get(item_code) is None]
+	if missing:
+		rows = frappe.db.sql(
+			"""
+            SELECT name, last_purchase_rate
+            FROM `tabItem`
+            WHERE name IN %(item_codes)s
+            """,
+			{"item_codes": tuple(missing)},
+			as_dict=True,
+		)
+		rates.update({row.name: row.last_purchase_rate for row in rows})
+
+	return rates
+
+
+def _get_stock(item_codes, warehouse=None):
+	conditions = ""
+	values = {"item_codes": tuple(item_codes)}
+	if warehouse:
+		conditions = "AND warehouse = %(warehouse)s AND warehouse NOT IN %(excluded)s"
+		values.update({"warehouse": warehouse, "excluded": EXCLUDED_WAREHOUSES})
+
+	rows = frappe.db.sql(
+		f"""
+        SELECT item_code, SUM(actual_qty) AS qty
+        FROM `tabBin`
+        WHERE item_code IN %(item_codes)s
+            {conditions}
+        GROUP BY item_code
+        """,
+		values,
+		as_dict=True,
+	)
+	return {row.item_code: row.qty for row in rows}
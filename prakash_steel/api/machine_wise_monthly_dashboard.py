@@ -1,6 +1,6 @@
 import frappe
 from frappe.utils import cint
-from frappe.utils import flt, getdate
+from frappe.utils import flt
 
 
 MONTH_LABELS = {
@@ -43,42 +43,77 @@ def get_machine_wise_monthly_data(fiscal_year=None, machine_name=None):
     machine_names = [row.name for row in machine_rows if row.get("name")]
 
     production_conditions = ""
+    rate_conditions = ""
     production_params = {
         "from_date": fiscal_year_doc.year_start_date,
         "to_date": fiscal_year_doc.year_end_date,
     }
     if machine_name:
-        production_conditions = "AND machine_name = %(machine_name)s"
+        production_conditions = "AND bbp.machine_name = %(machine_name)s"
+        rate_conditions = "AND parent = %(machine_name)s"
         production_params["machine_name"] = machine_name
 
+    # Production summed per (machine, rate period, month). A machine's rate rows become
+    # validity intervals [rate_application_date, next rate date); on a shared date the
+    # last row wins, and dates before the first rate get rate 0.
     production_rows = frappe.db.sql(
         f"""
+        WITH rate_rows AS (
+            SELECT
+                parent AS machine_name,
+                COALESCE(rate_application_date, CURDATE()) AS valid_from,
+                rate,
+                ROW_NUMBER() OVER (
+                    PARTITION BY parent, COALESCE(rate_application_date, CURDATE())
+                    ORDER BY idx DESC
+                ) AS row_no
+            FROM `tabMachine Master Table`
+            WHERE parenttype = 'Machine Master'
+              {rate_conditions}
+        ),
+        rate_intervals AS (
+            SELECT
+                machine_name,
+                valid_from,
+                LEAD(valid_from) OVER (PARTITION BY machine_name ORDER BY valid_from) AS valid_upto,
+                rate
+            FROM rate_rows
+            WHERE row_no = 1
+        )
         SELECT
-            production_date,
-            MONTH(production_date) AS month_number,
-            machine_name,
-            fg_weight
-        FROM `tabBright Bar Production`
-        WHERE docstatus = 1
-          AND production_date BETWEEN %(from_date)s AND %(to_date)s
-          AND machine_name IS NOT NULL
-          AND machine_name != ''
+            bbp.machine_name,
+            MONTH(bbp.production_date) AS month_number,
+            COALESCE(ri.rate, 0) AS rate,
+            SUM(bbp.fg_weight) AS fg_weight,
+            MIN(bbp.production_date) AS first_production_date
+        FROM `tabBright Bar Production` bbp
+        LEFT JOIN rate_intervals ri
+            ON ri.machine_name = bbp.machine_name
+           AND bbp.production_date >= ri.valid_from
+           AND (ri.valid_upto IS NULL OR bbp.production_date < ri.valid_upto)
+        WHERE bbp.docstatus = 1
+          AND bbp.production_date BETWEEN %(from_date)s AND %(to_date)s
+          AND bbp.machine_name IS NOT NULL
+          AND bbp.machine_name != ''
           {production_conditions}
-        ORDER BY production_date ASC
+        GROUP BY bbp.machine_name, MONTH(bbp.production_date), ri.valid_from, ri.rate
         """,
         production_params,
         as_dict=True,
     )
 
-    used_machines = []
+    # Machines with production but no Machine Master row, in order of first production
+    first_production = {}
     for row in production_rows:
-        machine_name = row.get("machine_name")
-        if machine_name and machine_name not in used_machines:
-            used_machines.append(machine_name)
-
-    for machine in used_machines:
-        if machine not in machine_names:
-            machine_names.append(machine)
+        first_date = row.get("first_production_date")
+        if row.machine_name not in first_production or first_date < first_production[row.machine_name]:
+            first_production[row.machine_name] = first_date
+
+    known_machines = set(machine_names)
+    machine_names += sorted(
+        (machine for machine in first_production if machine not in known_machines),
+        key=lambda machine: (first_production[machine], machine),
+    )
 
     matrix = {
         period["month_number"]: {
@@ -88,16 +123,13 @@ def get_machine_wise_monthly_data(fiscal_year=None, machine_name=None):
         for period in month_periods
     }
 
-    rate_lookup = _build_machine_rate_lookup(machine_names)
     for row in production_rows:
         month_number = cint(row.get("month_number"))
         machine_name = row.get("machine_name")
         if month_number in matrix and machine_name in matrix[month_number]:
             fg_weight = flt(row.get("fg_weight"))
-            production_date = getdate(row.get("production_date"))
-            rate = _get_rate_for_date(rate_lookup.get(machine_name, []), production_date)
             matrix[month_number][machine_name]["fg_weight"] += fg_weight
-            matrix[month_number][machine_name]["amount"] += fg_weight * rate
+            matrix[month_number][machine_name]["amount"] += fg_weight * flt(row.get("rate"))
 
     data = []
     for period in month_periods:
@@ -161,44 +193,3 @@ def _get_fiscal_month_periods(fiscal_year_doc):
         current = frappe.utils.add_months(current, 1)
     return periods
 
-
-def _build_machine_rate_lookup(machine_names):
-    if not machine_names:
-        return {}
-
-    rate_rows = frappe.db.sql(
-        """
-        SELECT
-            parent AS machine_name,
-            rate_application_date,
-            rate
-        FROM `tabMachine Master Table`
-        WHERE parent IN %(machine_names)s
-        ORDER BY parent, rate_application_date ASC, idx ASC
-        """,
-        {"machine_names": tuple(machine_names)},
-        as_dict=True,
-    )
-
-    lookup = {machine: [] for machine in machine_names}
-    for row in rate_rows:
-        machine_name = row.get("machine_name")
-        if machine_name in lookup:
-            lookup[machine_name].append(
-                {
-                    "rate_application_date": getdate(row.get("rate_application_date")),
-                    "rate": flt(row.get("rate")),
-                }
-            )
-    return lookup
-
-
-def _get_rate_for_date(rate_rows, production_date):
-    """Return latest applicable rate as on production date."""
-    applicable_rate = 0
-    for rate_row in rate_rows:
-        if rate_row["rate_application_date"] <= production_date:
-            applicable_rate = rate_row["rate"]
-        else:
-            break
-    return applicable_rate
@@ -1,8 +1,36 @@
+import hashlib
+
 import frappe
 
+CACHE_KEY = "prakash_steel:number_card_uom_settings"
+
 
 @frappe.whitelist()
 def get_all_uom_settings():
 	"""Get all Number Card UOM settings as a dictionary"""
-	settings = frappe.get_all("Number Card UOM Setting", fields=["number_card", "uom"])
-	return {s.number_card: s.uom for s in settings}
+	return get_uom_settings_payload()["settings"]
+
+
+def get_uom_settings_payload():
+	"""Settings keyed by Number Card, with a version stamp (hash of the settings), cached in Redis."""
+	payload = frappe.cache().get_value(CACHE_KEY)
+	if payload is None:
+		settings = frappe.get_all("Number Card UOM Setting", fields=["number_card", "uom"])
+		settings = {s.number_card: s.uom for s in settings}
+		payload = {
+			"version": hashlib.sha1(frappe.as_json(settings).encode()).hexdigest()[:12],
+			"settings": settings,
+		}
+		frappe.cache().set_value(CACHE_KEY, payload)
+	return payload
+
+
+def boot_session(bootinfo):
+	"""extend_bootinfo hook: ship the settings with the desk boot instead of a call per page."""
+	bootinfo.number_card_uom = get_uom_settings_payload()
+
+
+def on_uom_setting_change(doc, method=None):
+	"""Number Card UOM Setting changed: refresh the cache and push the new settings to open desks."""
+	frappe.cache().delete_value(CACHE_KEY)
+	frappe.publish_realtime("number_card_uom_updated", get_uom_settings_payload(), after_commit=True)
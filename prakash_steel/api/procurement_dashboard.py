@@ -77,3 +77,178 @@ def get_overview_data(from_date, to_date, supplier=None):
 		"total_purchase_receipts": pr_count,
 		"total_purchase_invoices": pi_count,
 	}
+
+
+# Per-stage table, item table, the field the tab's status filter matches and the tab filter
+# keys the dashboard sends
+PROCUREMENT_STAGES = {
+	"material_request": {
+		"doctype": "Material Request",
+		"item_doctype": "Material Request Item",
+		"status_field": "status",
+		"status_key": "mr_status",
+		"id_key": "mr_id",
+		"item_key": "mr_item_name",
+	},
+	"purchase_order": {
+		"doctype": "Purchase Order",
+		"item_doctype": "Purchase Order Item",
+		"status_field": "workflow_state",
+		"status_key": "po_status",
+		"id_key": "po_id",
+		"item_key": "po_item_name",
+	},
+	"purchase_receipt": {
+		"doctype": "Purchase Receipt",
+		"item_doctype": "Purchase Receipt Item",
+		"status_field": "status",
+		"status_key": "pr_status",
+		"id_key": "pr_id",
+		"item_key": "pr_item_name",
+	},
+	"purchase_invoice": {
+		"doctype": "Purchase Invoice",
+		"item_doctype": "Purchase Invoice Item",
+		"status_field": "workflow_state",
+		"status_key": "pi_status",
+		"id_key": "pi_id",
+		"item_key": "pi_item_name",
+	},
+}
+
+
+@frappe.whitelist()
+def get_dashboard_data(filters):
+	"""
+	Return everything the Procurement Tracker Dashboard shows, in one call.
+
+	The MR, PO, PR and PI documents of the period come from a single UNION ALL query;
+	each row carries whether it contains its tab's selected item, so item filtering
+	happens here instead of in follow-up list calls. Status / ID / item filters are then
+	applied per tab, while status options and overview counts use the unfiltered rows.
+	"""
+	from prakash_steel.prakash_steel.report.item_wise_procurement_tracker.item_wise_procurement_tracker import (
+		get_data as get_item_wise_data,
+	)
+
+	filters = frappe._dict(frappe.parse_json(filters) or {})
+	if not filters.from_date or not filters.to_date:
+		frappe.throw(_("Please select both From Date and To Date"))
+
+	rows_by_stage = {stage: [] for stage in PROCUREMENT_STAGES}
+	for row in _get_procurement_documents(filters):
+		rows_by_stage[row.stage].append(row)
+
+	data = {
+		"overview": {
+			"total_material_requests": len(rows_by_stage["material_request"]),
+			"total_purchase_orders": len(rows_by_stage["purchase_order"]),
+			"total_purchase_receipts": len(rows_by_stage["purchase_receipt"]),
+			# The invoice tab also lists drafts and cancelled invoices; the overview counts
+			# submitted invoices only
+			"total_purchase_invoices": len(
+				[row for row in rows_by_stage["purchase_invoice"] if row.docstatus == 1]
+			),
+		},
+		"item_wise": get_item_wise_data(
+			{
+				"from_date": filters.from_date,
+				"to_date": filters.to_date,
+				"supplier": filters.supplier,
+				"item_code": filters.item_code,
+				"po_no": filters.po_no,
+			}
+		),
+	}
+
+	for stage, config in PROCUREMENT_STAGES.items():
+		rows = rows_by_stage[stage]
+		status = filters.get(config["status_key"])
+		doc_id = filters.get(config["id_key"])
+
+		status_field = config["status_field"]
+		status_options = sorted({row[status_field] for row in rows if row[status_field]})
+		if status and status != "All":
+			# Material Request statuses are matched case-insensitively, as before
+			if stage == "material_request":
+				rows = [row for row in rows if (row.status or "").lower() == status.lower()]
+			else:
+				rows = [row for row in rows if row[status_field] == status]
+		if doc_id:
+			rows = [row for row in rows if row.name == doc_id]
+		if filters.get(config["item_key"]):
+			rows = [row for row in rows if row.item_match]
+
+		data[stage] = {"rows": rows, "status_options": status_options}
+
+	return data
+
+
+def _get_procurement_documents(filters):
+	"""MR / PO / PR / PI headers of the period as one row set, tagged with their stage."""
+	values = {"from_date": filters.from_date, "to_date": filters.to_date}
+	supplier_condition = {}
+	for alias in ("po", "pr", "pi"):
+		supplier_condition[alias] = f"AND {alias}.supplier = %(supplier)s" if filters.supplier else ""
+	if filters.supplier:
+		values["supplier"] = filters.supplier
+
+	item_match = {}
+	for stage, config in PROCUREMENT_STAGES.items():
+		item_code = filters.get(config["item_key"])
+		if item_code:
+			values[config["item_key"]] = item_code
+			item_match[stage] = (
+				f"EXISTS (SELECT 1 FROM `tab{config['item_doctype']}` item"
+				f" WHERE item.parent = {{alias}}.name AND item.item_code = %({config['item_key']})s)"
+			)
+		else:
+			item_match[stage] = "1"
+
+	return frappe.db.sql(
+		f"""
+		SELECT
+			'material_request' AS stage, mr.name, mr.transaction_date AS date, NULL AS due_date,
+			mr.status, mr.status AS workflow_state, NULL AS supplier, 0 AS grand_total,
+			mr.docstatus, {item_match["material_request"].format(alias="mr")} AS item_match
+		FROM `tabMaterial Request` mr
+		WHERE mr.docstatus = 1
+			AND mr.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+
+		UNION ALL
+
+		SELECT
+			'purchase_order', po.name, po.transaction_date, NULL,
+			po.status, po.workflow_state, po.supplier, po.grand_total,
+			po.docstatus, {item_match["purchase_order"].format(alias="po")}
+		FROM `tabPurchase Order` po
+		WHERE po.docstatus = 1
+			AND po.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+			{supplier_condition["po"]}
+
+		UNION ALL
+
+		SELECT
+			'purchase_receipt', pr.name, pr.posting_date, NULL,
+			pr.status, pr.status, pr.supplier, pr.grand_total,
+			pr.docstatus, {item_match["purchase_receipt"].format(alias="pr")}
+		FROM `tabPurchase Receipt` pr
+		WHERE pr.docstatus = 1
+			AND pr.posting_date BETWEEN %(from_date)s AND %(to_date)s
+			{supplier_condition["pr"]}
+
+		UNION ALL
+
+		SELECT
+			'purchase_invoice', pi.name, pi.posting_date, pi.due_date,
+			pi.status, pi.workflow_state, pi.supplier, pi.grand_total,
+			pi.docstatus, {item_match["purchase_invoice"].format(alias="pi")}
+		FROM `tabPurchase Invoice` pi
+		WHERE pi.posting_date BETWEEN %(from_date)s AND %(to_date)s
+			{supplier_condition["pi"]}
+
+		ORDER BY stage, date DESC, name
+		""",
+		values,
+		as_dict=True,
+	)
@@ -3,12 +3,18 @@
 
 import frappe
 from datetime import date as _date
-from io import BytesIO
 
-import openpyxl
 from frappe import _
-from frappe.utils import flt
-from frappe.utils.xlsxutils import make_xlsx
+from frappe.utils import flt, getdate
+
+from prakash_steel.utils.dashboard_cache import (
+    clear_dashboard_cache,
+    conditional_response,
+    get_cached_view,
+)
+from prakash_steel.utils.xlsx_export import enqueue_xlsx_export, make_xlsx_file
+
+CACHE_NAMESPACE = "production_dashboard"
 
 
 @frappe.whitelist()
@@ -19,6 +25,89 @@ def get_rolled_production_data(
     production_plan=None,
     machine_name=None,
     category_name=None,
+    if_none_match=None,
+):
+    """Rolled Production tab (see _build_rolled_production_data), cached per filter set."""
+    data, etag = _get_tab_data(
+        "rolled_production", from_date, to_date, item_code, production_plan, machine_name, category_name
+    )
+    return conditional_response(data, etag, if_none_match)
+
+
+@frappe.whitelist()
+def get_bright_production_data(
+    from_date=None,
+    to_date=None,
+    item_code=None,
+    production_plan=None,
+    machine_name=None,
+    category_name=None,
+    if_none_match=None,
+):
+    """Bright Production tab (see _build_bright_production_data), cached per filter set."""
+    data, etag = _get_tab_data(
+        "bright_production", from_date, to_date, item_code, production_plan, machine_name, category_name
+    )
+    return conditional_response(data, etag, if_none_match)
+
+
+@frappe.whitelist()
+def get_bend_weight_details(
+    from_date=None,
+    to_date=None,
+    item_code=None,
+    production_plan=None,
+    machine_name=None,
+    category_name=None,
+    if_none_match=None,
+):
+    """Bend Weight Details tab (see _build_bend_weight_details), cached per filter set."""
+    data, etag = _get_tab_data(
+        "bend_weight_details", from_date, to_date, item_code, production_plan, machine_name, category_name
+    )
+    return conditional_response(data, etag, if_none_match)
+
+
+def clear_production_dashboard_cache(doc=None, method=None):
+    """Doc event handler: Billet Cutting / Finish Weight / Bright Bar Production changed."""
+    clear_dashboard_cache(CACHE_NAMESPACE)
+
+
+def _get_tab_data(
+    tab_id, from_date=None, to_date=None, item_code=None, production_plan=None, machine_name=None, category_name=None
+):
+    """Return (data, etag) of a dashboard tab from the short-lived cache, building it on a miss."""
+    builders = {
+        "rolled_production": _build_rolled_production_data,
+        "bright_production": _build_bright_production_data,
+        "bend_weight_details": _build_bend_weight_details,
+    }
+    if tab_id not in builders:
+        frappe.throw(_("Unknown Production Dashboard tab: {0}").format(tab_id))
+
+    # Normalise so equivalent filter sets share one entry; only Bright Production
+    # filters on machine
+    filters = {
+        "from_date": str(getdate(from_date)) if from_date else None,
+        "to_date": str(getdate(to_date)) if to_date else None,
+        "item_code": (item_code or "").strip() or None,
+        "production_plan": (production_plan or "").strip() or None,
+        "machine_name": (machine_name or "").strip() or None,
+        "category_name": (category_name or "").strip() or None,
+    }
+    if tab_id != "bright_production":
+        filters["machine_name"] = None
+
+    return get_cached_view(CACHE_NAMESPACE, tab_id, filters, lambda: builders[tab_id](**filters))
+
+
+def _build_rolled_production_data(
+    from_date=None,
+    to_date=None,
+    item_code=None,
+    production_plan=None,
+    machine_name=None,
+    category_name=None,
 ):
     """
     Fetch Rolled Production data for the Production Dashboard.
@@ -366,8 +455,7 @@ def get_rolled_production_data(
     }
 
 
-@frappe.whitelist()
-def get_bright_production_data(
+def _build_bright_production_data(
     from_date=None,
     to_date=None,
     item_code=None,
@@ -621,8 +709,7 @@ def get_bright_production_data(
     }
 
 
-@frappe.whitelist()
-def get_bend_weight_details(
+def _build_bend_weight_details(
     from_date=None,
     to_date=None,
     item_code=None,
@@ -728,7 +815,7 @@ def _fmt_date(date_val):
 # ── Per-tab column definitions: key, label, extractor ──────────────────────
 _ROLLED_COLS = [
     {"key": "production_plan",               "label": "Production Plan",               "get": lambda r: r.get("production_plan") or ""},
-    {"key": "production_date",               "label": "Production Date",               "get": lambda r: _fmt_date(r.get("production_date"))},
+    {"key": "production_date",               "label": "Production Date",               "get": lambda r: _fmt_date(r.get("production_date")), "number_format": "DD-MM-YYYY"},
     {"key": "rm",                            "label": "RM",                            "get": lambda r: r.get("rm") or ""},
     {"key": "rm_category_name",              "label": "RM Category Name",              "get": lambda r: r.get("rm_category_name") or ""},
     {"key": "rm_consumption",                "label": "Actual RM Consumption",         "get": lambda r: flt(r.get("rm_consumption"))},
@@ -756,7 +843,7 @@ _ROLLED_COLS = [
 
 _BRIGHT_COLS = [
     {"key": "production_plan",             "label": "Production Plan",             "get": lambda r: r.get("production_plan") or ""},
-    {"key": "production_date",             "label": "Production Date",             "get": lambda r: _fmt_date(r.get("production_date"))},
+    {"key": "production_date",             "label": "Production Date",             "get": lambda r: _fmt_date(r.get("production_date")), "number_format": "DD-MM-YYYY"},
     {"key": "rm",                          "label": "RM",                          "get": lambda r: r.get("rm") or ""},
     {"key": "rm_category_name",            "label": "RM Category Name",            "get": lambda r: r.get("rm_category_name") or ""},
     {"key": "rm_consumption",              "label": "Actual RM Consumption",       "get": lambda r: flt(r.get("rm_consumption"))},
@@ -800,22 +887,63 @@ def export_production_dashboard(
     Build an Excel file (XLSX) for the Production Dashboard tables.
     selected_columns: comma-separated list of column keys; if empty, all columns are included.
     """
-    if tab_id == "rolled_production":
-        data = get_rolled_production_data(
-            from_date, to_date, item_code, production_plan, machine_name, category_name
-        )
-    elif tab_id == "bright_production":
-        data = get_bright_production_data(
-            from_date, to_date, item_code, production_plan, machine_name, category_name
-        )
-    elif tab_id == "bend_weight_details":
-        data = get_bend_weight_details(
-            from_date, to_date, item_code, production_plan, category_name=category_name
-        )
-    else:
+    sheet_name, columns, rows, header_style = get_production_dashboard_sheet(
+        tab_id, from_date, to_date, item_code, production_plan, machine_name, category_name, selected_columns
+    )
+    xlsx_file = make_xlsx_file(sheet_name, columns, rows, header_style)
+
+    frappe.response["filename"] = f"{tab_id}_export.xlsx"
+    frappe.response["filecontent"] = xlsx_file.getvalue()
+    frappe.response["type"] = "binary"
+    frappe.response["content_type"] = (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
+@frappe.whitelist()
+def enqueue_production_dashboard_export(
+    tab_id,
+    from_date=None,
+    to_date=None,
+    item_code=None,
+    production_plan=None,
+    machine_name=None,
+    category_name=None,
+    selected_columns=None,
+):
+    """Queue a large Production Dashboard export; the File link arrives via the xlsx_export_ready event."""
+    if tab_id not in _TAB_COLS:
         frappe.throw(_("Invalid tab selected for export."))
 
-    rows = data.get("rows", [])
+    return enqueue_xlsx_export(
+        "prakash_steel.api.production_dashboard.get_production_dashboard_sheet",
+        f"{tab_id}_export.xlsx",
+        tab_id=tab_id,
+        from_date=from_date,
+        to_date=to_date,
+        item_code=item_code,
+        production_plan=production_plan,
+        machine_name=machine_name,
+        category_name=category_name,
+        selected_columns=selected_columns,
+    )
+
+
+def get_production_dashboard_sheet(
+    tab_id,
+    from_date=None,
+    to_date=None,
+    item_code=None,
+    production_plan=None,
+    machine_name=None,
+    category_name=None,
+    selected_columns=None,
+):
+    """Return (sheet_name, columns, rows, header_style) of a dashboard tab for make_xlsx_file."""
+    # Same cache entry as the tab the user is looking at, so exporting does not rerun the queries
+    data, _etag = _get_tab_data(
+        tab_id, from_date, to_date, item_code, production_plan, machine_name, category_name
+    )
 
     # Resolve which columns to include
     all_cols = _TAB_COLS.get(tab_id, [])
@@ -830,37 +958,6 @@ def export_production_dashboard(
     if not cols:
         cols = all_cols
 
-    header = [_(c["label"]) for c in cols]
-    data_rows = [[c["get"](r) for c in cols] for r in rows]
-    table_data = [header] + data_rows
-
-    file_name = f"{tab_id}_export.xlsx"
-    xlsx_file = make_xlsx(table_data, _("Production Dashboard"))
-
-    # Post-process: apply DD-MM-YYYY number format to the Production Date column
-    # Find the date column index dynamically (1-indexed for openpyxl)
-    date_col_idx = None
-    if tab_id in ("rolled_production", "bright_production"):
-        for i, c in enumerate(cols, start=1):
-            if c["key"] == "production_date":
-                date_col_idx = i
-                break
-
-    if date_col_idx:
-        wb = openpyxl.load_workbook(BytesIO(xlsx_file.getvalue()))
-        ws = wb.active
-        for row in ws.iter_rows(min_row=2, min_col=date_col_idx, max_col=date_col_idx):
-            for cell in row:
-                if cell.value:
-                    cell.number_format = "DD-MM-YYYY"
-        out = BytesIO()
-        wb.save(out)
-        out.seek(0)
-        xlsx_file = out
-
-    frappe.response["filename"] = file_name
-    frappe.response["filecontent"] = xlsx_file.getvalue()
-    frappe.response["type"] = "binary"
-    frappe.response["content_type"] = (
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    columns = [{"label": _(c["label"]), "number_format": c.get("number_format")} for c in cols]
+    rows = ([c["get"](r) for c in cols] for r in data.get("rows", []))
+    return _("Production Dashboard"), columns, rows, False
@@ -50,7 +50,19 @@ page_js = {
 # App Include JS
 # ------------------------------------------------------------------------------
 
-app_include_js = ["/assets/prakash_steel/js/number_cards_uom.js"]
+app_include_js = [
+	"/assets/prakash_steel/js/number_cards_uom.js",
+	"/assets/prakash_steel/js/xlsx_export.js",
+	"/assets/prakash_steel/js/line_context.js",
+]
+
+# ------------------------------------------------------------------------------
+# Boot Session
+# ------------------------------------------------------------------------------
+
+extend_bootinfo = [
+	"prakash_steel.api.number_card_uom.boot_session",
+]
 
 # ------------------------------------------------------------------------------
 # Document Events
@@ -59,26 +71,68 @@ app_include_js = ["/assets/prakash_steel/js/number_cards_uom.js"]
 doc_events = {
 	"Item": {
 		"validate": "prakash_steel.utils.item.validate_min_order_qty_and_batch_size",
-		"on_update": "prakash_steel.utils.item.update_decoupled_lead_time_on_item_save",
+		"on_update": [
+			"prakash_steel.utils.item.update_decoupled_lead_time_on_item_save",
+			"prakash_steel.utils.item_search.clear_item_search_index",
+			# Buffer flag, item type and safety stock feed the planning page
+			"prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		],
+		"after_rename": "prakash_steel.utils.item_search.clear_item_search_index",
+		"on_trash": "prakash_steel.utils.item_search.clear_item_search_index",
+	},
+	"Item Category": {
+		"on_update": "prakash_steel.utils.item_search.clear_item_search_index",
+		"after_rename": "prakash_steel.utils.item_search.clear_item_search_index",
+		"on_trash": "prakash_steel.utils.item_search.clear_item_search_index",
 	},
 	"Sales Invoice": {
-		"on_submit": "prakash_steel.utils.job_work_order_utils.update_jwo_on_sales_invoice_submit",
-		"on_cancel": "prakash_steel.utils.job_work_order_utils.update_jwo_on_sales_invoice_submit",
+		"on_submit": [
+			"prakash_steel.utils.job_work_order_utils.update_jwo_on_sales_invoice_submit",
+			"prakash_steel.utils.sales_history.update_monthly_sales_on_invoice",
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+			"prakash_steel.utils.open_demand.update_open_demand",
+		],
+		"on_cancel": [
+			"prakash_steel.utils.job_work_order_utils.update_jwo_on_sales_invoice_submit",
+			"prakash_steel.utils.sales_history.update_monthly_sales_on_invoice",
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+			"prakash_steel.utils.open_demand.update_open_demand",
+		],
 	},
 	"Delivery Note": {
-		"on_submit": "prakash_steel.utils.job_work_order_utils.update_jwo_on_delivery_note_submit",
-		"on_cancel": "prakash_steel.utils.job_work_order_utils.update_jwo_on_delivery_note_submit",
+		"on_submit": [
+			"prakash_steel.utils.job_work_order_utils.update_jwo_on_delivery_note_submit",
+			"prakash_steel.utils.open_demand.update_open_demand",
+		],
+		"on_cancel": [
+			"prakash_steel.utils.job_work_order_utils.update_jwo_on_delivery_note_submit",
+			"prakash_steel.utils.open_demand.update_open_demand",
+		],
 	},
 	"BOM": {
-		"on_submit": "prakash_steel.utils.item.update_decoupled_lead_time_on_bom_save",
-		"on_update_after_submit": "prakash_steel.utils.item.update_decoupled_lead_time_on_bom_save",
+		# Clear the default BOM cache first so lead time recalculation sees the change
+		"on_update": "prakash_steel.utils.bom_cache.clear_bom_cache",
+		"on_submit": [
+			"prakash_steel.utils.bom_cache.clear_bom_cache",
+			"prakash_steel.utils.item.update_decoupled_lead_time_on_bom_save",
+		],
+		"on_update_after_submit": [
+			"prakash_steel.utils.bom_cache.clear_bom_cache",
+			"prakash_steel.utils.item.update_decoupled_lead_time_on_bom_save",
+		],
+		"on_cancel": "prakash_steel.utils.bom_cache.clear_bom_cache",
+		"on_trash": "prakash_steel.utils.bom_cache.clear_bom_cache",
 	},
 	"Purchase Receipt": {
 		"on_submit": [
 			"prakash_steel.utils.purchase_receipt.validate_purchase_receipt_quantity",
 			"prakash_steel.utils.job_work_order_utils.update_jwo_on_purchase_receipt_submit",
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
+		],
+		"on_cancel": [
+			"prakash_steel.utils.job_work_order_utils.update_jwo_on_purchase_receipt_submit",
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
 		],
-		"on_cancel": "prakash_steel.utils.job_work_order_utils.update_jwo_on_purchase_receipt_submit",
 		"before_cancel": "prakash_steel.utils.purchase_receipt_cancel.validate_cancel_reason",
 	},
 	"Production Plan": {
@@ -88,11 +142,31 @@ doc_events = {
 		"before_cancel": "prakash_steel.utils.sales_order_cancel.validate_cancel_reason",
 		"validate": "prakash_steel.utils.order_validation.validate_no_zero_rate_items",
 		"before_update_after_submit": "prakash_steel.utils.order_validation.validate_no_zero_rate_items",
+		"on_submit": "prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		"on_cancel": "prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		"on_update_after_submit": "prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		# Runs after submit, cancel and update after submit, and on status changes
+		# (close, hold, completed) that go through db_set
+		"on_change": "prakash_steel.utils.open_demand.update_open_demand",
 	},
 	"Purchase Order": {
 		"before_cancel": "prakash_steel.utils.purchase_order_cancel.validate_cancel_reason",
 		"validate": "prakash_steel.utils.order_validation.validate_no_zero_rate_items",
 		"before_update_after_submit": "prakash_steel.utils.order_validation.validate_no_zero_rate_items",
+		"on_submit": [
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
+			"prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		],
+		"on_cancel": [
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
+			"prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		],
+		"on_update_after_submit": [
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
+			"prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		],
 	},
 	"Purchase Invoice": {
 		"before_cancel": "prakash_steel.utils.purchase_invoice_cancel.validate_cancel_reason",
@@ -100,12 +174,63 @@ doc_events = {
 			"prakash_steel.utils.purchase_invoice_cancel.clear_cancel_reason_on_amend",
 			"prakash_steel.utils.purchase_invoice_cancel.update_gross_amount_on_items",
 		],
+		"on_submit": [
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
+		],
+		"on_cancel": [
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+			"prakash_steel.utils.procurement_chain.update_procurement_chain",
+		],
 	},
 	"Payment Entry": {
 		"on_submit": "prakash_steel.utils.payment_entry.set_submitted_time",
 	},
+	"Billet Cutting": {
+		"on_submit": "prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+		"on_cancel": "prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+		"on_update_after_submit": "prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+	},
+	"Finish Weight": {
+		"on_submit": [
+			"prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+		],
+		"on_cancel": [
+			"prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+		],
+		"on_update_after_submit": "prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+	},
+	"Bright Bar Production": {
+		"on_submit": [
+			"prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+		],
+		"on_cancel": [
+			"prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+			"prakash_steel.utils.item_last_activity.update_item_last_activity",
+		],
+		"on_update_after_submit": "prakash_steel.api.production_dashboard.clear_production_dashboard_cache",
+	},
+	"Stock Ledger Entry": {
+		"on_submit": [
+			"prakash_steel.utils.stock_checkpoint.update_checkpoints_for_sle",
+			"prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.clear_planning_dashboard_cache",
+		],
+	},
+	"Repost Item Valuation": {
+		"on_change": "prakash_steel.utils.stock_checkpoint.refresh_checkpoints_after_repost",
+	},
+	"Number Card UOM Setting": {
+		"on_update": "prakash_steel.api.number_card_uom.on_uom_setting_change",
+		"after_rename": "prakash_steel.api.number_card_uom.on_uom_setting_change",
+		"after_delete": "prakash_steel.api.number_card_uom.on_uom_setting_change",
+	},
 	"Material Request": {
 		"before_cancel": "prakash_steel.utils.material_request_cancel.validate_cancel_reason",
+		"on_submit": "prakash_steel.utils.procurement_chain.update_procurement_chain",
+		"on_cancel": "prakash_steel.utils.procurement_chain.update_procurement_chain",
 	},
 }
 
@@ -115,32 +240,21 @@ doc_events = {
 
 scheduler_events = {
 	"cron": {
-		# Runs daily at 14:52 server time
-		"05 08 * * *": [
-			"prakash_steel.prakash_steel.report.po_recomendation_for_psp.po_recomendation_for_psp.save_daily_on_hand_colour"
-		],
 		# Sends daily Sales Invoice summary email at 1:40 PM
 		"58 23 * * *": ["prakash_steel.utils.daily_sales_invoice_email.send_daily_sales_invoice_email"],
 		# Sends yesterday Payment Entry report daily at 2:16 PM
 		"30 12 * * *": ["prakash_steel.utils.daily_payment_entry_email.send_daily_payment_entry_email"],
-		# Captures PO Recommendation Snapshot daily at 2:06 PM
-		"00 04 * * *": [
-			"prakash_steel.po_recommendation_history.doctype.po_recommendation_snapshot.po_recommendation_snapshot.capture_daily_po_snapshot"
-		],
-		# Captures SO Recommendation Snapshot daily at 4:30 PM IST
-		"01 04 * * *": [
-			"prakash_steel.prakash_steel.doctype.so_recommendation_snapshot.so_recommendation_snapshot.capture_daily_so_snapshot"
-		],
-		# Captures Stock Balance Snapshot (Item Wise Stock Balance) daily, after SO snapshot
-		"02 04 * * *": [
-			"prakash_steel.prakash_steel.doctype.stock_balance_snapshot.stock_balance_snapshot.capture_daily_stock_balance_snapshot"
-		],
-		# Captures Purchase Order Recommendation Snapshot daily at 4:00 PM IST
-		"03 04 * * *": ["prakash_steel.utils.po_rec_snapshot.capture_daily_po_rec_snapshot"],
+		# Morning planning pipeline: PO / SO / Stock Balance / Purchase Order Recommendation
+		# snapshots and the daily on-hand colour, all from one shared planning context
+		"00 04 * * *": ["prakash_steel.utils.morning_pipeline.run_morning_pipeline"],
 	},
 	# Recalculate ADU for all items once per day so Item.custom_adu stays in sync
 	"daily": [
 		"prakash_steel.prakash_steel.api.adu.recalculate_adu_for_all_items",
+		# Compact PO/SO/Stock Balance snapshots past the retention age in Snapshot Settings
+		"prakash_steel.utils.snapshot.compact_old_snapshots",
+		# Add the month-end Stock Closing Checkpoint once a month has closed
+		"prakash_steel.utils.stock_checkpoint.build_stock_checkpoints",
 		# "prakash_steel.prakash_steel.doctype.unsecured_loans_and_transaction.unsecured_loans_and_transaction.fetch_daily_interest_for_all_active_docs",
 		# "prakash_steel.prakash_steel.doctype.unsecured_loans_and_transaction.unsecured_loans_and_transaction.fetch_daily_interest_for_all_active_docs",
 	],
@@ -0,0 +1,19 @@
+import frappe
+
+from prakash_steel.prakash_steel.doctype.item_wise_daily_on_hand_colour.item_wise_daily_on_hand_colour import (
+	update_daily_colour_counts,
+)
+
+
+def execute():
+	"""Build Daily On Hand Colour Count for every date captured before the table existed."""
+	posting_dates = frappe.db.sql_list(
+		"""
+		SELECT DISTINCT posting_date
+		FROM `tabItem wise Daily On Hand Colour`
+		WHERE posting_date IS NOT NULL
+		"""
+	)
+
+	for posting_date in posting_dates:
+		update_daily_colour_counts(posting_date)
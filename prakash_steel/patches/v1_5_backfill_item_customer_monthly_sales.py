@@ -0,0 +1,17 @@
+import frappe
+
+from prakash_steel.utils.sales_history import rebuild_monthly_sales
+
+
+def execute():
+	"""Build Item Customer Monthly Sales for every month with submitted Sales Invoices."""
+	months = frappe.db.sql_list(
+		"""
+		SELECT DISTINCT DATE_FORMAT(posting_date, '%Y-%m-01')
+		FROM `tabSales Invoice`
+		WHERE docstatus = 1 AND posting_date IS NOT NULL
+		"""
+	)
+
+	for month_start in months:
+		rebuild_monthly_sales(month_start)
@@ -0,0 +1,6 @@
+from prakash_steel.utils.item_last_activity import rebuild_item_last_activity
+
+
+def execute():
+	"""Build Item Last Activity for every item with submitted sales, purchase or production history."""
+	rebuild_item_last_activity()
@@ -0,0 +1,6 @@
+from prakash_steel.utils.procurement_chain import rebuild_procurement_chain
+
+
+def execute():
+	"""Build Procurement Chain Entry rows for every submitted Material Request."""
+	rebuild_procurement_chain()
@@ -0,0 +1,6 @@
+from prakash_steel.utils.open_demand import rebuild_open_demand
+
+
+def execute():
+	"""Build Open Demand Entry rows for every submitted Sales Order."""
+	rebuild_open_demand()
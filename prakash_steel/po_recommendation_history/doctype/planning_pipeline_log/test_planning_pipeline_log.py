@@ -0,0 +1,37 @@
+# Copyright (c) 2026, Beetashoke Chakraborty and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from prakash_steel.utils import morning_pipeline
+
+PO_REPORT = "prakash_steel.prakash_steel.report.po_recomendation_for_psp.po_recomendation_for_psp"
+
+
+class TestPlanningPipelineLog(FrappeTestCase):
+	def test_failed_capture_marks_stage_failed(self):
+		def failing_report(filters):
+			raise Exception("PO Recommendation report failed")
+
+		with (
+			patch(f"{PO_REPORT}.execute", side_effect=failing_report),
+			patch(f"{PO_REPORT}.save_daily_on_hand_colour"),
+			patch.object(morning_pipeline, "_load_open_so_analysis", return_value=[]),
+			patch.object(morning_pipeline, "_load_item_wise_stock_balance", return_value=[]),
+			patch.object(morning_pipeline, "_load_open_po_analysis", return_value=[]),
+		):
+			log_name = morning_pipeline.execute_pipeline(trigger="Manual")
+
+		log = frappe.get_doc("Planning Pipeline Log", log_name)
+		statuses = {stage.stage: stage.status for stage in log.stages}
+
+		for _purchase, _sell, _buffer_flag, label in morning_pipeline.PO_SNAPSHOT_COMBINATIONS:
+			# The capture ran the report again after the failed load and saved a Failed snapshot
+			self.assertEqual(statuses[f"Load PO Recommendation ({label})"], "Failed")
+			self.assertEqual(statuses[f"PO Recommendation Snapshot ({label})"], "Failed")
+
+		self.assertEqual(statuses["SO Recommendation Snapshot"], "Success")
+		self.assertEqual(log.status, "Partial Success")
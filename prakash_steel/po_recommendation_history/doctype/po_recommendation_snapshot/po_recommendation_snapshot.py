@@ -2,6 +2,8 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now_datetime, today
 
+from prakash_steel.utils.snapshot import insert_snapshot
+
 
 class PORecommendationSnapshot(Document):
 	def before_save(self):
@@ -12,9 +14,10 @@ class PORecommendationSnapshot(Document):
 # Core capture logic
 # ---------------------------------------------------------------------------
 
-def _capture_snapshot(purchase=1, sell=0, buffer_flag=1, sku_type_filter=None, item_code_filter=None, trigger="Scheduled"):
+def _capture_snapshot(purchase=1, sell=0, buffer_flag=1, sku_type_filter=None, item_code_filter=None, trigger="Scheduled", data=None):
 	"""
 	Run the PO Recommendation for PSP report and save results as a snapshot.
+	Pass `data` (report rows already computed for these filters) to skip running the report.
 	Returns the new snapshot document name.
 	"""
 	from prakash_steel.prakash_steel.report.po_recomendation_for_psp.po_recomendation_for_psp import execute
@@ -30,7 +33,8 @@ def _capture_snapshot(purchase=1, sell=0, buffer_flag=1, sku_type_filter=None, i
 		filters.item_code = item_code_filter
 
 	try:
-		_columns, data = execute(filters)
+		if data is None:
+			_columns, data = execute(filters)
 	except Exception as e:
 		frappe.log_error(frappe.get_traceback(), "PO Snapshot Capture Failed")
 		doc = frappe.new_doc("PO Recommendation Snapshot")
@@ -59,8 +63,9 @@ def _capture_snapshot(purchase=1, sell=0, buffer_flag=1, sku_type_filter=None, i
 	snap.sku_type_filter = sku_type_filter or ""
 	snap.item_code_filter = item_code_filter or ""
 
+	rows = []
 	for row in (data or []):
-		snap.append("items", {
+		rows.append({
 			"item_code": row.get("item_code"),
 			"sku_type": row.get("sku_type"),
 			"requirement": row.get("requirement") or 0,
@@ -101,8 +106,7 @@ def _capture_snapshot(purchase=1, sell=0, buffer_flag=1, sku_type_filter=None, i
 			"child_wip_open_po_shortage": row.get("child_wip_open_po_shortage") or 0,
 		})
 
-	snap.item_count = len(snap.items)
-	snap.insert(ignore_permissions=True)
+	insert_snapshot(snap, "PO Recommendation Snapshot Item", rows, count_field="item_count")
 	frappe.db.commit()
 	return snap.name
 
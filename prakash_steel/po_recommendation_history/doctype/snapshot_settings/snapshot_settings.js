@@ -0,0 +1,8 @@
+// Copyright (c) 2026, Beetashoke Chakraborty and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Snapshot Settings", {
+// 	refresh(frm) {
+
+// 	},
+// });
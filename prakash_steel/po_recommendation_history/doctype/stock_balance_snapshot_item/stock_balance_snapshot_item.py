@@ -1,9 +1,14 @@
 # Copyright (c) 2026, Beetashoke Chakraborty and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class StockBalanceSnapshotItem(Document):
 	pass
+
+
+def on_doctype_update():
+	# Snapshot pages read one snapshot at a time, filtered by item or SKU type
+	frappe.db.add_index("Stock Balance Snapshot Item", ["parent", "item_code"])
@@ -14,6 +14,9 @@ class DailyPORecommendation {
 		this.active_sku_tab = "BBMTA";
 		this.active_main_tab = "po_recommendation";
 		this.data_cache = {};
+		// Server-side sort and column filters per table ("so", "open_po", "stock_balance" or a SKU type)
+		this.sort_state = {};
+		this.filter_state = {};
 		// Last filters from Apply (or initial load); secondary tabs use these for API + headers.
 		this.last_applied = null;
 
@@ -302,6 +305,8 @@ class DailyPORecommendation {
 		// Apply button
 		$body.find(".apply-btn").on("click", () => {
 			this.data_cache = {};
+			this.sort_state = {};
+			this.filter_state = {};
 			this.load_data(true);
 		});
 	}
@@ -409,12 +414,15 @@ class DailyPORecommendation {
 
 		this.show_so_loading(true);
 
+		const method = "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_so_data";
+		const args = { snapshot_date, item_code, ...this.get_query_args("so") };
 		frappe.call({
-			method: "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_so_data",
-			args: { snapshot_date, item_code },
+			method,
+			args,
 			callback: (r) => {
 				this.show_so_loading(false);
 				if (r.message) {
+					r.message.request = { method, args };
 					this.so_cache = r.message;
 					this.render_so_table(r.message);
 				}
@@ -432,7 +440,8 @@ class DailyPORecommendation {
 		const $no_data = $(this.page.body).find(".so-no-data");
 		$no_data.hide();
 
-		if (!result.data || result.data.length === 0) {
+		// Keep the grid while column filters are active, so they can be changed or cleared
+		if ((!result.data || result.data.length === 0) && !this.has_filters("so")) {
 			if (this.so_datatable) { this.so_datatable.destroy(); this.so_datatable = null; }
 			$wrapper.empty();
 			$no_data.show();
@@ -453,12 +462,16 @@ class DailyPORecommendation {
 			">
 				<span style="font-weight:700; color:${accent}; font-size:13px;">Open SO Report</span>
 				<span style="color:#6c757d;">
-					${result.data.length} record${result.data.length !== 1 ? "s" : ""}
+					${this.record_count_text(result)}
 					&nbsp;·&nbsp; Snapshot Date: <strong>${this.fmt_date(snapshot_date)}</strong>
 				</span>
+				${result.next_cursor ? `<button class="btn btn-xs btn-default load-more-btn" style="margin-left:auto;">${__("Load More")}</button>` : ""}
 			</div>
 			<div class="so-dt-wrapper"></div>
 		`);
+		$wrapper.find(".load-more-btn").on("click", (e) => {
+			this.load_more(result, $(e.currentTarget), (res) => this.render_so_table(res));
+		});
 
 		const order_status_map = {
 			BLACK:  { bg: "#000000", text: "#FFFFFF" },
@@ -523,6 +536,9 @@ class DailyPORecommendation {
 			columns: dt_columns,
 			data: dt_data,
 			inlineFilters: true,
+			events: {
+				onSortColumn: (column) => this.on_sort_column("so", result, column),
+			},
 			layout: "fixed",
 			cellHeight: 32,
 			serialNoColumn: false,
@@ -531,6 +547,7 @@ class DailyPORecommendation {
 			translations: frappe.utils.datatable.get_translations(),
 			noDataMessage: __("No data found"),
 		});
+		this.bind_server_filters("so", container, dt_columns);
 	}
 
 	show_so_loading(state) {
@@ -590,12 +607,15 @@ class DailyPORecommendation {
 
 		this.show_loading(true);
 
+		const method = "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_sku_data";
+		const args = { sku_type, snapshot_date, item_code, ...this.get_query_args(sku_type) };
 		frappe.call({
-			method: "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_sku_data",
-			args: { sku_type, snapshot_date, item_code },
+			method,
+			args,
 			callback: (r) => {
 				this.show_loading(false);
 				if (r.message) {
+					r.message.request = { method, args };
 					this.data_cache[cache_key] = r.message;
 					this.render_table(sku_type, r.message);
 				}
@@ -607,6 +627,110 @@ class DailyPORecommendation {
 		});
 	}
 
+	get_query_args(table_key) {
+		const args = { ...(this.sort_state[table_key] || {}) };
+		const filters = this.filter_state[table_key];
+		if (filters && Object.keys(filters).length) {
+			args.filters = JSON.stringify(filters);
+		}
+		return args;
+	}
+
+	record_count_text(result) {
+		const count = result.data.length;
+		if (result.total && result.total > count) {
+			return `${count} of ${result.total} records`;
+		}
+		return `${count} record${count !== 1 ? "s" : ""}`;
+	}
+
+	// Fetch the page after the last loaded row and append it to the cached result
+	load_more(result, $btn, render) {
+		if (!result.next_cursor || !result.request) return;
+		$btn.prop("disabled", true).text(__("Loading..."));
+
+		frappe.call({
+			method: result.request.method,
+			args: { ...result.request.args, cursor: result.next_cursor },
+			callback: (r) => {
+				if (!r.message) return;
+				result.data = result.data.concat(r.message.data);
+				result.next_cursor = r.message.next_cursor;
+				render(result);
+			},
+			error: () => {
+				$btn.prop("disabled", false).text(__("Load More"));
+			},
+		});
+	}
+
+	// Only part of the snapshot is loaded while a next page exists, so sort on the server
+	on_sort_column(table_key, result, column) {
+		if (!result.next_cursor) return;
+		this.sort_state[table_key] = column.sortOrder === "none"
+			? null
+			: { sort_by: column.id, sort_order: column.sortOrder };
+		this.reload_table(table_key);
+	}
+
+	// The grid's inline filters only see the loaded rows, so send them to the server and
+	// re-query from the first page, like sorting
+	bind_server_filters(table_key, container, dt_columns) {
+		const $container = $(container);
+		const column_at = (input) => dt_columns[$(input).data("colIndex")];
+		const active = this.filter_state[table_key] || {};
+
+		// The table is re-created on every load; show the active filters again
+		$container.find(".dt-filter").each((_, input) => {
+			const column = column_at(input);
+			if (column && active[column.id]) $(input).val(active[column.id]);
+		});
+		if (this.focused_filter && this.focused_filter.table_key === table_key) {
+			const $input = $container.find(`.dt-filter[data-col-index="${this.focused_filter.col_index}"]`);
+			const value = $input.val() || "";
+			$input.trigger("focus");
+			if ($input[0]) $input[0].setSelectionRange(value.length, value.length);
+			this.focused_filter = null;
+		}
+
+		const apply = frappe.utils.debounce((input) => {
+			const filters = {};
+			$container.find(".dt-filter").each((_, el) => {
+				const column = column_at(el);
+				const value = ($(el).val() || "").trim();
+				if (column && value) filters[column.id] = value;
+			});
+			if (JSON.stringify(filters) === JSON.stringify(active)) return;
+
+			this.filter_state[table_key] = filters;
+			this.focused_filter = { table_key, col_index: $(input).data("colIndex") };
+			this.reload_table(table_key);
+		}, 500);
+		$container.on("input", ".dt-filter", (e) => apply(e.currentTarget));
+	}
+
+	has_filters(table_key) {
+		return Object.keys(this.filter_state[table_key] || {}).length > 0;
+	}
+
+	// Drop a table's cached result and load it again with the current sort and filters
+	reload_table(table_key) {
+		if (table_key === "so") {
+			this.so_cache = null;
+			this.load_so_data();
+		} else if (table_key === "open_po") {
+			this.open_po_cache = null;
+			this.load_open_po_data();
+		} else if (table_key === "stock_balance") {
+			this.stock_balance_cache = null;
+			this.load_stock_balance_data();
+		} else {
+			const { snapshot_date, item_code } = this.get_filter_values();
+			delete this.data_cache[`${table_key}__${snapshot_date}__${item_code || ""}`];
+			this.fetch_and_render(table_key, snapshot_date, item_code);
+		}
+	}
+
 	fmt_date(iso) {
 		// "2026-04-13" → "13-04-26"
 		if (!iso) return iso;
@@ -631,7 +755,8 @@ class DailyPORecommendation {
 		const $no_data = $(this.page.body).find(".sku-no-data");
 		$no_data.hide();
 
-		if (!result.data || result.data.length === 0) {
+		// Keep the grid while column filters are active, so they can be changed or cleared
+		if ((!result.data || result.data.length === 0) && !this.has_filters(sku_type)) {
 			// destroy any existing datatable
 			if (this.datatable) { this.datatable.destroy(); this.datatable = null; }
 			$wrapper.empty();
@@ -668,12 +793,16 @@ class DailyPORecommendation {
 			">
 				<span style="font-weight:700; color:${accent}; font-size:13px;">${sku_type}</span>
 				<span style="color:#6c757d;">
-					${result.data.length} record${result.data.length !== 1 ? "s" : ""}
+					${this.record_count_text(result)}
 					&nbsp;·&nbsp; Snapshot Date: <strong>${this.fmt_date(snapshot_date)}</strong>
 				</span>
+				${result.next_cursor ? `<button class="btn btn-xs btn-default load-more-btn" style="margin-left:auto;">${__("Load More")}</button>` : ""}
 			</div>
 			<div class="dt-wrapper"></div>
 		`);
+		$wrapper.find(".load-more-btn").on("click", (e) => {
+			this.load_more(result, $(e.currentTarget), (res) => this.render_table(sku_type, res));
+		});
 
 		// Prepare columns for Frappe DataTable
 		const dt_columns = result.columns.map(col => {
@@ -723,6 +852,9 @@ class DailyPORecommendation {
 			columns: dt_columns,
 			data: dt_data,
 			inlineFilters: true,
+			events: {
+				onSortColumn: (column) => this.on_sort_column(sku_type, result, column),
+			},
 			layout: "fixed",
 			cellHeight: 32,
 			serialNoColumn: false,
@@ -731,6 +863,7 @@ class DailyPORecommendation {
 			translations: frappe.utils.datatable.get_translations(),
 			noDataMessage: __("No data found"),
 		});
+		this.bind_server_filters(sku_type, container, dt_columns);
 	}
 
 	show_loading(state) {
@@ -760,12 +893,15 @@ class DailyPORecommendation {
 
 		this.show_open_po_loading(true);
 
+		const method = "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_open_po_data";
+		const args = { snapshot_date, item_code, ...this.get_query_args("open_po") };
 		frappe.call({
-			method: "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_open_po_data",
-			args: { snapshot_date, item_code },
+			method,
+			args,
 			callback: (r) => {
 				this.show_open_po_loading(false);
 				if (r.message) {
+					r.message.request = { method, args };
 					this.open_po_cache = r.message;
 					this.render_open_po_table(r.message);
 				}
@@ -783,7 +919,8 @@ class DailyPORecommendation {
 		const $no_data = $(this.page.body).find(".open-po-no-data");
 		$no_data.hide();
 
-		if (!result.data || result.data.length === 0) {
+		// Keep the grid while column filters are active, so they can be changed or cleared
+		if ((!result.data || result.data.length === 0) && !this.has_filters("open_po")) {
 			if (this.open_po_datatable) { this.open_po_datatable.destroy(); this.open_po_datatable = null; }
 			$wrapper.empty();
 			$no_data.show();
@@ -805,12 +942,16 @@ class DailyPORecommendation {
 			">
 				<span style="font-weight:700; color:${accent}; font-size:13px;">Open PO Report</span>
 				<span style="color:#6c757d;">
-					${result.data.length} record${result.data.length !== 1 ? "s" : ""}
+					${this.record_count_text(result)}
 					&nbsp;·&nbsp; Snapshot Date: <strong>${this.fmt_date(snapshot_date)}</strong>
 				</span>
+				${result.next_cursor ? `<button class="btn btn-xs btn-default load-more-btn" style="margin-left:auto;">${__("Load More")}</button>` : ""}
 			</div>
 			<div class="open-po-dt-wrapper"></div>
 		`);
+		$wrapper.find(".load-more-btn").on("click", (e) => {
+			this.load_more(result, $(e.currentTarget), (res) => this.render_open_po_table(res));
+		});
 
 		const dt_columns = result.columns.map(col => {
 			const base = {
@@ -868,6 +1009,9 @@ class DailyPORecommendation {
 			columns: dt_columns,
 			data: dt_data,
 			inlineFilters: true,
+			events: {
+				onSortColumn: (column) => this.on_sort_column("open_po", result, column),
+			},
 			layout: "fixed",
 			cellHeight: 32,
 			serialNoColumn: false,
@@ -876,6 +1020,7 @@ class DailyPORecommendation {
 			translations: frappe.utils.datatable.get_translations(),
 			noDataMessage: __("No data found"),
 		});
+		this.bind_server_filters("open_po", container, dt_columns);
 	}
 
 	show_open_po_loading(state) {
@@ -896,12 +1041,15 @@ class DailyPORecommendation {
 
 		this.show_stock_balance_loading(true);
 
+		const method = "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_stock_balance_data";
+		const args = { snapshot_date, item_code, ...this.get_query_args("stock_balance") };
 		frappe.call({
-			method: "prakash_steel.po_recommendation_history.page.daily_po_recommendation.daily_po_recommendation.get_stock_balance_data",
-			args: { snapshot_date, item_code },
+			method,
+			args,
 			callback: (r) => {
 				this.show_stock_balance_loading(false);
 				if (r.message) {
+					r.message.request = { method, args };
 					this.stock_balance_cache = r.message;
 					this.render_stock_balance_table(r.message);
 				}
@@ -919,7 +1067,8 @@ class DailyPORecommendation {
 		const $no_data = $(this.page.body).find(".stock-balance-no-data");
 		$no_data.hide();
 
-		if (!result.data || result.data.length === 0) {
+		// Keep the grid while column filters are active, so they can be changed or cleared
+		if ((!result.data || result.data.length === 0) && !this.has_filters("stock_balance")) {
 			if (this.stock_balance_datatable) {
 				this.stock_balance_datatable.destroy();
 				this.stock_balance_datatable = null;
@@ -944,12 +1093,16 @@ class DailyPORecommendation {
 			">
 				<span style="font-weight:700; color:${accent}; font-size:13px;">Stock Balance Report</span>
 				<span style="color:#6c757d;">
-					${result.data.length} record${result.data.length !== 1 ? "s" : ""}
+					${this.record_count_text(result)}
 					&nbsp;·&nbsp; Snapshot Date: <strong>${this.fmt_date(snapshot_date)}</strong>
 				</span>
+				${result.next_cursor ? `<button class="btn btn-xs btn-default load-more-btn" style="margin-left:auto;">${__("Load More")}</button>` : ""}
 			</div>
 			<div class="stock-balance-dt-wrapper"></div>
 		`);
+		$wrapper.find(".load-more-btn").on("click", (e) => {
+			this.load_more(result, $(e.currentTarget), (res) => this.render_stock_balance_table(res));
+		});
 
 		const dt_columns = result.columns.map(col => {
 			const base = {
@@ -996,6 +1149,9 @@ class DailyPORecommendation {
 			columns: dt_columns,
 			data: dt_data,
 			inlineFilters: true,
+			events: {
+				onSortColumn: (column) => this.on_sort_column("stock_balance", result, column),
+			},
 			layout: "fixed",
 			cellHeight: 32,
 			serialNoColumn: false,
@@ -1004,6 +1160,7 @@ class DailyPORecommendation {
 			translations: frappe.utils.datatable.get_translations(),
 			noDataMessage: __("No data found"),
 		});
+		this.bind_server_filters("stock_balance", container, dt_columns);
 	}
 
 	show_stock_balance_loading(state) {
@@ -1,5 +1,10 @@
+import re
+
 import frappe
 from frappe import _
+from frappe.utils import cint, flt
+
+from prakash_steel.utils.snapshot import diff_snapshots, get_snapshot_page
 
 SKU_COMBO = {
 	"PTA": {"purchase": 1, "sell": 0, "buffer_flag": 1},
@@ -17,6 +22,16 @@ SKU_COMBO = {
 BUFFER_SKUS = {"PTA", "BOTA", "TRMTA", "BBMTA", "RBMTA"}
 CHILD_SKUS = {"BBMTA", "RBMTA", "BBMTO", "RBMTO"}  # SKUs that show child columns
 
+COLOUR_ORDER = {"BLACK": 0, "RED": 1, "YELLOW": 2, "GREEN": 3, "WHITE": 4}
+
+# Rows per page sent to the browser; exports pass page_length=0 to get every row
+PAGE_LENGTH = 500
+
+NUMERIC_FIELDTYPES = ("Float", "Int", "Currency")
+
+# Numeric column filter: optional comparison operator, then a number
+NUMERIC_FILTER_PATTERN = re.compile(r"^\s*(>=|<=|!=|>|<|=)?\s*(-?\d+(?:\.\d+)?)\s*$")
+
 
 def get_columns(sku_type):
 	is_buffer = sku_type in BUFFER_SKUS
@@ -188,7 +203,16 @@ def _get_latest_snapshot(snapshot_date, purchase, sell, buffer_flag):
 
 
 @frappe.whitelist()
-def get_sku_data(sku_type, snapshot_date, item_code=None):
+def get_sku_data(
+	sku_type,
+	snapshot_date,
+	item_code=None,
+	filters=None,
+	sort_by=None,
+	sort_order="asc",
+	cursor=None,
+	page_length=None,
+):
 	combo = SKU_COMBO.get(sku_type)
 	if not combo:
 		frappe.throw(_(f"Unknown SKU type: {sku_type}"))
@@ -196,14 +220,10 @@ def get_sku_data(sku_type, snapshot_date, item_code=None):
 	columns = get_columns(sku_type)
 	snap = _get_latest_snapshot(snapshot_date, combo["purchase"], combo["sell"], combo["buffer_flag"])
 	if not snap:
-		return {"columns": columns, "data": []}
+		return _empty_page(columns)
 
 	is_buffer = sku_type in BUFFER_SKUS
 
-	item_filters = {"parent": snap.name, "sku_type": sku_type}
-	if item_code:
-		item_filters["item_code"] = item_code
-
 	base_fields = [
 		"item_code",
 		"requirement",
@@ -249,26 +269,130 @@ def get_sku_data(sku_type, snapshot_date, item_code=None):
 
 	fields = base_fields + (buffer_extra_fields if sku_type in CHILD_SKUS else [])
 
-	rows = frappe.get_all(
-		"PO Recommendation Snapshot Item",
-		filters=item_filters,
-		fields=fields,
-		order_by="item_code asc",
+	item_filters = _get_row_filters(columns, fields, filters, item_code)
+	item_filters["sku_type"] = sku_type
+
+	# Buffer SKUs are listed by on-hand colour (BLACK first), then item code
+	default_sort = (
+		[_colour_rank_sql(), "IFNULL(`item_code`, '')"] if is_buffer else ["IFNULL(`item_code`, '')"]
 	)
 
-	COLOUR_ORDER = {"BLACK": 0, "RED": 1, "YELLOW": 2, "GREEN": 3, "WHITE": 4}
+	page = get_snapshot_page(
+		"PO Recommendation Snapshot",
+		snap.name,
+		fields,
+		sort_keys=_get_sort_keys(columns, fields, sort_by, default_sort),
+		sort_order=sort_order,
+		cursor=cursor,
+		page_length=_get_page_length(page_length),
+		filters=item_filters,
+	)
 
 	snap_time = str(snap.snapshot_time)[:8] if snap.snapshot_time else ""
-	data = []
-	for row in rows:
-		row = dict(row)
+	for row in page.data:
 		row["snapshot_time"] = snap_time
-		data.append(row)
 
-	if is_buffer:
-		data.sort(key=lambda r: COLOUR_ORDER.get(r.get("on_hand_colour") or "", 99))
+	return _page_response(columns, page)
+
+
+# Fields compared between two days' snapshots by compare_snapshots
+COMPARE_FIELDS = ["order_recommendation", "on_hand_colour", "net_flow", "on_hand_stock"]
+
+
+def get_compare_columns(view):
+	cols = [
+		{
+			"label": _("Item Code"),
+			"fieldname": "item_code",
+			"fieldtype": "Link",
+			"options": "Item",
+			"width": 160,
+		},
+	]
+	if view in CHILD_SKUS:
+		cols.append(
+			{
+				"label": _("Child Item Code"),
+				"fieldname": "child_item_code",
+				"fieldtype": "Link",
+				"options": "Item",
+				"width": 150,
+			}
+		)
+	cols += [
+		{"label": _("Change"), "fieldname": "change_type", "fieldtype": "Data", "width": 90},
+		{
+			"label": _("Order Rec (From)"),
+			"fieldname": "old_order_recommendation",
+			"fieldtype": "Float",
+			"width": 130,
+		},
+		{
+			"label": _("Order Rec (To)"),
+			"fieldname": "new_order_recommendation",
+			"fieldtype": "Float",
+			"width": 120,
+		},
+		{
+			"label": _("Order Rec Change"),
+			"fieldname": "order_recommendation_delta",
+			"fieldtype": "Float",
+			"width": 130,
+		},
+		{"label": _("Colour (From)"), "fieldname": "old_on_hand_colour", "fieldtype": "Data", "width": 110},
+		{"label": _("Colour (To)"), "fieldname": "new_on_hand_colour", "fieldtype": "Data", "width": 100},
+		{"label": _("Net Flow (From)"), "fieldname": "old_net_flow", "fieldtype": "Float", "width": 120},
+		{"label": _("Net Flow (To)"), "fieldname": "new_net_flow", "fieldtype": "Float", "width": 110},
+		{"label": _("Net Flow Change"), "fieldname": "net_flow_delta", "fieldtype": "Float", "width": 120},
+		{"label": _("Stock (From)"), "fieldname": "old_on_hand_stock", "fieldtype": "Float", "width": 110},
+		{"label": _("Stock (To)"), "fieldname": "new_on_hand_stock", "fieldtype": "Float", "width": 100},
+		{"label": _("Stock Change"), "fieldname": "on_hand_stock_delta", "fieldtype": "Float", "width": 110},
+	]
+	return cols
 
-	return {"columns": columns, "data": data}
+
+@frappe.whitelist()
+def compare_snapshots(from_date, to_date, view, item_code=None, cursor=None, page_length=None):
+	"""
+	Return the items of one SKU view whose recommendation changed between two snapshot dates.
+
+	Compares the latest successful snapshot of each date and returns only added, removed
+	or changed rows, with the from/to values and the change in order recommendation,
+	on-hand colour, net flow and on-hand stock. Paged with a cursor like get_sku_data.
+	"""
+	combo = SKU_COMBO.get(view)
+	if not combo:
+		frappe.throw(_(f"Unknown SKU type: {view}"))
+
+	columns = get_compare_columns(view)
+	from_snap = _get_latest_snapshot(from_date, combo["purchase"], combo["sell"], combo["buffer_flag"])
+	to_snap = _get_latest_snapshot(to_date, combo["purchase"], combo["sell"], combo["buffer_flag"])
+	if not from_snap or not to_snap:
+		missing = from_date if not from_snap else to_date
+		frappe.throw(_("No {0} snapshot found for {1}").format(view, frappe.format(missing, "Date")))
+
+	filters = {"sku_type": view}
+	if item_code:
+		filters["item_code"] = item_code
+
+	diff = diff_snapshots(
+		"PO Recommendation Snapshot",
+		from_snap.name,
+		to_snap.name,
+		COMPARE_FIELDS,
+		filters=filters,
+		cursor=cursor,
+		page_length=_get_page_length(page_length),
+	)
+
+	return {
+		"columns": columns,
+		"data": diff.data,
+		"next_cursor": diff.next_cursor,
+		"summary": diff.summary,
+		"from_snapshot": from_snap.name,
+		"to_snapshot": to_snap.name,
+	}
 
 
 SO_COLUMNS = [
@@ -309,7 +433,15 @@ SO_FIELDS = [c["fieldname"] for c in SO_COLUMNS]
 
 
 @frappe.whitelist()
-def get_so_data(snapshot_date, item_code=None):
+def get_so_data(
+	snapshot_date,
+	item_code=None,
+	filters=None,
+	sort_by=None,
+	sort_order="asc",
+	cursor=None,
+	page_length=None,
+):
 	snap = frappe.get_all(
 		"SO Recommendation Snapshot",
 		filters={"snapshot_date": snapshot_date, "status": "Success"},
@@ -318,22 +450,26 @@ def get_so_data(snapshot_date, item_code=None):
 		limit=1,
 	)
 	if not snap:
-		return {"columns": SO_COLUMNS, "data": []}
+		return _empty_page(SO_COLUMNS)
 
 	snap = snap[0]
-	item_filters = {"parent": snap.name}
-	if item_code:
-		item_filters["item_code"] = item_code
-
-	rows = frappe.get_all(
-		"SO Recommendation Snapshot Item",
-		filters=item_filters,
-		fields=SO_FIELDS,
-		order_by="sales_order asc, item_code asc",
+	page = get_snapshot_page(
+		"SO Recommendation Snapshot",
+		snap.name,
+		SO_FIELDS,
+		sort_keys=_get_sort_keys(
+			SO_COLUMNS,
+			SO_FIELDS,
+			sort_by,
+			["IFNULL(`sales_order`, '')", "IFNULL(`item_code`, '')"],
+		),
+		sort_order=sort_order,
+		cursor=cursor,
+		page_length=_get_page_length(page_length),
+		filters=_get_row_filters(SO_COLUMNS, SO_FIELDS, filters, item_code),
 	)
 
-	data = [dict(r) for r in rows]
-	return {"columns": SO_COLUMNS, "data": data}
+	return _page_response(SO_COLUMNS, page)
 
 
 @frappe.whitelist()
@@ -341,7 +477,7 @@ def export_sku_xlsx(sku_type, snapshot_date, item_code=None):
 	import base64
 	from frappe.utils.xlsxutils import make_xlsx
 
-	result = get_sku_data(sku_type, snapshot_date, item_code)
+	result = get_sku_data(sku_type, snapshot_date, item_code, page_length=0)
 	columns = result["columns"]
 	data = result["data"]
 
@@ -362,7 +498,7 @@ def export_so_xlsx(snapshot_date, item_code=None):
 	import base64
 	from frappe.utils.xlsxutils import make_xlsx
 
-	result = get_so_data(snapshot_date, item_code)
+	result = get_so_data(snapshot_date, item_code, page_length=0)
 	columns = result["columns"]
 	data = result["data"]
 
@@ -398,9 +534,19 @@ OPEN_PO_COLUMNS = [
 
 OPEN_PO_FIELDS = [c["fieldname"] for c in OPEN_PO_COLUMNS]
 
+EXCLUDED_PO_STATUSES = ("Closed", "Completed", "Cancelled", "To Bill")
+
 
 @frappe.whitelist()
-def get_open_po_data(snapshot_date, item_code=None):
+def get_open_po_data(
+	snapshot_date,
+	item_code=None,
+	filters=None,
+	sort_by=None,
+	sort_order="asc",
+	cursor=None,
+	page_length=None,
+):
 	snap = frappe.get_all(
 		"Purchase Order Recommendation Snapshot",
 		filters={"snapshot_date": snapshot_date, "status": "Success"},
@@ -409,28 +555,47 @@ def get_open_po_data(snapshot_date, item_code=None):
 		limit=1,
 	)
 	if not snap:
-		return {"columns": OPEN_PO_COLUMNS, "data": []}
+		return _empty_page(OPEN_PO_COLUMNS)
 
 	snap = snap[0]
-	item_filters = {"parent": snap.name}
-	if item_code:
-		item_filters["item_code"] = item_code
 
 	# Fetch snapshot fields (excluding payment_terms_template which lives on PO itself)
 	snap_fields = [f for f in OPEN_PO_FIELDS if f != "payment_terms_template"]
-	rows = frappe.get_all(
-		"Purchase Order Recommendation Snapshot Item",
-		filters=item_filters,
-		fields=snap_fields,
-		order_by="purchase_order asc, item_code asc",
-	)
 
-	# Filter out closed/completed/cancelled rows at snapshot level
-	EXCLUDED_STATUSES = {"Closed", "Completed", "Cancelled", "To Bill"}
-	data = [dict(r) for r in rows if (r.get("status") or "") not in EXCLUDED_STATUSES]
+	# Drop closed/completed/cancelled rows at snapshot level, and lines closed on the PO
+	# itself via Purchase Order Item.custom_closed, in the same query as the page
+	excluded_statuses = ", ".join(frappe.db.escape(status) for status in EXCLUDED_PO_STATUSES)
+	conditions = [
+		f"IFNULL(src.status, '') NOT IN ({excluded_statuses})",
+		"""NOT EXISTS (
+			SELECT 1 FROM `tabPurchase Order Item` poi
+			WHERE poi.parent = src.purchase_order
+				AND poi.item_code = src.item_code
+				AND poi.custom_closed = 1
+		)""",
+	]
+
+	page = get_snapshot_page(
+		"Purchase Order Recommendation Snapshot",
+		snap.name,
+		snap_fields,
+		sort_keys=_get_sort_keys(
+			OPEN_PO_COLUMNS,
+			snap_fields,
+			sort_by,
+			["IFNULL(`purchase_order`, '')", "IFNULL(`item_code`, '')"],
+		),
+		sort_order=sort_order,
+		cursor=cursor,
+		page_length=_get_page_length(page_length),
+		filters=_get_row_filters(OPEN_PO_COLUMNS, snap_fields, filters, item_code),
+		conditions=conditions,
+		child_doctype="Purchase Order Recommendation Snapshot Item",
+	)
 
-	# Fetch payment_terms_template from Purchase Order (parent)
-	po_names = list({r["purchase_order"] for r in data if r.get("purchase_order")})
+	# Fetch payment_terms_template from Purchase Order (parent) for this page only
+	po_names = list({r["purchase_order"] for r in page.data if r.get("purchase_order")})
+	terms_map = {}
 	if po_names:
 		po_parents = frappe.get_all(
 			"Purchase Order",
@@ -439,20 +604,10 @@ def get_open_po_data(snapshot_date, item_code=None):
 		)
 		terms_map = {p["name"]: p.get("payment_terms_template") or "" for p in po_parents}
 
-		# Fetch custom_closed from Purchase Order Item (child table) — keyed by (parent, item_code)
-		poi_rows = frappe.get_all(
-			"Purchase Order Item",
-			filters={"parent": ["in", po_names], "custom_closed": 1},
-			fields=["parent", "item_code"],
-		)
-		closed_items = {(r["parent"], r["item_code"]) for r in poi_rows}
-
-		# Filter out custom_closed items and map payment terms
-		data = [row for row in data if (row.get("purchase_order"), row.get("item_code")) not in closed_items]
-		for row in data:
-			row["payment_terms_template"] = terms_map.get(row.get("purchase_order"), "")
+	for row in page.data:
+		row["payment_terms_template"] = terms_map.get(row.get("purchase_order"), "")
 
-	return {"columns": OPEN_PO_COLUMNS, "data": data}
+	return _page_response(OPEN_PO_COLUMNS, page)
 
 
 @frappe.whitelist()
@@ -460,7 +615,7 @@ def export_open_po_xlsx(snapshot_date, item_code=None):
 	import base64
 	from frappe.utils.xlsxutils import make_xlsx
 
-	result = get_open_po_data(snapshot_date, item_code)
+	result = get_open_po_data(snapshot_date, item_code, page_length=0)
 	columns = result["columns"]
 	data = result["data"]
 
@@ -488,7 +643,15 @@ STOCK_BALANCE_FIELDS = [c["fieldname"] for c in STOCK_BALANCE_COLUMNS]
 
 
 @frappe.whitelist()
-def get_stock_balance_data(snapshot_date, item_code=None):
+def get_stock_balance_data(
+	snapshot_date,
+	item_code=None,
+	filters=None,
+	sort_by=None,
+	sort_order="asc",
+	cursor=None,
+	page_length=None,
+):
 	snap = frappe.get_all(
 		"Stock Balance Snapshot",
 		filters={"snapshot_date": snapshot_date, "status": "Success"},
@@ -497,22 +660,23 @@ def get_stock_balance_data(snapshot_date, item_code=None):
 		limit=1,
 	)
 	if not snap:
-		return {"columns": STOCK_BALANCE_COLUMNS, "data": []}
+		return _empty_page(STOCK_BALANCE_COLUMNS)
 
 	snap = snap[0]
-	item_filters = {"parent": snap.name}
-	if item_code:
-		item_filters["item_code"] = item_code
-
-	rows = frappe.get_all(
-		"Stock Balance Snapshot Item",
-		filters=item_filters,
-		fields=STOCK_BALANCE_FIELDS,
-		order_by="item_code asc",
+	page = get_snapshot_page(
+		"Stock Balance Snapshot",
+		snap.name,
+		STOCK_BALANCE_FIELDS,
+		sort_keys=_get_sort_keys(
+			STOCK_BALANCE_COLUMNS, STOCK_BALANCE_FIELDS, sort_by, ["IFNULL(`item_code`, '')"]
+		),
+		sort_order=sort_order,
+		cursor=cursor,
+		page_length=_get_page_length(page_length),
+		filters=_get_row_filters(STOCK_BALANCE_COLUMNS, STOCK_BALANCE_FIELDS, filters, item_code),
 	)
 
-	data = [dict(r) for r in rows]
-	return {"columns": STOCK_BALANCE_COLUMNS, "data": data}
+	return _page_response(STOCK_BALANCE_COLUMNS, page)
 
 
 @frappe.whitelist()
@@ -520,7 +684,7 @@ def export_stock_balance_xlsx(snapshot_date, item_code=None):
 	import base64
 	from frappe.utils.xlsxutils import make_xlsx
 
-	result = get_stock_balance_data(snapshot_date, item_code)
+	result = get_stock_balance_data(snapshot_date, item_code, page_length=0)
 	columns = result["columns"]
 	data = result["data"]
 
@@ -533,3 +697,68 @@ def export_stock_balance_xlsx(snapshot_date, item_code=None):
 		"filename": f"Stock_Balance_Report_{snapshot_date}.xlsx",
 		"content": base64.b64encode(xlsx_file.getvalue()).decode("utf-8"),
 	}
+
+
+def _get_page_length(page_length):
+	return PAGE_LENGTH if page_length in (None, "") else cint(page_length)
+
+
+def _get_row_filters(columns, fields, filters=None, item_code=None):
+	"""
+	Build snapshot row filters from the page's column filters.
+
+	`filters` is {fieldname: value} (JSON from the client); text columns match as
+	LIKE %value%, numeric columns match exactly or with a leading comparison operator
+	(">10", "<= 5"), like the grid's own inline filter. Only columns shown on the page can
+	be filtered; columns filled in after the query are left to the grid.
+	"""
+	fieldtypes = {c["fieldname"]: c["fieldtype"] for c in columns}
+	row_filters = {}
+
+	for fieldname, value in (frappe.parse_json(filters) if filters else {}).items():
+		if fieldname not in fieldtypes:
+			frappe.throw(_("Cannot filter on {0}").format(fieldname))
+		if value in (None, "") or fieldname not in fields:
+			continue
+		if fieldtypes[fieldname] in NUMERIC_FIELDTYPES:
+			match = NUMERIC_FILTER_PATTERN.match(str(value))
+			if match:
+				row_filters[fieldname] = [match.group(1) or "=", flt(match.group(2))]
+		else:
+			row_filters[fieldname] = ["like", f"%{value}%"]
+
+	if item_code:
+		row_filters["item_code"] = item_code
+
+	return row_filters
+
+
+def _get_sort_keys(columns, fields, sort_by, default_sort):
+	"""Return the SQL sort expressions for a page; sort_by must be one of the page's columns."""
+	fieldtypes = {c["fieldname"]: c["fieldtype"] for c in columns}
+	if sort_by and sort_by not in fieldtypes:
+		frappe.throw(_("Cannot sort on {0}").format(sort_by))
+
+	# Columns filled in after the query (snapshot time, payment terms) keep the default order
+	if not sort_by or sort_by not in fields:
+		return default_sort
+
+	if sort_by == "on_hand_colour":
+		return [_colour_rank_sql()]
+	if fieldtypes[sort_by] in NUMERIC_FIELDTYPES:
+		return [f"IFNULL(`{sort_by}`, 0)"]
+	return [f"IFNULL(`{sort_by}`, '')"]
+
+
+def _colour_rank_sql():
+	"""SQL for COLOUR_ORDER: BLACK first, unknown colours last."""
+	cases = " ".join(f"WHEN {frappe.db.escape(colour)} THEN {rank}" for colour, rank in COLOUR_ORDER.items())
+	return f"CASE `on_hand_colour` {cases} ELSE 99 END"
+
+
+def _empty_page(columns):
+	return {"columns": columns, "data": [], "next_cursor": None, "total": 0}
+
+
+def _page_response(columns, page):
+	return {"columns": columns, "data": page.data, "next_cursor": page.next_cursor, "total": page.total}
@@ -2,6 +2,8 @@ import frappe
 from frappe import _
 from frappe.utils import today
 
+from prakash_steel.utils.snapshot import get_snapshot_rows
+
 
 # The 4 standard combinations captured daily
 COMBINATIONS = [
@@ -113,14 +115,15 @@ def get_data(filters):
 		if not snap:
 			continue
 
-		item_filters = {"parent": snap.name}
+		item_filters = {}
 		if sku_types:
 			item_filters["sku_type"] = ["in", sku_types]
 		if item_code_filter:
 			item_filters["item_code"] = item_code_filter
 
-		rows = frappe.get_all(
-			"PO Recommendation Snapshot Item",
+		rows = get_snapshot_rows(
+			"PO Recommendation Snapshot",
+			snap.name,
 			filters=item_filters,
 			fields=[
 				"item_code", "sku_type", "requirement",
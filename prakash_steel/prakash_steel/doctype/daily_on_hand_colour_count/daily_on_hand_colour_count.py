@@ -0,0 +1,14 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class DailyOnHandColourCount(Document):
+	pass
+
+
+def on_doctype_update():
+	# Category Wise Trend Report reads one SKU type over a date range
+	frappe.db.add_index("Daily On Hand Colour Count", ["sku_type", "posting_date"])
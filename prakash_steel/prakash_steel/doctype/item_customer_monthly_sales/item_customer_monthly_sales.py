@@ -0,0 +1,15 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ItemCustomerMonthlySales(Document):
+	pass
+
+
+def on_doctype_update():
+	# SKU Wise Sales History reads a range of months; rebuilds look up one customer's items
+	frappe.db.add_index("Item Customer Monthly Sales", ["month_start", "item_code"])
+	frappe.db.add_index("Item Customer Monthly Sales", ["customer", "month_start"])
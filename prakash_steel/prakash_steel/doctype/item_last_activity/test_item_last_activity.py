@@ -0,0 +1,42 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+import frappe
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, today
+
+from prakash_steel.utils.item_last_activity import get_item_last_activity
+
+TEST_ITEM = "_Test Item Last Activity"
+
+
+class TestItemLastActivity(FrappeTestCase):
+	def setUp(self):
+		make_item(TEST_ITEM, {"is_stock_item": 0})
+
+	def test_cancel_falls_back_to_previous_invoice(self):
+		earlier = create_sales_invoice(
+			item_code=TEST_ITEM, qty=2, rate=100, posting_date=add_days(today(), -2)
+		)
+		later = create_sales_invoice(item_code=TEST_ITEM, qty=5, rate=120, posting_date=add_days(today(), -1))
+
+		activity = get_item_last_activity(TEST_ITEM)
+		self.assertEqual(activity.last_sale_voucher, later.name)
+		self.assertEqual(activity.last_sale_rate, 120)
+
+		later.cancel()
+
+		activity = get_item_last_activity(TEST_ITEM)
+		self.assertEqual(activity.last_sale_voucher, earlier.name)
+		self.assertEqual(getdate(activity.last_sale_date), getdate(add_days(today(), -2)))
+		self.assertEqual(activity.last_sale_qty, 2)
+		self.assertEqual(activity.last_sale_rate, 100)
+
+		earlier.cancel()
+
+		# No submitted invoice left: the section is cleared, the row stays
+		activity = get_item_last_activity(TEST_ITEM)
+		self.assertIsNone(activity.last_sale_voucher)
+		self.assertTrue(frappe.db.exists("Item Last Activity", TEST_ITEM))
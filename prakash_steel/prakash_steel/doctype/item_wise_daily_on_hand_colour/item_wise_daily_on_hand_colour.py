@@ -1,9 +1,81 @@
 # Copyright (c) 2026, beetashoke chakraborty and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class ItemwiseDailyOnHandColour(Document):
-	pass
+	def on_update(self):
+		previous = self.get_doc_before_save()
+		if previous and previous.posting_date and str(previous.posting_date) != str(self.posting_date):
+			update_daily_colour_counts(previous.posting_date)
+		update_daily_colour_counts(self.posting_date)
+
+	def after_delete(self):
+		# Other colour documents of the date may remain; count what is left
+		update_daily_colour_counts(self.posting_date)
+
+
+def update_daily_colour_counts(posting_date):
+	"""
+	Rebuild the Daily On Hand Colour Count rows of one date from its colour documents.
+
+	One row per (sku_type, colour) with the number of distinct items, so trend reports
+	read at most days x SKU types x 5 rows instead of every item of every day.
+	"""
+	if not posting_date:
+		return
+
+	counts = frappe.db.sql(
+		"""
+		SELECT
+			child.sku_type,
+			UPPER(TRIM(child.on_hand_colour)) AS on_hand_colour,
+			COUNT(DISTINCT child.item_code) AS item_count
+		FROM `tabOn hand colour table` child
+		INNER JOIN `tabItem wise Daily On Hand Colour` parent ON parent.name = child.parent
+		WHERE parent.posting_date = %s
+			AND IFNULL(child.item_code, '') != ''
+			AND IFNULL(child.sku_type, '') != ''
+			AND IFNULL(child.on_hand_colour, '') != ''
+		GROUP BY child.sku_type, UPPER(TRIM(child.on_hand_colour))
+		""",
+		(posting_date,),
+		as_dict=True,
+	)
+
+	frappe.db.delete("Daily On Hand Colour Count", {"posting_date": posting_date})
+	if not counts:
+		return
+
+	now = frappe.utils.now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Daily On Hand Colour Count",
+		[
+			"name",
+			"posting_date",
+			"sku_type",
+			"on_hand_colour",
+			"item_count",
+			"owner",
+			"modified_by",
+			"creation",
+			"modified",
+		],
+		[
+			(
+				frappe.generate_hash(length=10),
+				posting_date,
+				row.sku_type,
+				row.on_hand_colour,
+				row.item_count,
+				user,
+				user,
+				now,
+				now,
+			)
+			for row in counts
+		],
+	)
@@ -5,7 +5,9 @@ import frappe
 import math
 from frappe.model.document import Document
 from frappe.utils import flt
+from prakash_steel.utils.bom_cache import get_cached_bom
 from prakash_steel.utils.lead_time import get_default_bom
+from prakash_steel.utils.open_demand import get_open_demand_map
 
 
 class MRPGenaration(Document):
@@ -1338,7 +1340,7 @@ def traverse_bom_for_mrp(
 		return
 
 	try:
-		bom_doc = frappe.get_doc("BOM", bom)
+		bom_doc = get_cached_bom(bom)
 		bom_name = bom_doc.name
 		bom_quantity = flt(bom_doc.quantity)  # Quantity of parent item produced by this BOM
 		if bom_quantity <= 0:
@@ -1559,7 +1561,7 @@ def traverse_bom_for_mrp_with_net_rec(
 		return
 
 	try:
-		bom_doc = frappe.get_doc("BOM", bom)
+		bom_doc = get_cached_bom(bom)
 		bom_name = bom_doc.name
 		bom_quantity = flt(bom_doc.quantity)  # Quantity of parent item produced by this BOM
 		if bom_quantity <= 0:
@@ -1892,32 +1894,11 @@ def get_open_so_map_for_mrp():
 	Total SO = All Sales Orders regardless of delivery date (not used here).
 	For each Sales Order Item, if delivered_qty >= qty (over-delivered), treat as 0.
 	This ensures over-delivery on one SO doesn't reduce open quantity of another SO.
+	Read from the Open Demand Entry ledger, which stores that per open SO line.
 	"""
 	from frappe.utils import today
 
-	today_date = today()
-
-	so_rows = frappe.db.sql(
-		"""
-		SELECT
-			soi.item_code,
-			SUM(GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0))) as so_qty
-		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
-		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-			AND so.docstatus = 1
-			AND IFNULL(soi.delivery_date, '1900-01-01') <= %s
-		GROUP BY
-			soi.item_code
-		""",
-		(today_date,),
-		as_dict=True,
-	)
-
-	return {d.item_code: flt(d.so_qty) for d in so_rows}
+	return get_open_demand_map(to_date=today())
 
 
 def get_qualified_demand_map_for_mrp():
@@ -1949,28 +1930,8 @@ def get_qualified_demand_map_for_mrp():
 	today_date = today()
 
 	# Step 1: Build till_today map (Open SO where delivery_date <= today)
-	# Use max(0, qty - delivered_qty) per SO line to avoid negative open quantities
-	so_rows = frappe.db.sql(
-		"""
-		SELECT
-			soi.item_code,
-			SUM(GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0))) as so_qty
-		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
-		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-			AND so.docstatus = 1
-			AND IFNULL(soi.delivery_date, '1900-01-01') <= %s
-		GROUP BY
-			soi.item_code
-		""",
-		(today_date,),
-		as_dict=True,
-	)
-
-	till_today_map = {d.item_code: flt(d.so_qty) for d in so_rows}
+	# Open Demand Entry holds max(0, qty - delivered_qty) per open SO line
+	till_today_map = get_open_demand_map(to_date=today_date)
 
 	# Step 2: Build item maps (buffer flag, item type, TOG) for ALL items
 	# This is needed for spike calculation and final threshold checks
@@ -1,9 +1,14 @@
 # Copyright (c) 2026, beetashoke chakraborty and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class Onhandcolourtable(Document):
 	pass
+
+
+def on_doctype_update():
+	# SKU Wise Trend Report reads one SKU type (optionally a few items) across a date range
+	frappe.db.add_index("On hand colour table", ["sku_type", "item_code"])
@@ -0,0 +1,15 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class OpenDemandEntry(Document):
+	pass
+
+
+def on_doctype_update():
+	# Readers sum a range of delivery dates per item; refreshes replace one Sales Order's rows
+	frappe.db.add_index("Open Demand Entry", ["item_code", "delivery_date"])
+	frappe.db.add_index("Open Demand Entry", ["sales_order"])
@@ -0,0 +1,114 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+import frappe
+from erpnext.selling.doctype.sales_order.sales_order import make_delivery_note
+from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, today
+
+from prakash_steel.utils.open_demand import _rebuild_batch, get_open_demand_map
+
+TEST_ITEM = "_Test Open Demand Item"
+
+
+class TestOpenDemandEntry(FrappeTestCase):
+	def setUp(self):
+		make_item(TEST_ITEM, {"is_stock_item": 0, "over_delivery_receipt_allowance": 50})
+
+	def test_rows_follow_sales_order_submit_and_cancel(self):
+		so = _submit_sales_order([(10, 5), (4, 20)])
+		self.assertEqual(_open_demand(so), [(10, _in_days(5)), (4, _in_days(20))])
+
+		# Rebuilding again replaces the rows, it does not add to them
+		_rebuild_batch([so.name])
+		self.assertEqual(len(_open_demand(so)), 2)
+
+		so.reload()
+		so.custom_cancel_reason = "Test"
+		so.cancel()
+		self.assertEqual(_open_demand(so), [])
+
+	def test_delivery_note_reduces_open_qty(self):
+		so = _submit_sales_order([(10, 5)])
+
+		dn = make_delivery_note(so.name)
+		dn.items[0].qty = 4
+		dn.insert()
+		dn.submit()
+		self.assertEqual(_open_demand(so), [(6, _in_days(5))])
+
+		dn.cancel()
+		self.assertEqual(_open_demand(so), [(10, _in_days(5))])
+
+	def test_over_delivered_line_is_not_stored(self):
+		so = _submit_sales_order([(10, 5)])
+
+		dn = make_delivery_note(so.name)
+		dn.items[0].qty = 12
+		dn.insert()
+		dn.submit()
+		self.assertEqual(_open_demand(so), [])
+		self.assertEqual(get_open_demand_map([TEST_ITEM]), {})
+
+	def test_closed_line_is_not_stored(self):
+		so = _submit_sales_order([(10, 5), (4, 20)])
+
+		so.reload()
+		so.items[0].custom_closed = 1
+		so.save()
+		self.assertEqual(_open_demand(so), [(4, _in_days(20))])
+
+	def test_open_demand_map_delivery_date_range(self):
+		_submit_sales_order([(10, 5), (4, 20)])
+		_submit_sales_order([(3, 20)])
+
+		def open_qty(from_date=None, to_date=None):
+			return get_open_demand_map([TEST_ITEM], from_date=from_date, to_date=to_date).get(TEST_ITEM)
+
+		self.assertEqual(open_qty(), 17)
+		self.assertEqual(open_qty(to_date=_in_days(10)), 10)
+		self.assertEqual(open_qty(from_date=_in_days(10)), 7)
+		# Both ends are inclusive
+		self.assertEqual(open_qty(_in_days(5), _in_days(20)), 17)
+		self.assertIsNone(open_qty(_in_days(21)))
+		self.assertEqual(get_open_demand_map([]), {})
+
+
+def _submit_sales_order(lines):
+	"""Submit a Sales Order with one TEST_ITEM line per (qty, delivery in days)."""
+	so = make_sales_order(
+		item_list=[
+			{
+				"item_code": TEST_ITEM,
+				"warehouse": "_Test Warehouse - _TC",
+				"qty": qty,
+				"rate": 100,
+				"delivery_date": _in_days(days),
+			}
+			for qty, days in lines
+		],
+		do_not_save=True,
+	)
+	so.custom_loading_and_cutting = "Include"
+	so.custom_special_condition = "Normal"
+	so.insert()
+	so.submit()
+	return so
+
+
+def _in_days(days):
+	return getdate(add_days(today(), days))
+
+
+def _open_demand(so):
+	return [
+		(row.open_qty, getdate(row.delivery_date))
+		for row in frappe.get_all(
+			"Open Demand Entry",
+			filters={"sales_order": so.name},
+			fields=["open_qty", "delivery_date"],
+			order_by="delivery_date asc",
+		)
+	]
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, beetashoke chakraborty and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Procurement Chain Entry", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,18 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ProcurementChainEntry(Document):
+	pass
+
+
+def on_doctype_update():
+	# Trackers read a range of indent dates (optionally one item); rebuilds find the
+	# Material Requests touched by a PO / PR / PI through its lines
+	frappe.db.add_index("Procurement Chain Entry", ["indent_date", "item_code"])
+	frappe.db.add_index("Procurement Chain Entry", ["material_request"])
+	frappe.db.add_index("Procurement Chain Entry", ["po_item"])
+	frappe.db.add_index("Procurement Chain Entry", ["purchase_receipt"])
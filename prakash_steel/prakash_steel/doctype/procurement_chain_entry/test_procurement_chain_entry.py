@@ -0,0 +1,64 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+import frappe
+from erpnext.buying.doctype.purchase_order.purchase_order import make_purchase_receipt
+from erpnext.stock.doctype.material_request.material_request import make_purchase_order
+from erpnext.stock.doctype.material_request.test_material_request import make_material_request
+from erpnext.stock.doctype.purchase_receipt.purchase_receipt import make_purchase_invoice
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from prakash_steel.utils.procurement_chain import rebuild_procurement_chain
+
+
+class TestProcurementChainEntry(FrappeTestCase):
+	def test_receipt_and_invoice_rows_follow_submit_and_cancel(self):
+		mr = make_material_request(item_code="_Test Item", qty=10)
+
+		po = make_purchase_order(mr.name)
+		po.supplier = "_Test Supplier"
+		po.schedule_date = add_days(today(), 7)
+		for row in po.items:
+			row.rate = 100
+		po.insert()
+		po.submit()
+		# The chain skips orders whose workflow state is not set, as the trackers did
+		po.db_set("workflow_state", "Approved")
+		rebuild_procurement_chain([mr.name])
+
+		self.assertEqual(_chain(mr.name), [(po.name, None, None)])
+
+		pr = make_purchase_receipt(po.name)
+		pr.custom_purchase_type = "Raw Material"
+		pr.insert()
+		pr.submit()
+		self.assertEqual(_chain(mr.name), [(po.name, pr.name, None)])
+
+		pi = make_purchase_invoice(pr.name)
+		pi.custom_purchase_type = "Raw Material"
+		pi.insert()
+		pi.submit()
+		self.assertEqual(_chain(mr.name), [(po.name, pr.name, pi.name)])
+
+		# The invoice and receipt find their Material Request through the chain rows themselves
+		pi.reload()
+		pi.custom_cancel_reason = "Test"
+		pi.cancel()
+		self.assertEqual(_chain(mr.name), [(po.name, pr.name, None)])
+
+		pr.reload()
+		pr.custom_cancel_reason = "Test"
+		pr.cancel()
+		self.assertEqual(_chain(mr.name), [(po.name, None, None)])
+
+
+def _chain(material_request):
+	return [
+		(row.purchase_order, row.purchase_receipt, row.purchase_invoice)
+		for row in frappe.get_all(
+			"Procurement Chain Entry",
+			filters={"material_request": material_request},
+			fields=["purchase_order", "purchase_receipt", "purchase_invoice"],
+		)
+	]
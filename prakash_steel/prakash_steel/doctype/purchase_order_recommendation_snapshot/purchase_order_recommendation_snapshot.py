@@ -2,6 +2,8 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now_datetime, today
 
+from prakash_steel.utils.snapshot import insert_snapshot
+
 
 class PurchaseOrderRecommendationSnapshot(Document):
 	def before_save(self):
@@ -12,9 +14,10 @@ class PurchaseOrderRecommendationSnapshot(Document):
 # Core capture logic
 # ---------------------------------------------------------------------------
 
-def _capture_snapshot(trigger="Scheduled"):
+def _capture_snapshot(trigger="Scheduled", data=None):
 	"""
 	Run the Open PO Analysis report and save results as a snapshot.
+	Pass `data` (report rows already computed) to skip running the report.
 	Returns the new snapshot document name.
 	"""
 	from prakash_steel.prakash_steel.report.open_po_analysis.open_po_analysis import execute
@@ -25,8 +28,9 @@ def _capture_snapshot(trigger="Scheduled"):
 	)
 
 	try:
-		result = execute(filters)
-		_columns, data = result[0], result[1]
+		if data is None:
+			result = execute(filters)
+			_columns, data = result[0], result[1]
 	except Exception:
 		frappe.log_error(frappe.get_traceback(), "PO Rec Snapshot Capture Failed")
 		doc = frappe.new_doc("Purchase Order Recommendation Snapshot")
@@ -45,8 +49,9 @@ def _capture_snapshot(trigger="Scheduled"):
 	snap.trigger = trigger
 	snap.status = "Success"
 
+	rows = []
 	for row in (data or []):
-		snap.append("items", {
+		rows.append({
 			"purchase_order": row.get("purchase_order"),
 			"po_date": row.get("date"),
 			"required_date": row.get("required_date"),
@@ -70,8 +75,7 @@ def _capture_snapshot(trigger="Scheduled"):
 			"received_qty_amount": row.get("received_qty_amount") or 0,
 		})
 
-	snap.row_count = len(snap.items)
-	snap.insert(ignore_permissions=True)
+	insert_snapshot(snap, "Purchase Order Recommendation Snapshot Item", rows)
 	frappe.db.commit()
 	return snap.name
 
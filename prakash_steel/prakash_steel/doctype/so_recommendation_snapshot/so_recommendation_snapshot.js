@@ -42,6 +42,16 @@ frappe.form.formatters["order_fullkit"] = function (value) {
 
 frappe.ui.form.on("SO Recommendation Snapshot", {
 	refresh(frm) {
+		// Delta snapshots only store changed rows; the full rows are rebuilt by the page and reports
+		if (frm.doc.storage_mode === "Delta") {
+			frm.set_intro(
+				__("Delta snapshot: the Items table shows only the rows that changed since the previous snapshot. Open the Daily PO Recommendation page or a snapshot report for the full data."),
+				"blue"
+			);
+		} else {
+			frm.set_intro("");
+		}
+
 		if (!frm.is_new()) {
 			frm.add_custom_button(__("Run Manual Snapshot"), () => {
 				frappe.call({
@@ -2,6 +2,8 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now_datetime, today
 
+from prakash_steel.utils.snapshot import insert_snapshot
+
 
 class SORecommendationSnapshot(Document):
 	def before_save(self):
@@ -12,9 +14,10 @@ class SORecommendationSnapshot(Document):
 # Core capture logic
 # ---------------------------------------------------------------------------
 
-def _capture_snapshot(trigger="Scheduled"):
+def _capture_snapshot(trigger="Scheduled", data=None):
 	"""
 	Run the Open SO Analysis report and save results as a snapshot.
+	Pass `data` (report rows already computed) to skip running the report.
 	Returns the new snapshot document name.
 	"""
 	from prakash_steel.prakash_steel.report.open_so_analysis.open_so_analysis import execute
@@ -25,9 +28,10 @@ def _capture_snapshot(trigger="Scheduled"):
 	)
 
 	try:
-		result = execute(filters)
-		# execute returns (columns, data, None, chart_data)
-		_columns, data = result[0], result[1]
+		if data is None:
+			result = execute(filters)
+			# execute returns (columns, data, None, chart_data)
+			_columns, data = result[0], result[1]
 	except Exception:
 		frappe.log_error(frappe.get_traceback(), "SO Snapshot Capture Failed")
 		doc = frappe.new_doc("SO Recommendation Snapshot")
@@ -61,10 +65,11 @@ def _capture_snapshot(trigger="Scheduled"):
 	snap.trigger = trigger
 	snap.status = "Success"
 
+	rows = []
 	for row in (data or []):
 		so_name = row.get("sales_order")
 		extra = so_extra.get(so_name) or {}
-		snap.append("items", {
+		rows.append({
 			"sales_order": so_name,
 			"so_date": row.get("date"),
 			"customer": row.get("customer"),
@@ -92,8 +97,7 @@ def _capture_snapshot(trigger="Scheduled"):
 			"pending_amount": row.get("pending_amount") or 0,
 		})
 
-	snap.row_count = len(snap.items)
-	snap.insert(ignore_permissions=True)
+	insert_snapshot(snap, "SO Recommendation Snapshot Item", rows)
 	frappe.db.commit()
 	return snap.name
 
@@ -4,3 +4,9 @@ from frappe.model.document import Document
 
 class SORecommendationSnapshotItem(Document):
 	pass
+
+
+def on_doctype_update():
+	# Snapshot pages read one snapshot at a time, filtered by item or SKU type
+	frappe.db.add_index("SO Recommendation Snapshot Item", ["parent", "item_code"])
+	frappe.db.add_index("SO Recommendation Snapshot Item", ["parent", "sku_type"])
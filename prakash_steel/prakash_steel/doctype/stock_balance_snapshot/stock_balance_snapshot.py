@@ -2,16 +2,19 @@ import frappe
 from frappe.model.document import Document
 from frappe.utils import now_datetime, today
 
+from prakash_steel.utils.snapshot import insert_snapshot
+
 
 class StockBalanceSnapshot(Document):
 	def before_save(self):
 		self.row_count = len(self.items)
 
 
-def _capture_snapshot(trigger="Scheduled", filters=None):
+def _capture_snapshot(trigger="Scheduled", filters=None, data=None):
 	"""
 	Run the Item Wise Stock Balance report and save results as a snapshot.
 	Always sets include_zero_stock so every active item appears (zero balance included).
+	Pass `data` (report rows already computed) to skip running the report.
 	Returns the new snapshot document name.
 	"""
 	from prakash_steel.prakash_steel.report.item_wise_stock_balance.item_wise_stock_balance import execute
@@ -21,7 +24,8 @@ def _capture_snapshot(trigger="Scheduled", filters=None):
 	filters["include_zero_stock"] = 1
 
 	try:
-		_columns, data = execute(filters)
+		if data is None:
+			_columns, data = execute(filters)
 	except Exception:
 		frappe.log_error(frappe.get_traceback(), "Stock Balance Snapshot Capture Failed")
 		doc = frappe.new_doc("Stock Balance Snapshot")
@@ -40,9 +44,9 @@ def _capture_snapshot(trigger="Scheduled", filters=None):
 	snap.trigger = trigger
 	snap.status = "Success"
 
+	rows = []
 	for row in data or []:
-		snap.append(
-			"items",
+		rows.append(
 			{
 				"item_code": row.get("item_code"),
 				"item_name": row.get("item_name") or "",
@@ -53,8 +57,7 @@ def _capture_snapshot(trigger="Scheduled", filters=None):
 			},
 		)
 
-	snap.row_count = len(snap.items)
-	snap.insert(ignore_permissions=True)
+	insert_snapshot(snap, "Stock Balance Snapshot Item", rows)
 	frappe.db.commit()
 	return snap.name
 
@@ -4,3 +4,8 @@ from frappe.model.document import Document
 
 class StockBalanceSnapshotItem(Document):
 	pass
+
+
+def on_doctype_update():
+	# Snapshot pages read one snapshot at a time, filtered by item or SKU type
+	frappe.db.add_index("Stock Balance Snapshot Item", ["parent", "item_code"])
@@ -0,0 +1,16 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class StockClosingCheckpoint(Document):
+	pass
+
+
+def on_doctype_update():
+	# Stock-as-of reads one checkpoint date for a set of items; back-dated entries update
+	# one item / warehouse across the later checkpoints
+	frappe.db.add_index("Stock Closing Checkpoint", ["checkpoint_date", "item_code"])
+	frappe.db.add_index("Stock Closing Checkpoint", ["item_code", "warehouse"])
@@ -0,0 +1,109 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+import frappe
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.doctype.stock_reconciliation.test_stock_reconciliation import (
+	create_stock_reconciliation,
+)
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_months, get_last_day, today
+
+from prakash_steel.utils.stock_checkpoint import build_checkpoint, get_stock_as_of, refresh_item_checkpoints
+
+TEST_ITEM = "_Test Checkpoint Item"
+WAREHOUSE = "_Test Warehouse - _TC"
+
+
+class TestStockClosingCheckpoint(FrappeTestCase):
+	def setUp(self):
+		make_item(TEST_ITEM, {"is_stock_item": 1})
+		frappe.db.delete("Stock Closing Checkpoint")
+		self.month_end = get_last_day(add_months(today(), -3))
+
+	def test_build_takes_the_ledger_balance(self):
+		_receive(10, add_days(self.month_end, -5))
+		# The reconciliation sets the balance; the month end keeps it, not a sum of movements
+		create_stock_reconciliation(
+			item_code=TEST_ITEM,
+			warehouse=WAREHOUSE,
+			qty=4,
+			rate=100,
+			posting_date=add_days(self.month_end, -2),
+		)
+		build_checkpoint(self.month_end)
+		self.assertEqual(_checkpoint_qty(self.month_end), 4)
+
+		# The next month end carries the balance over and adds that month's entries
+		next_month_end = get_last_day(add_days(self.month_end, 1))
+		build_checkpoint(next_month_end)
+		self.assertEqual(_checkpoint_qty(next_month_end), 4)
+
+		_receive(6, add_days(next_month_end, -1))
+		build_checkpoint(next_month_end)
+		self.assertEqual(_checkpoint_qty(next_month_end), 10)
+
+	def test_build_skips_zero_balances(self):
+		_receive(5, add_days(self.month_end, -5))
+		make_stock_entry(
+			item_code=TEST_ITEM, qty=5, from_warehouse=WAREHOUSE, posting_date=add_days(self.month_end, -1)
+		)
+		build_checkpoint(self.month_end)
+		self.assertIsNone(_checkpoint_qty(self.month_end))
+
+	def test_back_dated_entry_refreshes_later_checkpoints(self):
+		_receive(10, add_days(self.month_end, -5))
+		next_month_end = get_last_day(add_days(self.month_end, 1))
+		build_checkpoint(self.month_end)
+		build_checkpoint(next_month_end)
+
+		posting_date = add_days(self.month_end, -10)
+		_receive(7, posting_date)
+		refresh_item_checkpoints(TEST_ITEM, WAREHOUSE, posting_date)
+
+		self.assertEqual(_checkpoint_qty(self.month_end), 17)
+		self.assertEqual(_checkpoint_qty(next_month_end), 17)
+
+	def test_stock_as_of_adds_entries_after_the_checkpoint(self):
+		_receive(15, add_days(self.month_end, -5))
+		build_checkpoint(self.month_end)
+
+		create_stock_reconciliation(
+			item_code=TEST_ITEM,
+			warehouse=WAREHOUSE,
+			qty=40,
+			rate=100,
+			posting_date=add_days(self.month_end, 10),
+		)
+		_receive(3, add_days(self.month_end, 12))
+
+		def stock_as_of(days):
+			return get_stock_as_of(add_days(self.month_end, days), item_codes=[TEST_ITEM]).get(TEST_ITEM)
+
+		self.assertIsNone(stock_as_of(-6))
+		self.assertEqual(stock_as_of(5), 15)
+		self.assertEqual(stock_as_of(10), 40)
+		self.assertEqual(stock_as_of(15), 43)
+		self.assertEqual(
+			get_stock_as_of(add_days(self.month_end, 15), item_codes=[TEST_ITEM], warehouse=WAREHOUSE),
+			{TEST_ITEM: 43},
+		)
+		self.assertEqual(
+			get_stock_as_of(add_days(self.month_end, 15), item_codes=[TEST_ITEM], warehouse="Stores - _TC"),
+			{},
+		)
+
+
+def _receive(qty, posting_date):
+	return make_stock_entry(
+		item_code=TEST_ITEM, qty=qty, to_warehouse=WAREHOUSE, rate=100, posting_date=posting_date
+	)
+
+
+def _checkpoint_qty(checkpoint_date):
+	return frappe.db.get_value(
+		"Stock Closing Checkpoint",
+		{"checkpoint_date": checkpoint_date, "item_code": TEST_ITEM, "warehouse": WAREHOUSE},
+		"qty",
+	)
@@ -141,7 +141,12 @@ frappe.pages['item-insight-dashboard'].on_page_load = function (wrapper) {
 		wrapper,
 		filters: {},
 		controls: {},
-		expandedRows: new Set() // Track expanded rows for warehouse stock
+		expandedRows: new Set(), // Track expanded rows for warehouse stock
+		// Server-side paging and sorting (get_item_insight_page)
+		rows: [],
+		nextCursor: null,
+		total: null,
+		sort: { by: 'item_code', order: 'asc' },
 	};
 
 	// Initialize dashboard components
@@ -546,14 +551,19 @@ function setupItemCodeAutocomplete(control) {
 		
 		const searchFn = () => {
 			frappe.call({
-				method: 'prakash_steel.api.get_item_insight_data.search_items',
+				method: 'prakash_steel.api.get_item_insight_data.search_items_for_picker',
 				args: {
 					query: query,
 					limit: 20
 				},
 				callback: function(r) {
-					if (r.message && r.message.length > 0) {
-						renderDropdown(r.message, query);
+					const reply = r.message || {};
+					// Drop replies for a query the user has already typed past
+					if ((reply.query || '') !== ($input.val() || '')) {
+						return;
+					}
+					if (reply.results && reply.results.length > 0) {
+						renderDropdown(reply.results, query);
 					} else {
 						$dropdown.hide().empty();
 					}
@@ -570,7 +580,7 @@ function setupItemCodeAutocomplete(control) {
 			searchFn();
 		} else {
 			// Debounce search for typing
-			searchTimeout = setTimeout(searchFn, 300);
+			searchTimeout = setTimeout(searchFn, 150);
 		}
 	}
 	
@@ -695,8 +705,9 @@ function createTableContainer(state) {
 	state.$tableContainer = $tableContainer;
 }
 
-function fetchData(state) {
-	// Single unified data-fetch function used for both initial load and filter changes.
+function fetchData(state, append) {
+	// Single unified data-fetch function used for initial load, filter/sort changes and
+	// "Load More" (append = true continues from the last page's cursor).
 	// Uses a monotonic request counter so stale (slow) responses never overwrite fresh ones.
 	state._requestId = (state._requestId || 0) + 1;
 	const thisRequest = state._requestId;
@@ -704,7 +715,7 @@ function fetchData(state) {
 	const filters = getFilters(state);
 
 	frappe.call({
-		method: 'prakash_steel.api.get_item_insight_data.get_item_insight_data',
+		method: 'prakash_steel.api.get_item_insight_data.get_item_insight_page',
 		args: {
 			from_date: filters.from_date || null,
 			to_date: filters.to_date || null,
@@ -712,6 +723,9 @@ function fetchData(state) {
 			item_grade: filters.item_grade || null,
 			category_name: filters.category_name || null,
 			description_code: filters.description_code || null,
+			sort_by: state.sort.by,
+			sort_order: state.sort.order,
+			cursor: append ? state.nextCursor : null,
 		},
 		freeze: false,
 		async: true,
@@ -719,11 +733,19 @@ function fetchData(state) {
 			// Ignore if a newer request has already been fired
 			if (thisRequest !== state._requestId) return;
 
+			const page = (r && r.message) || { data: [], next_cursor: null, total: 0 };
+			state.rows = append ? state.rows.concat(page.data || []) : (page.data || []);
+			state.nextCursor = page.next_cursor || null;
+			if (!append) {
+				state.total = page.total;
+			}
+
 			// Clear old content before rendering
 			state.$tableContainer.empty();
 
-			if (r && r.message && r.message.length > 0) {
-				renderTable(state, r.message);
+			if (state.rows.length > 0) {
+				renderTable(state, state.rows);
+				renderPager(state);
 			} else {
 				showNoData(state);
 			}
@@ -736,6 +758,33 @@ function fetchData(state) {
 	});
 }
 
+function renderPager(state) {
+	const $pager = $(`
+		<div class="item-insight-pager" style="display:flex;align-items:center;justify-content:space-between;margin-top:12px;">
+			<span class="text-muted">${__('Showing {0} of {1} items', [state.rows.length, state.total || state.rows.length])}</span>
+		</div>
+	`);
+	if (state.nextCursor) {
+		$(`<button class="btn btn-default btn-sm">${__('Load More')}</button>`)
+			.on('click', function () {
+				$(this).prop('disabled', true);
+				fetchData(state, true);
+			})
+			.appendTo($pager);
+	}
+	state.$tableContainer.append($pager);
+}
+
+function setSort(state, sortBy) {
+	// Clicking the active column flips the order; a new column starts ascending
+	if (state.sort.by === sortBy) {
+		state.sort.order = state.sort.order === 'asc' ? 'desc' : 'asc';
+	} else {
+		state.sort = { by: sortBy, order: 'asc' };
+	}
+	fetchData(state);
+}
+
 function bindEventHandlers(state) {
 	// Immediate refresh — no debounce. Race conditions are handled by
 	// the request-counter inside fetchData().
@@ -814,7 +863,12 @@ function exportTable(state, format) {
 			filters: JSON.stringify(payload),
 		},
 		callback: function (r) {
-			if (r && r.message && r.message.file_url) {
+			if (r && r.message && r.message.queued) {
+				frappe.show_alert({
+					message: __('Export queued; you will get a download link when it is ready'),
+					indicator: 'blue',
+				});
+			} else if (r && r.message && r.message.file_url) {
 				window.open(r.message.file_url);
 			} else {
 				frappe.msgprint(__('No file generated to download'));
@@ -881,6 +935,12 @@ function renderTable(state, data) {
 		return n.toFixed(2);
 	}
 
+	// Sortable headers show the server-side sort direction
+	function sortArrow(key) {
+		if (state.sort.by !== key) return '';
+		return state.sort.order === 'asc' ? ' ▲' : ' ▼';
+	}
+
 	// ── Build entire table HTML as one string (single DOM insertion) ──
 	const htmlParts = [];
 
@@ -897,22 +957,22 @@ function renderTable(state, data) {
 		'<th colspan="4" style="background:#d2b48c;padding:12px;text-align:center;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;">', esc(__('Warehouse Stock')), '</th>',
 		'</tr>',
 		'<tr>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:150px;min-width:150px;">', esc(__('Item Code')), '</th>',
+		'<th data-sort-by="item_code" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:150px;min-width:150px;cursor:pointer;">', esc(__('Item Code')), sortArrow('item_code'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:150px;min-width:150px;">', esc(__('Category Name')), '</th>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Last Production Date')), '</th>',
+		'<th data-sort-by="last_production_date" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;cursor:pointer;">', esc(__('Last Production Date')), sortArrow('last_production_date'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Last Production Qty')), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:180px;min-width:180px;overflow:hidden;word-break:break-word;">', esc(__('Last Sales Order Party')), '</th>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Last Sales Order Date')), '</th>',
+		'<th data-sort-by="last_sales_date" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;cursor:pointer;">', esc(__('Last Sales Order Date')), sortArrow('last_sales_date'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:130px;min-width:130px;">', esc(__('Last Sales Order Qty')), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:130px;min-width:130px;">', esc(__('Last Sales Order Rate')), '</th>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:130px;min-width:130px;">', esc(__('Pending Sales Order Qty')), '</th>',
+		'<th data-sort-by="pending_sales_order_qty" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:130px;min-width:130px;cursor:pointer;">', esc(__('Pending Sales Order Qty')), sortArrow('pending_sales_order_qty'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:180px;min-width:180px;overflow:hidden;word-break:break-word;">', esc(__('Last Purchase Party')), '</th>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Last Purchase Order Date')), '</th>',
+		'<th data-sort-by="last_purchase_date" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;cursor:pointer;">', esc(__('Last Purchase Order Date')), sortArrow('last_purchase_date'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Last Purchase Order Qty')), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Last Purchase Order Rate')), '</th>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Pending Purchase Order Qty')), '</th>',
+		'<th data-sort-by="pending_purchase_order_qty" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;cursor:pointer;">', esc(__('Pending Purchase Order Qty')), sortArrow('pending_purchase_order_qty'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:200px;min-width:200px;">', esc(__('Warehouse')), '</th>',
-		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:120px;min-width:120px;">', esc(__('Stock Qty')), '</th>',
+		'<th data-sort-by="total_stock_on_hand" style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:120px;min-width:120px;cursor:pointer;">', esc(__('Stock Qty')), sortArrow('total_stock_on_hand'), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:1px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Committed Stock')), '</th>',
 		'<th style="background:#faf0e6;padding:10px;text-align:left;font-weight:600;color:#000000;border-right:2px solid #000000;border-bottom:1px solid #000000;width:140px;min-width:140px;">', esc(__('Projected Qty')), '</th>',
 		'</tr>',
@@ -1002,6 +1062,10 @@ function renderTable(state, data) {
 
 	// Single DOM insertion — orders of magnitude faster than per-row append
 	state.$tableContainer[0].innerHTML = htmlParts.join('');
+
+	state.$tableContainer.find('th[data-sort-by]').on('click', function () {
+		setSort(state, $(this).attr('data-sort-by'));
+	});
 }
 
 function showError(state, message) {
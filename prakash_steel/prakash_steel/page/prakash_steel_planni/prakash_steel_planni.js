@@ -83,37 +83,23 @@ frappe.pages['prakash-steel-planni'].on_page_load = function (wrapper) {
 function load_all_charts(page, $chartsContainer, filters) {
 	const colorMap = getColorMap();
 
-	Promise.all([
-		new Promise((resolve, reject) => {
-			frappe.call({
-				method: 'prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.get_sku_type_on_hand_status',
-				args: { filters: filters || {} },
-				callback: resolve,
-				error: reject,
-			});
-		}),
-		new Promise((resolve, reject) => {
-			frappe.call({
-				method: 'prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.get_pending_so_status',
-				args: { filters: filters || {} },
-				callback: resolve,
-				error: reject,
-			});
-		}),
-		new Promise((resolve, reject) => {
-			frappe.call({
-				method: 'prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.get_open_po_status',
-				callback: resolve,
-				error: reject,
-			});
-		}),
-	])
-		.then(([skuRes, pendingSoRes, openPoRes]) => {
+	// All panels in one round trip; the server builds the shared item / stock / demand maps once
+	new Promise((resolve, reject) => {
+		frappe.call({
+			method: 'prakash_steel.prakash_steel.page.prakash_steel_planni.prakash_steel_planni.get_planning_dashboard',
+			args: { filters: filters || {} },
+			callback: resolve,
+			error: reject,
+		});
+	})
+		.then((res) => {
+			const data = (res && res.message) || {};
+
 			page.clear_indicator();
 
 			// 1) SKU type pies
-			if (skuRes && skuRes.message) {
-				const skuData = skuRes.message;
+			if (data.sku_type_on_hand) {
+				const skuData = data.sku_type_on_hand;
 				const skuTypes = ['BBMTA', 'RBMTA', 'BOTA', 'RMTA', 'PTA'];
 
 				skuTypes.forEach((sku) => {
@@ -126,17 +112,17 @@ function load_all_charts(page, $chartsContainer, filters) {
 			}
 
 			// 2) Pending SO Status pie
-			if (pendingSoRes && pendingSoRes.message && pendingSoRes.message.colours && pendingSoRes.message.colours.length) {
-				const $card = createChartCard('Pending SO Status', pendingSoRes.message, colorMap);
+			if (data.pending_so && data.pending_so.colours && data.pending_so.colours.length) {
+				const $card = createChartCard('Pending SO Status', data.pending_so, colorMap);
 				$chartsContainer.append($card);
-				renderPieChart('Pending SO Status', pendingSoRes.message, colorMap);
+				renderPieChart('Pending SO Status', data.pending_so, colorMap);
 			}
 
 			// 3) Open PO Status pie (all black for now)
-			if (openPoRes && openPoRes.message) {
-				const $card = createChartCard('Open PO Status', openPoRes.message, colorMap);
+			if (data.open_po) {
+				const $card = createChartCard('Open PO Status', data.open_po, colorMap);
 				$chartsContainer.append($card);
-				renderPieChart('Open PO Status', openPoRes.message, colorMap);
+				renderPieChart('Open PO Status', data.open_po, colorMap);
 			}
 
 			if ($chartsContainer.children().length === 0) {
@@ -1,10 +1,21 @@
 # Copyright (c) 2025, beetashoke chakraborty and contributors
 # For license information, please see license.txt
 
+import json
 import math
 import frappe
 from frappe import _
-from frappe.utils import flt
+from frappe.utils import flt, getdate, today
+
+from prakash_steel.utils.dashboard_cache import (
+	clear_dashboard_cache,
+	conditional_response,
+	get_cached_view,
+)
+from prakash_steel.utils.open_demand import get_open_demand_map
+from prakash_steel.utils.stock_checkpoint import get_stock_as_of
+
+CACHE_NAMESPACE = "planning_dashboard"
 
 
 def calculate_sku_type(buffer_flag, item_type):
@@ -43,12 +54,52 @@ def get_sku_type_on_hand_status(filters=None):
 	- Calculate percentage: (count_of_color / total_items) * 100
 	- Return data in format suitable for pie charts
 	"""
-	import json
+	return _build_sku_type_on_hand_status(_get_planning_context(_parse_filters(filters)))
+
+
+@frappe.whitelist()
+def get_planning_dashboard(filters=None, if_none_match=None):
+	"""
+	All panels of the planning page in one call: SKU type on-hand status, Pending SO
+	status and Open PO status. The item list, stock map and qualified demand map are
+	built once, and the response is cached per filter set (see clear_planning_dashboard_cache).
+	"""
+	filters = _parse_filters(filters)
+	cache_filters = {
+		"from_date": str(getdate(filters["from_date"])) if filters.get("from_date") else None,
+		"to_date": str(getdate(filters["to_date"])) if filters.get("to_date") else None,
+		# Qualified demand and SO buffer status are relative to today
+		"today": today(),
+	}
+
+	def build():
+		date_filters = {key: cache_filters[key] for key in ("from_date", "to_date") if cache_filters[key]}
+		return {
+			"sku_type_on_hand": _build_sku_type_on_hand_status(_get_planning_context(date_filters)),
+			"pending_so": _build_pending_so_status(date_filters),
+			"open_po": get_open_po_status(),
+		}
+
+	data, etag = get_cached_view(CACHE_NAMESPACE, "charts", cache_filters, build)
+	return conditional_response(data, etag, if_none_match)
+
 
+def clear_planning_dashboard_cache(doc=None, method=None):
+	"""Doc event handler: Sales Order, Purchase Order, stock or buffer Item changed."""
+	clear_dashboard_cache(CACHE_NAMESPACE)
+
+
+def _parse_filters(filters):
 	if not filters:
-		filters = {}
+		return {}
 	if isinstance(filters, str):
-		filters = json.loads(filters)
+		return json.loads(filters)
+	return filters
+
+
+def _get_planning_context(filters):
+	"""Buffer items with their stock and qualified demand, shared by the planning panels."""
+	context = frappe._dict(items_data=[], stock_map={}, qualified_demand_map={})
 
 	# Get ALL buffer items - same as po_recomendation_for_psp report
 	items_data = frappe.db.sql(
@@ -67,7 +118,8 @@ def get_sku_type_on_hand_status(filters=None):
 	)
 
 	if not items_data:
-		return {}
+		return context
+	context.items_data = items_data
 
 	# Get stock for all items
 	item_codes = [item.item_code for item in items_data]
@@ -79,18 +131,8 @@ def get_sku_type_on_hand_status(filters=None):
 	as_of_date = filters.get("to_date") or filters.get("from_date")
 
 	if as_of_date:
-		stock_data = frappe.db.sql(
-			"""
-			SELECT item_code, SUM(actual_qty) as stock
-			FROM `tabStock Ledger Entry`
-			WHERE item_code IN %s
-			AND posting_date <= %s
-			AND is_cancelled = 0
-			GROUP BY item_code
-			""",
-			(item_codes_tuple, as_of_date),
-			as_dict=True,
-		)
+		# Month-end checkpoint plus the SLEs after it, instead of summing the whole ledger
+		stock_map = get_stock_as_of(as_of_date, item_codes=item_codes)
 	else:
 		stock_data = frappe.db.sql(
 			"""
@@ -102,11 +144,24 @@ def get_sku_type_on_hand_status(filters=None):
 			(item_codes_tuple,),
 			as_dict=True,
 		)
+		stock_map = {d.item_code: flt(d.stock) for d in stock_data}
 
-	stock_map = {d.item_code: flt(d.stock) for d in stock_data}
+	context.stock_map = stock_map
 
 	# Get qualified demand map (Open SO with delivery_date <= today) - same as po_recomendation_for_psp report
-	qualified_demand_map = get_qualified_demand_map(filters if filters else {})
+	context.qualified_demand_map = get_qualified_demand_map(filters)
+
+	return context
+
+
+def _build_sku_type_on_hand_status(context):
+	"""On-hand colour distribution per SKU type from a planning context."""
+	items_data = context.items_data
+	stock_map = context.stock_map
+	qualified_demand_map = context.qualified_demand_map
+
+	if not items_data:
+		return {}
 
 	items_with_sku_type = []
 
@@ -234,41 +289,13 @@ def get_sku_type_on_hand_status(filters=None):
 def get_qualified_demand_map(filters):
 	"""Get qualified demand map - same as po_recomendation_for_psp report
 	Qualified Demand = Open SO quantity where delivery_date <= to_date (or today)
-	Open SO = qty - delivered_qty (quantity left to deliver)
+	Open SO = qty - delivered_qty (quantity left to deliver), from the Open Demand Entry ledger
 	"""
-	from frappe.utils import today
-
-	cutoff_date = filters.get("to_date") or today()
-
-	date_condition = "AND IFNULL(soi.delivery_date, '1900-01-01') <= %s"
-	params = [cutoff_date]
-
-	if filters.get("from_date"):
-		date_condition += " AND IFNULL(soi.delivery_date, '1900-01-01') >= %s"
-		params.append(filters["from_date"])
-
-	so_rows = frappe.db.sql(
-		f"""
-		SELECT
-			soi.item_code,
-			SUM(soi.qty - IFNULL(soi.delivered_qty, 0)) as so_qty
-		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
-		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-			AND so.docstatus = 1
-			{date_condition}
-		GROUP BY
-			soi.item_code
-		""",
-		params,
-		as_dict=True,
+	return get_open_demand_map(
+		from_date=filters.get("from_date"),
+		to_date=filters.get("to_date") or today(),
 	)
 
-	return {d.item_code: flt(d.so_qty) for d in so_rows}
-
 
 @frappe.whitelist()
 def get_pending_so_status(filters=None):
@@ -278,14 +305,11 @@ def get_pending_so_status(filters=None):
 	We calculate order_status using the same buffer logic as open_so_analysis
 	(but at SO header level).
 	"""
-	import json
+	return _build_pending_so_status(_parse_filters(filters))
 
-	from frappe.utils import date_diff, today
 
-	if not filters:
-		filters = {}
-	if isinstance(filters, str):
-		filters = json.loads(filters)
+def _build_pending_so_status(filters):
+	from frappe.utils import date_diff
 
 	from_date = filters.get("from_date")
 	to_date = filters.get("to_date")
@@ -293,32 +317,27 @@ def get_pending_so_status(filters=None):
 	date_condition = ""
 	params = []
 	if from_date and to_date:
-		date_condition = "AND so.transaction_date BETWEEN %s AND %s"
+		date_condition = "AND transaction_date BETWEEN %s AND %s"
 		params = [from_date, to_date]
 	elif to_date:
-		date_condition = "AND so.transaction_date <= %s"
+		date_condition = "AND transaction_date <= %s"
 		params = [to_date]
 	elif from_date:
-		date_condition = "AND so.transaction_date >= %s"
+		date_condition = "AND transaction_date >= %s"
 		params = [from_date]
 
+	# One row per open SO line in the Open Demand Entry ledger
 	so_data = frappe.db.sql(
 		f"""
 		SELECT
-			so.name as sales_order,
-			so.transaction_date as date,
-			soi.delivery_date as delivery_date
+			sales_order,
+			transaction_date as date,
+			delivery_date
 		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
+			`tabOpen Demand Entry`
 		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled')
-			AND so.docstatus = 1
-			AND (soi.qty - soi.delivered_qty) > 0
-			AND IFNULL(soi.custom_closed, 0) = 0
+			1 = 1
 			{date_condition}
-		GROUP BY soi.name
 		""",
 		tuple(params),
 		as_dict=1,
@@ -539,34 +539,12 @@ function getSectionTitle(tabId) {
     return titles[tabId] || __('Details');
 }
 
-function fetchItemWiseTrackerData(filters) {
-    return new Promise((resolve, reject) => {
-        frappe.call({
-            method: 'frappe.desk.query_report.run',
-            args: {
-                report_name: 'Item Wise Procurement Tracker',
-                filters: {
-                    from_date: filters.from_date,
-                    to_date: filters.to_date,
-                    supplier: filters.supplier || '',
-                    item_code: filters.item_code || '',
-                    po_no: filters.po_no || ''
-                },
-                ignore_prepared_report: 1,
-            },
-            callback: (r) => {
-                if (r.message && r.message.result) {
-                    resolve({
-                        summary: [{ value: r.message.result.length, label: __('Tracked Items'), datatype: 'Int', indicator: 'Blue' }],
-                        raw_data: r.message.result
-                    });
-                } else {
-                    resolve({ summary: [], raw_data: [] });
-                }
-            },
-            error: reject
-        });
-    });
+function buildItemWiseTab(rows) {
+    rows = rows || [];
+    return {
+        summary: [{ value: rows.length, label: __('Tracked Items'), datatype: 'Int', indicator: 'Blue' }],
+        raw_data: rows
+    };
 }
 
 function renderItemWiseTable($container, data) {
@@ -785,17 +763,8 @@ function refreshDashboard(state) {
     // Show loading state
     state.page.set_indicator(__('Loading dashboard data...'), 'blue');
 
-    // Fetch data for all sections – overview uses a dedicated API for
-    // accurate counts instead of aggregating from the tab data.
-    Promise.all([
-        fetchOverviewData(filters),
-        fetchProcurementData(filters),
-        fetchMaterialRequestData(filters, state),
-        fetchPurchaseOrderData(filters, state),
-        fetchPurchaseReceiptData(filters, state),
-        fetchPurchaseInvoiceData(filters, state),
-        fetchItemWiseTrackerData(filters)
-    ]).then(([overviewData, procurementData, mrData, poData, prData, piData, itemWiseData]) => {
+    // One call returns every section; item / status / ID filters are applied server side
+    fetchDashboardData(filters).then((data) => {
         // Discard stale response – a newer refresh is already in flight
         if (state._refreshGen !== thisGen) return;
 
@@ -803,12 +772,12 @@ function refreshDashboard(state) {
 
         // Render all sections
         renderDashboardData(state, {
-            overview: overviewData,
-            material_request: mrData,
-            purchase_order: poData,
-            purchase_receipt: prData,
-            purchase_invoice: piData,
-            item_wise: itemWiseData
+            overview: buildOverviewTab(data.overview),
+            material_request: buildMaterialRequestTab(data.material_request, state),
+            purchase_order: buildPurchaseOrderTab(data.purchase_order, state),
+            purchase_receipt: buildPurchaseReceiptTab(data.purchase_receipt, state),
+            purchase_invoice: buildPurchaseInvoiceTab(data.purchase_invoice, state),
+            item_wise: buildItemWiseTab(data.item_wise)
         });
     }).catch((error) => {
         // Discard stale error – a newer refresh is already in flight
@@ -820,858 +789,262 @@ function refreshDashboard(state) {
     });
 }
 
-function fetchProcurementData(filters) {
-    return new Promise((resolve, reject) => {
-        frappe.call({
-            method: 'frappe.desk.query_report.run',
-            args: {
-                report_name: 'New Procurement Tracker',
-                filters: {
-                    from_date: filters.from_date,
-                    to_date: filters.to_date,
-                    item_code: filters.item_name || ''
-                },
-                ignore_prepared_report: 1,
-            },
-            callback: (r) => {
-                if (r.message && r.message.result) {
-                    resolve(r.message.result || []);
-                } else {
-                    resolve([]);
-                }
-            },
-            error: reject
-        });
-    });
-}
-
-function fetchMaterialRequestData(filters, state) {
+function fetchDashboardData(filters) {
     return new Promise((resolve, reject) => {
-        // Use the procurement tracker report to get data with workflow_state
         frappe.call({
-            method: 'frappe.desk.query_report.run',
-            args: {
-                report_name: 'New Procurement Tracker',
-                filters: {
-                    from_date: filters.from_date,
-                    to_date: filters.to_date,
-                    item_code: filters.mr_item_name || ''
-                },
-                ignore_prepared_report: 1,
-            },
-            callback: (r) => {
-                if (r.message && r.message.result) {
-                    let procurementData = r.message.result;
-
-                    // Extract unique Material Requests from procurement data
-                    const materialRequests = [];
-                    const seenMRs = new Set();
-
-                    procurementData.forEach(row => {
-                        if (row.material_request && !seenMRs.has(row.material_request)) {
-                            seenMRs.add(row.material_request);
-                            materialRequests.push({
-                                name: row.material_request,
-                                transaction_date: row.indent_date,
-                                workflow_state: row.mr_status,
-                                status: row.mr_status // Use workflow_state as status for display
-                            });
-                        }
-                    });
-
-                    // Apply additional filters
-                    let filteredData = materialRequests;
-
-                    // Apply status filter (treat "All" as no filter)
-                    if (filters.mr_status && filters.mr_status !== 'All') {
-                        filteredData = filteredData.filter(mr => (mr.workflow_state || '').toLowerCase() === filters.mr_status.toLowerCase());
-                    }
-
-
-                    // Apply ID filter (exact match since Link field returns exact name)
-                    if (filters.mr_id) {
-                        filteredData = filteredData.filter(mr => mr.name === filters.mr_id);
-                    }
-
-                    // Apply item filter if specified - filter the original procurement data first
-                    if (filters.item_name) {
-                        const itemFilteredProcurementData = procurementData.filter(row =>
-                            row.item_code === filters.item_name
-                        );
-
-                        // Extract unique Material Requests from item-filtered data
-                        const itemFilteredMRs = [];
-                        const seenItemFilteredMRs = new Set();
-
-                        itemFilteredProcurementData.forEach(row => {
-                            if (row.material_request && !seenItemFilteredMRs.has(row.material_request)) {
-                                seenItemFilteredMRs.add(row.material_request);
-                                itemFilteredMRs.push({
-                                    name: row.material_request,
-                                    transaction_date: row.indent_date,
-                                    workflow_state: row.mr_status,
-                                    status: row.mr_status
-                                });
-                            }
-                        });
-
-                        // Apply other filters to item-filtered data
-                        filteredData = itemFilteredMRs;
-                    }
-
-                    // ── Build Material Request summary cards ──
-                    // Total Material Requests (excluding cancelled – report already enforces docstatus = 1)
-                    const totalMR = filteredData.length;
-
-                    // Helper to count by status (case‑insensitive)
-                    const countByStatus = (statusName) =>
-                        filteredData.filter(mr => (mr.workflow_state || '').toLowerCase() === statusName.toLowerCase()).length;
-
-                    const pendingMR = countByStatus('Pending');
-                    const partiallyReceivedMR = countByStatus('Partially Received');
-                    const partiallyOrderedMR = countByStatus('Partially Ordered');
-
-                    const summary = [
-                        {
-                            value: totalMR,
-                            label: __('Total Material Requests'),
-                            datatype: 'Int',
-                            indicator: 'Blue',
-                            description: __('Total material requests (excluding cancelled)')
-                        },
-                        {
-                            value: pendingMR,
-                            label: __('Pending Material Requests'),
-                            datatype: 'Int',
-                            indicator: 'Orange',
-                            description: __('Material requests with Pending status')
-                        },
-                        {
-                            value: partiallyReceivedMR,
-                            label: __('Partially Received MR'),
-                            datatype: 'Int',
-                            indicator: 'Yellow',
-                            description: __('Material requests with Partially Received status')
-                        },
-                        {
-                            value: partiallyOrderedMR,
-                            label: __('Partially Ordered MR'),
-                            datatype: 'Int',
-                            indicator: 'Green',
-                            description: __('Material requests with partial order quantity')
-                        }
-                    ];
-
-                    // Update status options (fixed options for MR tab)
-                    updateStatusOptions('material_request', filteredData, state);
-
-                    resolve({
-                        summary: summary,
-                        raw_data: filteredData
-                    });
-                } else {
-                    resolve({ summary: [], raw_data: [] });
-                }
-            },
+            method: 'prakash_steel.api.procurement_dashboard.get_dashboard_data',
+            args: { filters: filters },
+            callback: (r) => resolve(r.message || {}),
             error: reject
         });
     });
 }
 
-function filterMaterialRequestsByItemName(materialRequests, itemName) {
-    return new Promise((resolve, reject) => {
-        if (!itemName) {
-            resolve(materialRequests);
-            return;
+function buildMaterialRequestTab(tabData, state) {
+    const rows = (tabData && tabData.rows) || [];
+    const materialRequests = rows.map(row => ({
+        name: row.name,
+        transaction_date: row.date,
+        workflow_state: row.workflow_state,
+        status: row.status
+    }));
+
+    // Helper to count by status (case‑insensitive)
+    const countByStatus = (statusName) =>
+        materialRequests.filter(mr => (mr.workflow_state || '').toLowerCase() === statusName.toLowerCase()).length;
+
+    const summary = [
+        {
+            value: materialRequests.length,
+            label: __('Total Material Requests'),
+            datatype: 'Int',
+            indicator: 'Blue',
+            description: __('Total material requests (excluding cancelled)')
+        },
+        {
+            value: countByStatus('Pending'),
+            label: __('Pending Material Requests'),
+            datatype: 'Int',
+            indicator: 'Orange',
+            description: __('Material requests with Pending status')
+        },
+        {
+            value: countByStatus('Partially Received'),
+            label: __('Partially Received MR'),
+            datatype: 'Int',
+            indicator: 'Yellow',
+            description: __('Material requests with Partially Received status')
+        },
+        {
+            value: countByStatus('Partially Ordered'),
+            label: __('Partially Ordered MR'),
+            datatype: 'Int',
+            indicator: 'Green',
+            description: __('Material requests with partial order quantity')
         }
+    ];
 
-        // Get all material request names
-        const mrNames = materialRequests.map(mr => mr.name);
-
-        if (mrNames.length === 0) {
-            resolve([]);
-            return;
-        }
+    // Update status options (fixed options for MR tab)
+    updateStatusOptions('material_request', null, state);
 
-        // Fetch Material Request Items that match the item name
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Material Request Item',
-                filters: [
-                    ['Material Request Item', 'parent', 'in', mrNames],
-                    ['Material Request Item', 'item_name', 'like', `%${itemName}%`]
-                ],
-                fields: ['parent'],
-                limit_page_length: 1000
-            },
-            callback: (r) => {
-                if (r.message) {
-                    // Get unique parent names
-                    const filteredParentNames = [...new Set(r.message.map(item => item.parent))];
-
-                    // Filter material requests to only include those with matching items
-                    const filteredMRs = materialRequests.filter(mr =>
-                        filteredParentNames.includes(mr.name)
-                    );
-
-                    resolve(filteredMRs);
-                } else {
-                    resolve([]);
-                }
-            },
-            error: reject
-        });
-    });
+    return { summary: summary, raw_data: materialRequests };
 }
 
-function filterPurchaseOrdersByItemName(purchaseOrders, itemName) {
-    return new Promise((resolve, reject) => {
-        if (!itemName) {
-            resolve(purchaseOrders);
-            return;
+function buildPurchaseOrderTab(tabData, state) {
+    const rows = (tabData && tabData.rows) || [];
+    const purchaseOrders = rows.map(row => ({
+        name: row.name,
+        transaction_date: row.date,
+        workflow_state: row.workflow_state || '',
+        status: row.status || '',
+        supplier: row.supplier || '',
+        grand_total: parseFloat(row.grand_total || 0)
+    }));
+
+    const countByWorkflow = (statusName) =>
+        purchaseOrders.filter(po => (po.workflow_state || '').toLowerCase() === statusName.toLowerCase()).length;
+
+    const totalPOValue = purchaseOrders.reduce((sum, po) => sum + (po.grand_total || 0), 0);
+
+    const summary = [
+        {
+            value: purchaseOrders.length,
+            label: __('Total Purchase Orders'),
+            datatype: 'Int',
+            indicator: 'Blue',
+            description: __('Total purchase orders (excluding cancelled)')
+        },
+        {
+            value: countByWorkflow('Pending'),
+            label: __('Pending Purchase Orders'),
+            datatype: 'Int',
+            indicator: 'Orange',
+            description: __('Purchase orders with Pending status')
+        },
+        {
+            // Pending Approval – include both 'Waiting For Approval' and 'To Approve'
+            value: countByWorkflow('Waiting For Approval') + countByWorkflow('To Approve'),
+            label: __('Pending Approval Purchase Orders'),
+            datatype: 'Int',
+            indicator: 'Green',
+            description: __('Purchase orders pending approval')
+        },
+        {
+            value: totalPOValue,
+            label: __('Total Purchase Order Value'),
+            datatype: 'Currency',
+            indicator: 'Purple',
+            description: __('Sum of grand total for selected date range'),
+            prefix: '₹'
         }
+    ];
 
-        const poNames = purchaseOrders.map(po => po.name);
-
-        if (poNames.length === 0) {
-            resolve([]);
-            return;
-        }
+    // Dynamic status dropdown options based on actual workflow_state values
+    updateStatusOptions('purchase_order', tabData && tabData.status_options, state);
 
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Purchase Order Item',
-                filters: [
-                    ['Purchase Order Item', 'parent', 'in', poNames],
-                    // Match by item_code so it aligns with the Item link filter on the UI
-                    ['Purchase Order Item', 'item_code', '=', itemName]
-                ],
-                fields: ['parent'],
-                limit_page_length: 1000
-            },
-            callback: (r) => {
-                if (r.message) {
-                    const filteredParentNames = [...new Set(r.message.map(item => item.parent))];
-                    const filteredPOs = purchaseOrders.filter(po =>
-                        filteredParentNames.includes(po.name)
-                    );
-                    resolve(filteredPOs);
-                } else {
-                    resolve([]);
-                }
-            },
-            error: reject
-        });
-    });
+    return { summary: summary, raw_data: purchaseOrders };
 }
 
-function filterPurchaseReceiptsByItemName(purchaseReceipts, itemName) {
-    return new Promise((resolve, reject) => {
-        if (!itemName) {
-            resolve(purchaseReceipts);
-            return;
+function buildPurchaseReceiptTab(tabData, state) {
+    const rows = (tabData && tabData.rows) || [];
+    const receipts = rows.map(row => ({
+        name: row.name,
+        posting_date: row.date,
+        workflow_state: row.workflow_state || '',
+        status: row.status || '',
+        supplier: row.supplier || '',
+        grand_total: parseFloat(row.grand_total || 0)
+    }));
+
+    const completedReceipts = receipts.filter(pr => (pr.status || '').toLowerCase() === 'completed').length;
+    const totalReceiptValue = receipts.reduce((sum, pr) => sum + (pr.grand_total || 0), 0);
+
+    const summary = [
+        {
+            value: receipts.length,
+            label: __('Total Purchase Receipts'),
+            datatype: 'Int',
+            indicator: 'Blue',
+            description: __('Total purchase receipts')
+        },
+        {
+            value: completedReceipts,
+            label: __('Completed Purchase Receipts'),
+            datatype: 'Int',
+            indicator: 'Green',
+            description: __('Purchase receipts with Completed status')
+        },
+        {
+            value: totalReceiptValue,
+            label: __('Total Receipt Value'),
+            datatype: 'Currency',
+            indicator: 'Purple',
+            description: __('Sum of grand total for selected date range'),
+            prefix: '₹'
         }
+    ];
 
-        const prNames = purchaseReceipts.map(pr => pr.name);
-
-        if (prNames.length === 0) {
-            resolve([]);
-            return;
-        }
+    updateStatusOptions('purchase_receipt', tabData && tabData.status_options, state);
 
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Purchase Receipt Item',
-                filters: [
-                    ['Purchase Receipt Item', 'parent', 'in', prNames],
-                    // Match item_code so it aligns with the Item link filter on the UI
-                    ['Purchase Receipt Item', 'item_code', '=', itemName]
-                ],
-                fields: ['parent'],
-                limit_page_length: 1000
-            },
-            callback: (r) => {
-                if (r.message) {
-                    const filteredParentNames = [...new Set(r.message.map(item => item.parent))];
-                    const filteredPRs = purchaseReceipts.filter(pr =>
-                        filteredParentNames.includes(pr.name)
-                    );
-                    resolve(filteredPRs);
-                } else {
-                    resolve([]);
-                }
-            },
-            error: reject
-        });
-    });
+    return { summary: summary, raw_data: receipts };
 }
 
-function filterPurchaseInvoicesByItemName(purchaseInvoices, itemName) {
-    return new Promise((resolve, reject) => {
-        if (!itemName) {
-            resolve(purchaseInvoices);
-            return;
+function buildPurchaseInvoiceTab(tabData, state) {
+    const rows = (tabData && tabData.rows) || [];
+    const purchaseInvoices = rows.map(row => ({
+        name: row.name,
+        posting_date: row.date,
+        due_date: row.due_date || null,
+        workflow_state: row.workflow_state,
+        status: row.status,
+        supplier: row.supplier,
+        grand_total: parseFloat(row.grand_total || 0)
+    }));
+
+    const countByStatus = (statusName) =>
+        purchaseInvoices.filter(pi => (pi.status || '').toLowerCase() === statusName.toLowerCase()).length;
+
+    // Cancelled invoices are listed, but not counted or summed in the cards
+    const activeInvoices = purchaseInvoices.filter(pi => (pi.status || '').toLowerCase() !== 'cancelled');
+    const totalInvoiceValue = activeInvoices.reduce((sum, pi) => sum + (pi.grand_total || 0), 0);
+
+    const summary = [
+        {
+            value: activeInvoices.length,
+            label: __('Total Purchase Invoice'),
+            datatype: 'Int',
+            indicator: 'Blue',
+            description: __('Total purchase invoices (excluding cancelled)')
+        },
+        {
+            value: countByStatus('Paid'),
+            label: __('Paid Purchase Invoice'),
+            datatype: 'Int',
+            indicator: 'Green',
+            description: __('Purchase invoices with Paid status')
+        },
+        {
+            value: countByStatus('Overdue'),
+            label: __('Overdue Purchase Invoices'),
+            datatype: 'Int',
+            indicator: 'Red',
+            description: __('Purchase invoices with Overdue status')
+        },
+        {
+            value: totalInvoiceValue,
+            label: __('Total Invoice Value'),
+            datatype: 'Currency',
+            indicator: 'Purple',
+            description: __('Sum of grand total for selected date range'),
+            prefix: '₹'
         }
+    ];
 
-        const piNames = purchaseInvoices.map(pi => pi.name);
-
-        if (piNames.length === 0) {
-            resolve([]);
-            return;
-        }
+    // Update status options based on actual data
+    updateStatusOptions('purchase_invoice', tabData && tabData.status_options, state);
 
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Purchase Invoice Item',
-                filters: [
-                    ['Purchase Invoice Item', 'parent', 'in', piNames],
-                    ['Purchase Invoice Item', 'item_name', 'like', `%${itemName}%`]
-                ],
-                fields: ['parent'],
-                limit_page_length: 1000
-            },
-            callback: (r) => {
-                if (r.message) {
-                    const filteredParentNames = [...new Set(r.message.map(item => item.parent))];
-                    const filteredPIs = purchaseInvoices.filter(pi =>
-                        filteredParentNames.includes(pi.name)
-                    );
-                    resolve(filteredPIs);
-                } else {
-                    resolve([]);
-                }
-            },
-            error: reject
-        });
-    });
+    return { summary: summary, raw_data: purchaseInvoices };
 }
 
-function fetchPurchaseOrderData(filters, state) {
-    return new Promise((resolve, reject) => {
-        // Build filters directly on Purchase Order doctype so we include ALL POs,
-        // not just those linked via the New Procurement Tracker report.
-        const poFilters = {
-            docstatus: 1,
-            transaction_date: ['between', [filters.from_date, filters.to_date]]
-        };
-
-        if (filters.supplier) {
-            poFilters.supplier = filters.supplier;
-        }
-        if (filters.po_status) {
-            poFilters.workflow_state = filters.po_status;
-        }
-        if (filters.po_id) {
-            poFilters.name = filters.po_id;
-        }
+function buildOverviewTab(d) {
+    // Counts come straight from each doctype, independent of the MR → PO → PR → PI links
+    if (!d) {
+        return { summary: [], raw_data: [] };
+    }
 
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Purchase Order',
-                filters: poFilters,
-                fields: ['name', 'transaction_date', 'workflow_state', 'status', 'supplier', 'grand_total'],
-                limit_page_length: 10000
+    return {
+        summary: [
+            {
+                value: d.total_material_requests || 0,
+                label: __('Total Material Requests'),
+                datatype: 'Int',
+                indicator: 'Blue',
+                description: __('Submitted material requests in the period')
             },
-            callback: (r) => {
-                let purchaseOrders = (r.message || []).map(po => ({
-                    name: po.name,
-                    transaction_date: po.transaction_date,
-                    workflow_state: po.workflow_state || '',
-                    status: po.status || '',
-                    supplier: po.supplier || '',
-                    grand_total: parseFloat(po.grand_total || 0)
-                }));
-
-                const proceedWithData = (data) => {
-                    const filteredData = data;
-
-                    // ── Build Purchase Order summary cards (matching the screenshot) ──
-                    const totalPOs = filteredData.length;
-
-                    const countByWorkflow = (statusName) =>
-                        filteredData.filter(po => (po.workflow_state || '').toLowerCase() === statusName.toLowerCase()).length;
-
-                    const pendingPOs = countByWorkflow('Pending');
-                    // Pending Approval – include both 'Waiting For Approval' and 'To Approve'
-                    const pendingApprovalPOs =
-                        countByWorkflow('Waiting For Approval') + countByWorkflow('To Approve');
-
-                    const totalPOValue = filteredData.reduce((sum, po) => {
-                        return sum + (po.grand_total || 0);
-                    }, 0);
-
-                    const summary = [
-                        {
-                            value: totalPOs,
-                            label: __('Total Purchase Orders'),
-                            datatype: 'Int',
-                            indicator: 'Blue',
-                            description: __('Total purchase orders (excluding cancelled)')
-                        },
-                        {
-                            value: pendingPOs,
-                            label: __('Pending Purchase Orders'),
-                            datatype: 'Int',
-                            indicator: 'Orange',
-                            description: __('Purchase orders with Pending status')
-                        },
-                        {
-                            value: pendingApprovalPOs,
-                            label: __('Pending Approval Purchase Orders'),
-                            datatype: 'Int',
-                            indicator: 'Green',
-                            description: __('Purchase orders pending approval')
-                        },
-                        {
-                            value: totalPOValue,
-                            label: __('Total Purchase Order Value'),
-                            datatype: 'Currency',
-                            indicator: 'Purple',
-                            description: __('Sum of grand total for selected date range'),
-                            prefix: '₹'
-                        }
-                    ];
-
-                    // Dynamic status dropdown options based on actual workflow_state values
-                    updateStatusOptions('purchase_order', purchaseOrders, state);
-
-                    resolve({
-                        summary: summary,
-                        raw_data: filteredData
-                    });
-                };
-
-                // Apply item filter via Purchase Order Item if specified
-                if (filters.po_item_name && purchaseOrders.length > 0) {
-                    filterPurchaseOrdersByItemName(purchaseOrders, filters.po_item_name)
-                        .then(filtered => {
-                            proceedWithData(filtered);
-                        })
-                        .catch(err => {
-                            console.warn('Error filtering POs by item, falling back to unfiltered list:', err);
-                            proceedWithData(purchaseOrders);
-                        });
-                } else {
-                    proceedWithData(purchaseOrders);
-                }
-            },
-            error: reject
-        });
-    });
-}
-
-function fetchPurchaseReceiptData(filters, state) {
-    return new Promise((resolve, reject) => {
-        // Fetch Purchase Receipts directly so we can build accurate cards:
-        // Total Purchase Receipts, Completed Purchase Receipts, Total Receipt Value
-        const prFilters = {
-            docstatus: 1,
-            posting_date: ['between', [filters.from_date, filters.to_date]]
-        };
-
-        // Add supplier filter if specified
-        if (filters.supplier) {
-            prFilters.supplier = filters.supplier;
-        }
-
-        // Add ID filter if specified
-        if (filters.pr_id) {
-            prFilters.name = filters.pr_id;
-        }
-
-        const summary = [];
-
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Purchase Receipt',
-                filters: prFilters,
-                fields: ['name', 'posting_date', 'status', 'supplier', 'grand_total'],
-                limit_page_length: 10000
+            {
+                value: d.total_purchase_orders || 0,
+                label: __('Total Purchase Orders'),
+                datatype: 'Int',
+                indicator: 'Green',
+                description: __('Submitted purchase orders in the period')
             },
-            callback: (r) => {
-                let receipts = [];
-
-                if (r.message && r.message.length > 0) {
-                    receipts = r.message.map(pr => ({
-                        name: pr.name,
-                        posting_date: pr.posting_date,
-                        workflow_state: pr.status || '',
-                        status: pr.status || '',
-                        supplier: pr.supplier || '',
-                        grand_total: parseFloat(pr.grand_total || 0)
-                    }));
-                }
-
-                const proceedWithData = (data) => {
-                    const filteredData = data;
-
-                    const totalReceipts = filteredData.length;
-                    const completedReceipts = filteredData.filter(pr =>
-                        (pr.status || '').toLowerCase() === 'completed'
-                    ).length;
-
-                    const totalReceiptValue = filteredData.reduce((sum, pr) => {
-                        return sum + (pr.grand_total || 0);
-                    }, 0);
-
-                    // Total Purchase Receipts card
-                    summary.push({
-                        value: totalReceipts,
-                        label: __('Total Purchase Receipts'),
-                        datatype: 'Int',
-                        indicator: 'Blue',
-                        description: __('Total purchase receipts')
-                    });
-
-                    // Completed Purchase Receipts card
-                    summary.push({
-                        value: completedReceipts,
-                        label: __('Completed Purchase Receipts'),
-                        datatype: 'Int',
-                        indicator: 'Green',
-                        description: __('Purchase receipts with Completed status')
-                    });
-
-                    // Total Receipt Value card
-                    summary.push({
-                        value: totalReceiptValue,
-                        label: __('Total Receipt Value'),
-                        datatype: 'Currency',
-                        indicator: 'Purple',
-                        description: __('Sum of grand total for selected date range'),
-                        prefix: '₹'
-                    });
-
-                    updateStatusOptions('purchase_receipt', receipts, state);
-                    resolve({
-                        summary: summary,
-                        raw_data: filteredData
-                    });
-                };
-
-                // Apply item filter via Purchase Receipt Item if specified
-                if (filters.pr_item_name && receipts.length > 0) {
-                    filterPurchaseReceiptsByItemName(receipts, filters.pr_item_name)
-                        .then(filtered => {
-                            proceedWithData(filtered);
-                        })
-                        .catch(err => {
-                            console.warn('Error filtering PRs by item, falling back to unfiltered list:', err);
-                            proceedWithData(receipts);
-                        });
-                } else {
-                    proceedWithData(receipts);
-                }
+            {
+                value: d.total_purchase_receipts || 0,
+                label: __('Total Purchase Receipts'),
+                datatype: 'Int',
+                indicator: 'Orange',
+                description: __('Submitted purchase receipts in the period')
             },
-            error: () => {
-                summary.push({
-                    value: 0,
-                    label: __('Total Purchase Receipts'),
-                    datatype: 'Int',
-                    indicator: 'Blue',
-                    description: __('Total purchase receipts')
-                });
-
-                summary.push({
-                    value: 0,
-                    label: __('Completed Purchase Receipts'),
-                    datatype: 'Int',
-                    indicator: 'Green',
-                    description: __('Purchase receipts with Completed status')
-                });
-
-                summary.push({
-                    value: 0,
-                    label: __('Total Receipt Value'),
-                    datatype: 'Currency',
-                    indicator: 'Purple',
-                    description: __('Sum of grand total for selected date range'),
-                    prefix: '₹'
-                });
-
-                updateStatusOptions('purchase_receipt', [], state);
-                resolve({
-                    summary: summary,
-                    raw_data: []
-                });
+            {
+                value: d.total_purchase_invoices || 0,
+                label: __('Total Purchase Invoices'),
+                datatype: 'Int',
+                indicator: 'Purple',
+                description: __('Submitted purchase invoices in the period')
             }
-        });
-    });
-}
-
-function fetchPurchaseInvoiceData(filters, state) {
-    return new Promise((resolve, reject) => {
-        // Use the new Purchase Invoice Tracker report
-        frappe.call({
-            method: 'frappe.desk.query_report.run',
-            args: {
-                report_name: 'Purchase Invoice Tracker',
-                filters: {
-                    from_date: filters.from_date,
-                    to_date: filters.to_date,
-                    supplier: filters.supplier || '',
-                    // Treat "All" (or empty) as no workflow filter
-                    workflow_status: (!filters.pi_status || filters.pi_status === 'All') ? '' : filters.pi_status
-                },
-                ignore_prepared_report: 1,
-            },
-            callback: (r) => {
-                if (r.message && r.message.result) {
-                    let piData = r.message.result;
-                    console.log('Raw Purchase Invoice data from report:', piData.slice(0, 2)); // Show first 2 records
-
-                    // Transform data to match expected format
-                    const purchaseInvoices = [];
-                    const seenPIs = new Set();
-                    let totalGrandTotal = 0; // Calculate sum of grand total
-
-                    piData.forEach(row => {
-                        if (row.purchase_invoice_id && !seenPIs.has(row.purchase_invoice_id)) {
-                            seenPIs.add(row.purchase_invoice_id);
-                            const grandTotal = parseFloat(row.grand_total || 0);
-                            totalGrandTotal += grandTotal;
-
-                            purchaseInvoices.push({
-                                name: row.purchase_invoice_id,
-                                posting_date: row.date,
-                                due_date: row.due_date || null, // Will be fetched separately
-                                workflow_state: row.status,
-                                status: row.status,
-                                supplier: row.supplier,
-                                grand_total: grandTotal
-                            });
-                        }
-                    });
-
-                    // Fetch due_date from Purchase Invoice documents
-                    if (purchaseInvoices.length > 0) {
-                        const invoiceNames = purchaseInvoices.map(pi => pi.name);
-
-                        frappe.call({
-                            method: 'frappe.client.get_list',
-                            args: {
-                                doctype: 'Purchase Invoice',
-                                filters: [['Purchase Invoice', 'name', 'in', invoiceNames]],
-                                fields: ['name', 'due_date'],
-                                limit_page_length: 1000
-                            },
-                            callback: (piDetails) => {
-                                if (piDetails.message) {
-                                    // Create a map for quick lookup
-                                    const piDetailsMap = {};
-                                    piDetails.message.forEach(pi => {
-                                        piDetailsMap[pi.name] = {
-                                            due_date: pi.due_date
-                                        };
-                                    });
-
-                                    // Update purchase invoices with the fetched data
-                                    purchaseInvoices.forEach(pi => {
-                                        const details = piDetailsMap[pi.name];
-                                        if (details) {
-                                            pi.due_date = details.due_date;
-                                        }
-                                    });
-                                }
-
-                                // Continue with the rest of the processing
-                                processPurchaseInvoiceData();
-                            },
-                            error: (error) => {
-                                console.warn('Could not fetch Purchase Invoice details:', error);
-                                // Continue with the rest of the processing even if this fails
-                                processPurchaseInvoiceData();
-                            }
-                        });
-                    } else {
-                        processPurchaseInvoiceData();
-                    }
-
-                    function processPurchaseInvoiceData() {
-                        // Apply additional filters
-                        let filteredData = purchaseInvoices;
-
-                        // Apply ID filter (exact match since Link field returns exact name)
-                        if (filters.pi_id) {
-                            filteredData = filteredData.filter(pi => pi.name === filters.pi_id);
-                        }
-
-                        // Apply supplier filter if specified
-                        if (filters.supplier) {
-                            filteredData = filteredData.filter(pi => pi.supplier === filters.supplier);
-                        }
-
-                        // Apply item filter if specified - filter the original procurement data first
-                        if (filters.pi_item_name) {
-                            const itemFilteredProcurementData = procurementData.filter(row =>
-                                row.item_code === filters.pi_item_name
-                            );
-
-                            // Extract unique Purchase Invoices from item-filtered data
-                            const itemFilteredPIs = [];
-                            const seenItemFilteredPIs = new Set();
-
-                            itemFilteredProcurementData.forEach(row => {
-                                if (row.purchase_invoice && !seenItemFilteredPIs.has(row.purchase_invoice)) {
-                                    seenItemFilteredPIs.add(row.purchase_invoice);
-                                    itemFilteredPIs.push({
-                                        name: row.purchase_invoice,
-                                        posting_date: row.invoice_date,
-                                        workflow_state: row.pi_status,
-                                        status: row.pi_status,
-                                        supplier: row.supplier,
-                                        grand_total: 0
-                                    });
-                                }
-                            });
-
-                            // Apply other filters to item-filtered data
-                            filteredData = itemFilteredPIs;
-                        }
-
-                        // Apply status filter (ignore "All")
-                        if (filters.pi_status && filters.pi_status !== 'All') {
-                            filteredData = filteredData.filter(pi => pi.workflow_state === filters.pi_status);
-                        }
-
-                        // Apply ID filter (exact match since Link field returns exact name)
-                        if (filters.pi_id) {
-                            filteredData = filteredData.filter(pi => pi.name === filters.pi_id);
-                        }
-
-                        // Apply supplier filter
-                        if (filters.supplier) {
-                            filteredData = filteredData.filter(pi => pi.supplier === filters.supplier);
-                        }
-
-                        // Never count cancelled invoices in the dashboard cards / table
-                        filteredData = filteredData.filter(pi =>
-                            (pi.status || '').toLowerCase() !== 'cancelled'
-                        );
-
-                        // ── Build Purchase Invoice summary cards (matching UI) ──
-                        const totalInvoices = filteredData.length;
-
-                        const countByStatus = (statusName) =>
-                            filteredData.filter(pi => (pi.status || '').toLowerCase() === statusName.toLowerCase()).length;
-
-                        const paidInvoices = countByStatus('Paid');
-                        const overdueInvoices = countByStatus('Overdue');
-
-                        const totalInvoiceValue = filteredData.reduce((sum, pi) => {
-                            return sum + parseFloat(pi.grand_total || 0);
-                        }, 0);
-
-                        const summary = [
-                            {
-                                value: totalInvoices,
-                                label: __('Total Purchase Invoice'),
-                                datatype: 'Int',
-                                indicator: 'Blue',
-                                description: __('Total purchase invoices (excluding cancelled)')
-                            },
-                            {
-                                value: paidInvoices,
-                                label: __('Paid Purchase Invoice'),
-                                datatype: 'Int',
-                                indicator: 'Green',
-                                description: __('Purchase invoices with Paid status')
-                            },
-                            {
-                                value: overdueInvoices,
-                                label: __('Overdue Purchase Invoices'),
-                                datatype: 'Int',
-                                indicator: 'Red',
-                                description: __('Purchase invoices with Overdue status')
-                            },
-                            {
-                                value: totalInvoiceValue,
-                                label: __('Total Invoice Value'),
-                                datatype: 'Currency',
-                                indicator: 'Purple',
-                                description: __('Sum of grand total for selected date range'),
-                                prefix: '₹'
-                            }
-                        ];
-
-                        // Update status options based on actual data
-                        updateStatusOptions('purchase_invoice', purchaseInvoices, state);
-
-                        resolve({
-                            summary: summary,
-                            raw_data: filteredData
-                        });
-                    }
-                } else {
-                    resolve({ summary: [], raw_data: [] });
-                }
-            },
-            error: reject
-        });
-    });
-}
-
-function fetchOverviewData(filters) {
-    // Calls a dedicated backend API that runs simple COUNT queries
-    // against each doctype directly.  This avoids the MR → PO → PR → PI
-    // join chain and guarantees accurate, independent counts.
-    return new Promise((resolve, reject) => {
-        frappe.call({
-            method: 'prakash_steel.api.procurement_dashboard.get_overview_data',
-            args: {
-                from_date: filters.from_date,
-                to_date: filters.to_date,
-                supplier: filters.supplier || ''
-            },
-            callback: (r) => {
-                if (r.message) {
-                    const d = r.message;
-                    resolve({
-                        summary: [
-                            {
-                                value: d.total_material_requests || 0,
-                                label: __('Total Material Requests'),
-                                datatype: 'Int',
-                                indicator: 'Blue',
-                                description: __('Submitted material requests in the period')
-                            },
-                            {
-                                value: d.total_purchase_orders || 0,
-                                label: __('Total Purchase Orders'),
-                                datatype: 'Int',
-                                indicator: 'Green',
-                                description: __('Submitted purchase orders in the period')
-                            },
-                            {
-                                value: d.total_purchase_receipts || 0,
-                                label: __('Total Purchase Receipts'),
-                                datatype: 'Int',
-                                indicator: 'Orange',
-                                description: __('Submitted purchase receipts in the period')
-                            },
-                            {
-                                value: d.total_purchase_invoices || 0,
-                                label: __('Total Purchase Invoices'),
-                                datatype: 'Int',
-                                indicator: 'Purple',
-                                description: __('Submitted purchase invoices in the period')
-                            }
-                        ],
-                        raw_data: []
-                    });
-                } else {
-                    resolve({ summary: [], raw_data: [] });
-                }
-            },
-            error: reject
-        });
-    });
+        ],
+        raw_data: []
+    };
 }
 
 function getStatusOptions(tabId) {
@@ -1683,52 +1056,16 @@ function getStatusOptions(tabId) {
     return [''];
 }
 
-function updateStatusOptions(tabId, data, state) {
-    const statusSet = new Set();
-
-    console.log(`updateStatusOptions called for ${tabId} with ${data ? data.length : 0} records`);
-    if (data && data.length > 0) {
-        console.log(`Sample data for ${tabId}:`, data[0]);
-    }
-
-    if (tabId === 'material_request') {
-        // For Material Request we keep a fixed set of options matching the UI:
-        // All, Pending, Partially Ordered, Partially Received
-        ['Pending', 'Partially Ordered', 'Partially Received'].forEach(s => statusSet.add(s));
-    } else if (tabId === 'purchase_order') {
-        data.forEach(row => {
-            if (row.workflow_state) {
-                statusSet.add(row.workflow_state);
-            }
-        });
-    } else if (tabId === 'purchase_receipt') {
-        data.forEach(row => {
-            if (row.workflow_state) {
-                statusSet.add(row.workflow_state);
-            }
-        });
-    } else if (tabId === 'purchase_invoice') {
-        data.forEach(row => {
-            console.log(`Purchase Invoice row:`, row);
-            if (row.status) {
-                console.log(`Adding status: ${row.status}`);
-                statusSet.add(row.status);
-            }
-            // Also check workflow_state as fallback
-            if (row.workflow_state) {
-                console.log(`Adding workflow_state: ${row.workflow_state}`);
-                statusSet.add(row.workflow_state);
-            }
-        });
-    }
-
-    const statusOptions = ['', ...Array.from(statusSet).sort()];
-
-    console.log(`Generated status options for ${tabId}:`, statusOptions);
+function updateStatusOptions(tabId, options, state) {
+    // Material Request keeps a fixed set of options matching the UI:
+    // All, Pending, Partially Ordered, Partially Received. The other tabs list the
+    // statuses the server found for the period.
+    const statusOptions = tabId === 'material_request'
+        ? getStatusOptions(tabId)
+        : ['', ...(options || [])];
 
     // Update the dropdown options
     const statusControl = state.controls[`${tabId}_status`];
-    console.log(`Status control for ${tabId}:`, statusControl);
     if (statusControl) {
         statusControl.df.options = statusOptions;
         statusControl.refresh();
@@ -2026,7 +1363,7 @@ function renderPurchaseInvoiceTable($container, data) {
                 <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: left;"><a href="/app/purchase-invoice/${row.name}" class="link-cell" style="color: #007bff; text-decoration: none; cursor: pointer;">${row.name}</a></td>
                 <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: left;">${frappe.format(row.posting_date, { fieldtype: 'Date' })}</td>
                 <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: left;">${frappe.format(row.due_date, { fieldtype: 'Date' })}</td>
-                <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: left;"><span class="badge badge-${getStatusClass(row.workflow_state)}">${row.workflow_state || 'Draft'}</span></td>
+                <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: left;"><span class="badge badge-${getStatusClass(row.status)}">${row.status || 'Draft'}</span></td>
                 <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: left;">${row.supplier || ''}</td>
                 <td style="padding: 12px; border-bottom: 1px solid #e9ecef; color: #495057; text-align: right;">${frappe.format(row.grand_total || 0, { fieldtype: 'Currency' })}</td>
             </tr>
@@ -26,11 +26,18 @@ frappe.pages['production-dashboard'].on_page_load = function (wrapper) {
         selectedColumns: {},
         _refreshTimer: null,
         _refreshGen: 0,
+        // Last response per method + args, revalidated with its ETag
+        _viewCache: {},
+        // Rows in the table currently shown; large exports run in the background
+        rowCount: 0,
     };
 
     initializeDashboard(state);
 };
 
+// Same as BACKGROUND_EXPORT_ROWS in prakash_steel/utils/xlsx_export.py
+const BACKGROUND_EXPORT_ROWS = 5000;
+
 frappe.pages['production-dashboard'].on_page_show = function () { };
 
 // ────────────────────────────────────────────────────────────────
@@ -390,27 +397,39 @@ function refreshDashboard(state) {
     const from_date = filters.from_date || '';
     const to_date = filters.to_date || (filters.from_date ? '' : frappe.datetime.get_today());
 
+    const args = {
+        from_date: from_date,
+        to_date: to_date,
+        item_code: filters.item_code || '',
+        production_plan: filters.production_plan || '',
+        machine_name: filters.machine_name || '',
+        category_name: filters.category_name || '',
+    };
+    const cacheKey = `${apiMethod}:${JSON.stringify(args)}`;
+    const cached = state._viewCache[cacheKey];
+
     frappe.call({
         method: apiMethod,
-        args: {
-            from_date: from_date,
-            to_date: to_date,
-            item_code: filters.item_code || '',
-            production_plan: filters.production_plan || '',
-            machine_name: filters.machine_name || '',
-            category_name: filters.category_name || '',
-        },
+        args: Object.assign({ if_none_match: cached ? cached.etag : '' }, args),
         callback: function (r) {
             if (state._refreshGen !== thisGen) return; // stale
             state.page.clear_indicator();
 
-            const data = r.message || { rows: [], totals: {} };
+            let data = r.message || { rows: [], totals: {} };
+            if (data.not_modified && cached) {
+                // Server data unchanged since the last load of this view; reuse it
+                data = cached;
+            } else if (data.etag) {
+                state._viewCache[cacheKey] = data;
+            }
+            state.rowCount = (data.rows || []).length;
             render_cards(state, data.totals);
             render_table(state, data.rows);
         },
         error: function () {
             if (state._refreshGen !== thisGen) return;
             state.page.clear_indicator();
+            state.rowCount = 0;
             render_cards(state, { total_production: 0, rm_consumption: 0 });
             render_table(state, []);
             frappe.show_alert({ message: __('Error loading production data'), indicator: 'red' });
@@ -1053,6 +1072,20 @@ function exportTableToExcel(state, tabId) {
         selected_columns: selectedKeys.join(','),
     };
 
+    if (state.rowCount > BACKGROUND_EXPORT_ROWS) {
+        frappe.call({
+            method: 'prakash_steel.api.production_dashboard.enqueue_production_dashboard_export',
+            args: params,
+            callback: function () {
+                frappe.show_alert({
+                    message: __('Export queued; you will get a download link when it is ready'),
+                    indicator: 'blue',
+                });
+            },
+        });
+        return;
+    }
+
     const query = Object.keys(params)
         .map(k => `${encodeURIComponent(k)}=${encodeURIComponent(params[k] || '')}`)
         .join('&');
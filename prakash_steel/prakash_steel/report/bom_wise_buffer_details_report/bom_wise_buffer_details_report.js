@@ -6,9 +6,17 @@ frappe.query_reports["BOM wise Buffer Details Report"] = {
 		{
 			"fieldname": "bom",
 			"label": __("BOM"),
-			"fieldtype": "Link",
+			"fieldtype": "MultiSelectList",
 			"options": "BOM",
-			"reqd": 1
+			get_data: function (txt) {
+				return frappe.db.get_link_options("BOM", txt, { is_active: 1 });
+			}
+		},
+		{
+			"fieldname": "item_group",
+			"label": __("Item Group"),
+			"fieldtype": "Link",
+			"options": "Item Group"
 		}
 	],
 
@@ -3,7 +3,10 @@
 
 import frappe
 from frappe.utils import flt
-from prakash_steel.utils.lead_time import calculate_decoupled_lead_time, get_default_bom
+from frappe.utils.nestedset import get_descendants_of
+
+from prakash_steel.utils.bom_cache import get_cached_bom, get_default_bom_map
+from prakash_steel.utils.lead_time import get_decoupled_lead_time_map, get_default_bom, load_bom_tree_items
 
 
 @frappe.whitelist()
@@ -115,16 +118,19 @@ def get_columns():
 	]
 
 
-def get_all_items_recursively(bom_name, parent_item=None, level=0, visited_boms=None, item_groups_cache=None):
+def get_all_items_recursively(bom_name, parent_item=None, level=0, visited_boms=None, items=None):
 	"""
-	Recursively get all items from a BOM and its nested BOMs.
+	Get all items from a BOM and its nested BOMs.
+
+	The tree is walked over the preloaded BOM graph (BOM cache + item map), so no
+	document is loaded per nested BOM.
 
 	Args:
 		bom_name: BOM name to process
 		parent_item: Parent item code (for hierarchy tracking)
 		level: Current nesting level (0 = top level)
 		visited_boms: Set of visited BOMs to prevent circular references
-		item_groups_cache: Dict to cache item_group lookups (for performance)
+		items: Item map from load_bom_tree_items (loaded for this BOM if not given)
 
 	Returns:
 		list: List of dicts with item information including level, parent, and has_children flag
@@ -132,9 +138,6 @@ def get_all_items_recursively(bom_name, parent_item=None, level=0, visited_boms=
 	if visited_boms is None:
 		visited_boms = set()
 
-	if item_groups_cache is None:
-		item_groups_cache = {}
-
 	# Prevent circular references
 	if bom_name in visited_boms:
 		return []
@@ -143,54 +146,20 @@ def get_all_items_recursively(bom_name, parent_item=None, level=0, visited_boms=
 	items_list = []
 
 	try:
-		# Get BOM document
-		bom_doc = frappe.get_doc("BOM", bom_name)
-
-		# Collect all item codes in this BOM for batch lookup
-		bom_item_codes = [bom_item.item_code for bom_item in bom_doc.items]
-
-		# Batch fetch item_groups for all items in this BOM (optimization)
-		if bom_item_codes:
-			items_to_fetch = [code for code in bom_item_codes if code not in item_groups_cache]
-			if items_to_fetch:
-				if len(items_to_fetch) == 1:
-					item_codes_tuple = (items_to_fetch[0],)
-				else:
-					item_codes_tuple = tuple(items_to_fetch)
-
-				item_group_data = frappe.db.sql(
-					"""
-					SELECT name, item_group
-					FROM `tabItem`
-					WHERE name IN %s
-					""",
-					(item_codes_tuple,),
-					as_dict=True,
-				)
+		bom = get_cached_bom(bom_name)
+		if items is None:
+			items = load_bom_tree_items([bom_item.item_code for bom_item in bom.items])
 
-				# Cache the results
-				for item in item_group_data:
-					item_groups_cache[item.name] = item.item_group
-
-		# Process each item in the BOM
-		for bom_item in bom_doc.items:
+		for bom_item in bom.items:
 			item_code = bom_item.item_code
+			item = items.get(item_code)
 
-			# Optimization: Check item_group first - Raw Materials don't have BOMs
-			# This avoids unnecessary BOM lookup for raw materials
-			item_group = item_groups_cache.get(item_code)
-
-			# Check if this item has a BOM (nested BOM)
-			has_children = False
+			# Raw Materials don't have BOMs, so only look up a child BOM for other items
 			child_bom = None
-
-			# If it's not a Raw Material, check for BOM
-			if not (item_group and item_group == "Raw Material"):
+			if not (item and item.item_group == "Raw Material"):
 				child_bom = get_default_bom(item_code)
-				if child_bom and child_bom not in visited_boms:
-					has_children = True
+			has_children = bool(child_bom and child_bom not in visited_boms)
 
-			# Add this item to the list
 			items_list.append(
 				{
 					"item_code": item_code,
@@ -200,18 +169,17 @@ def get_all_items_recursively(bom_name, parent_item=None, level=0, visited_boms=
 				}
 			)
 
-			# If it has children, recursively get items from child BOM
-			if has_children and child_bom:
-				# Recursively get items from child BOM
-				# Pass the same visited_boms and cache to prevent cycles and reuse cache
-				child_items = get_all_items_recursively(
-					child_bom,
-					parent_item=item_code,
-					level=level + 1,
-					visited_boms=visited_boms,  # Same set to prevent cycles
-					item_groups_cache=item_groups_cache,  # Reuse cache for performance
+			if has_children:
+				# Same visited_boms set to prevent cycles, same item map for lookups
+				items_list.extend(
+					get_all_items_recursively(
+						child_bom,
+						parent_item=item_code,
+						level=level + 1,
+						visited_boms=visited_boms,
+						items=items,
+					)
 				)
-				items_list.extend(child_items)
 
 	except frappe.DoesNotExistError:
 		frappe.log_error(f"BOM {bom_name} does not exist", "BOM Wise Buffer Details Report Error")
@@ -224,75 +192,86 @@ def get_all_items_recursively(bom_name, parent_item=None, level=0, visited_boms=
 	return items_list
 
 
+def get_root_boms(filters):
+	"""
+	Resolve the BOMs to expand from the filters.
+
+	`bom` may be a single BOM or a list of BOMs; `item_group` adds the default BOM of
+	every enabled item in that group and its sub-groups.
+	"""
+	boms = filters.get("bom") or []
+	if isinstance(boms, str):
+		boms = frappe.parse_json(boms) if boms.startswith("[") else boms.split(",")
+	boms = [bom.strip() for bom in boms if bom and bom.strip()]
+
+	item_group = filters.get("item_group")
+	if item_group:
+		item_groups = [item_group, *get_descendants_of("Item Group", item_group)]
+		group_items = frappe.get_all(
+			"Item",
+			filters={"item_group": ["in", item_groups], "disabled": 0},
+			pluck="name",
+			order_by="name asc",
+		)
+		default_boms = get_default_bom_map()
+		boms.extend(default_boms[item_code] for item_code in group_items if default_boms.get(item_code))
+
+	# Keep the first occurrence of each BOM, in filter order
+	return list(dict.fromkeys(boms))
+
+
 def get_data(filters):
 	"""Get report data based on filters"""
 	data = []
 
-	if not filters or not filters.get("bom"):
+	if not filters or not (filters.get("bom") or filters.get("item_group")):
 		return data
 
-	bom_name = filters.get("bom")
+	root_boms = get_root_boms(filters)
+	if not root_boms:
+		return data
 
+	current_bom = None
 	try:
-		# Get BOM document to get the main item
-		bom_doc = frappe.get_doc("BOM", bom_name)
-		main_item_code = bom_doc.item if bom_doc.item else None
-
-		# Check if main item has children (has a BOM with items)
-		main_item_has_children = False
-		if main_item_code:
-			# Check if main item has a BOM (it should, since we're viewing its BOM)
-			# But also check if the BOM has items
-			if bom_doc.items and len(bom_doc.items) > 0:
-				main_item_has_children = True
-
-		# Get all items recursively (including nested BOMs)
-		all_items_hierarchy = get_all_items_recursively(bom_name, parent_item=main_item_code, level=1)
-
-		# Add main item as first row if it exists
-		if main_item_code:
-			all_items_hierarchy.insert(
-				0,
-				{
-					"item_code": main_item_code,
-					"parent_item": None,
-					"level": 0,
-					"has_children": main_item_has_children,
-				},
+		boms = {}
+		for bom_name in root_boms:
+			current_bom = bom_name
+			boms[bom_name] = get_cached_bom(bom_name)
+		current_bom = None
+
+		# Preload every item of every tree in one pass over the BOM graph
+		root_item_codes = []
+		for bom in boms.values():
+			if bom.item:
+				root_item_codes.append(bom.item)
+			root_item_codes.extend(bom_item.item_code for bom_item in bom.items)
+		items_dict = load_bom_tree_items(root_item_codes)
+
+		# Build the hierarchy for every root BOM, main item first
+		all_items_hierarchy = []
+		for bom_name, bom in boms.items():
+			main_item_code = bom.item or None
+
+			if main_item_code:
+				all_items_hierarchy.append(
+					{
+						"item_code": main_item_code,
+						"parent_item": None,
+						"level": 0,
+						"has_children": bool(bom.items),
+					}
+				)
+
+			all_items_hierarchy.extend(
+				get_all_items_recursively(bom_name, parent_item=main_item_code, level=1, items=items_dict)
 			)
 
 		if not all_items_hierarchy:
 			return data
 
-		# Get unique item codes (including main item)
-		unique_item_codes = list(set([item["item_code"] for item in all_items_hierarchy]))
-
-		if not unique_item_codes:
-			return data
-
-		# Query all items at once using SQL for better performance
-		if len(unique_item_codes) == 1:
-			item_codes_tuple = (unique_item_codes[0],)
-		else:
-			item_codes_tuple = tuple(unique_item_codes)
-
-		# Query items from database (we don't need custom_decoupled_lead_time since we calculate it)
-		items_data = frappe.db.sql(
-			"""
-			SELECT 
-				name as item_code,
-				item_name,
-				lead_time_days,
-				custom_buffer_flag
-			FROM `tabItem`
-			WHERE name IN %s
-			""",
-			(item_codes_tuple,),
-			as_dict=True,
-		)
-
-		# Create a dictionary for quick lookup
-		items_dict = {item["item_code"]: item for item in items_data}
+		# Lead times for all trees in one memoized pass
+		unique_item_codes = list(dict.fromkeys(item["item_code"] for item in all_items_hierarchy))
+		lead_time_map = get_decoupled_lead_time_map(unique_item_codes, items=items_dict)
 
 		# Build data rows maintaining hierarchy order
 		for item_info in all_items_hierarchy:
@@ -305,17 +284,7 @@ def get_data(filters):
 
 			if item_data:
 				# Always calculate custom_decoupled_lead_time dynamically (like the UI does)
-				try:
-					decoupled_lead_time = calculate_decoupled_lead_time(item_code)
-				except Exception as e:
-					frappe.log_error(
-						f"Error calculating decoupled lead time for item {item_code}: {str(e)}",
-						"BOM Wise Buffer Details Report Error",
-					)
-					decoupled_lead_time = 0
-
-				# Ensure it's a float
-				decoupled_lead_time = flt(decoupled_lead_time or 0)
+				decoupled_lead_time = flt(lead_time_map.get(item_code) or 0)
 
 				# Get buffer flag
 				buffer_flag = item_data.get("custom_buffer_flag") or "No"
@@ -345,9 +314,11 @@ def get_data(filters):
 				)
 
 	except frappe.DoesNotExistError:
-		frappe.throw(f"BOM {bom_name} does not exist")
+		frappe.throw(f"BOM {current_bom} does not exist")
 	except Exception as e:
-		frappe.log_error(f"Error processing BOM {bom_name}: {str(e)}", "BOM Wise Buffer Details Report Error")
+		frappe.log_error(
+			f"Error processing BOMs {', '.join(root_boms)}: {str(e)}", "BOM Wise Buffer Details Report Error"
+		)
 		frappe.throw(f"Error processing BOM: {str(e)}")
 
 	return data
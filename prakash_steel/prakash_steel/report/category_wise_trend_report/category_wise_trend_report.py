@@ -105,77 +105,24 @@ def get_data(from_date, to_date, sku_type):
 		date_list.append(current_date)
 		current_date = add_days(current_date, 1)
 	
-	# Query Item wise Daily On Hand Colour for the date range
-	parent_docs = frappe.db.sql("""
-		SELECT name, posting_date
-		FROM `tabItem wise Daily On Hand Colour`
-		WHERE posting_date BETWEEN %s AND %s
-		ORDER BY posting_date
-	""", (from_date, to_date), as_dict=True)
-	
-	# Build a map: {date: {item_code: on_hand_colour}}
-	date_item_colour_map = {}
-	for date in date_list:
-		date_item_colour_map[date] = {}
-	
-	# Process each parent document
-	for parent_doc in parent_docs:
-		posting_date = getdate(parent_doc.posting_date)
-		
-		# Get child table data for this parent
-		child_data = frappe.db.sql("""
-			SELECT item_code, on_hand_colour
-			FROM `tabOn hand colour table`
-			WHERE parent = %s AND sku_type = %s
-		""", (parent_doc.name, sku_type), as_dict=True)
-		
-		# Store the on_hand_colour for each item on this date
-		if posting_date in date_item_colour_map:
-			for child in child_data:
-				item_code = child.item_code
-				on_hand_colour = child.on_hand_colour
-				if item_code:
-					date_item_colour_map[posting_date][item_code] = on_hand_colour or ""
-	
-	# Get all unique items across all dates for the selected SKU type
-	all_items = set()
-	for date in date_list:
-		all_items.update(date_item_colour_map[date].keys())
-	
-	# Get current buffer status and item type for all items
-	# Only include items that are currently buffer items with the selected SKU type
-	valid_items = set()
-	if all_items:
-		items_data = frappe.db.sql("""
-			SELECT name, item_name, custom_buffer_flag, custom_item_type
-			FROM `tabItem`
-			WHERE name IN ({})
-		""".format(','.join(['%s'] * len(all_items))), tuple(all_items), as_dict=True)
-		
-		for item in items_data:
-			buffer_flag = item.get("custom_buffer_flag") or "Non-Buffer"
-			item_type = item.get("custom_item_type")
-			current_sku_type = calculate_sku_type(buffer_flag, item_type)
-			
-			# Only include items that currently have the selected SKU type
-			if current_sku_type == sku_type:
-				valid_items.add(item.name)
-	
 	# Define the 5 categories
 	categories = ["Black", "Red", "Yellow", "Green", "White"]
 	
-	# First, calculate counts for each category for each date
-	category_counts = {}
-	for category in categories:
-		category_counts[category] = {}
-		for date in date_list:
-			count = 0
-			# Count items that have this category's colour on this date
-			for item_code in valid_items:
-				on_hand_colour = date_item_colour_map[date].get(item_code, "")
-				if on_hand_colour and on_hand_colour.strip().upper() == category.upper():
-					count += 1
-			category_counts[category][date] = count
+	# Colour counts are pre-aggregated per (date, SKU type, colour) when the daily
+	# colours are saved, so this is a single range read of at most days x 5 rows
+	count_rows = frappe.db.sql("""
+		SELECT posting_date, on_hand_colour, item_count
+		FROM `tabDaily On Hand Colour Count`
+		WHERE sku_type = %s AND posting_date BETWEEN %s AND %s
+	""", (sku_type, from_date, to_date), as_dict=True)
+	
+	category_counts = {category: {date: 0 for date in date_list} for category in categories}
+	category_by_colour = {category.upper(): category for category in categories}
+	for row in count_rows:
+		category = category_by_colour.get((row.on_hand_colour or "").upper())
+		posting_date = getdate(row.posting_date)
+		if category and posting_date in category_counts[category]:
+			category_counts[category][posting_date] += row.item_count
 	
 	# Calculate total count for each date (sum of all categories)
 	date_totals = {}
@@ -274,6 +221,43 @@ def calculate_order_status(delivery_date, transaction_date, check_date):
 		return "WHITE"
 
 
+# Lower bounds of the numeric buffer status (exclusive) above which an order shows
+# each colour in calculate_order_status, from the highest colour down
+STATUS_THRESHOLDS = [("WHITE", 100), ("GREEN", 67), ("YELLOW", 34), ("RED", -1)]
+
+
+def get_order_status_intervals(delivery_date, transaction_date):
+	"""
+	Split the days from transaction_date onwards into (status, start, end) intervals
+	that match calculate_order_status for every check date (end=None is open-ended).
+
+	The status only falls as the check date moves towards and past the delivery date:
+	with remaining = delivery - check and divisor = lead time (or 1 when the lead time
+	is not positive), the status is above threshold k while remaining * 100 > k * divisor,
+	so the last day of each colour follows from integer arithmetic.
+	"""
+	transaction_date = getdate(transaction_date)
+	if not delivery_date:
+		return [("BLACK", transaction_date, None)]
+	
+	delivery_date = getdate(delivery_date)
+	lead_time = date_diff(delivery_date, transaction_date)
+	divisor = lead_time if lead_time > 0 else 1
+	
+	intervals = []
+	start = transaction_date
+	for order_status, threshold in STATUS_THRESHOLDS:
+		# Smallest remaining days that keep the status above the threshold
+		min_remaining = threshold * divisor // 100 + 1
+		end = add_days(delivery_date, -min_remaining)
+		if end >= start:
+			intervals.append((order_status, start, end))
+			start = add_days(end, 1)
+	
+	intervals.append(("BLACK", start, None))
+	return intervals
+
+
 def get_pending_so_data(from_date, to_date):
 	"""Get Pending SO data with color status for each date"""
 	# Get all dates in range
@@ -307,25 +291,33 @@ def get_pending_so_data(from_date, to_date):
 		as_dict=1,
 	)
 	
-	# Calculate status for each SO on each date
+	# Count each SO's colour per date with a difference array over the date range:
+	# every SO contributes +1/-1 at the edges of its colour intervals instead of
+	# being re-evaluated on every date
 	categories = ["Black", "Red", "Yellow", "Green", "White"]
-	category_counts = {}
-	for category in categories:
-		category_counts[category] = {}
-		for date in date_list:
-			category_counts[category][date] = 0
+	day_count = len(date_list)
+	category_deltas = {category: [0] * (day_count + 1) for category in categories}
 	
 	for so in so_data:
-		delivery_date = so.get("delivery_date")
-		transaction_date = so.get("date")
+		# Only count this SO from its transaction date onwards
+		if not so.get("date"):
+			continue
 		
-		# Calculate status for each date in range
-		# Only count this SO if it existed on this date (transaction_date <= check_date)
-		for date in date_list:
-			if transaction_date and getdate(transaction_date) <= date:
-				order_status = calculate_order_status(delivery_date, transaction_date, date)
-				if order_status.upper() in [c.upper() for c in categories]:
-					category_counts[order_status.capitalize()][date] += 1
+		for order_status, start, end in get_order_status_intervals(so.get("delivery_date"), so.get("date")):
+			start_index = max(date_diff(start, from_date), 0)
+			end_index = day_count - 1 if end is None else min(date_diff(end, from_date), day_count - 1)
+			if start_index <= end_index:
+				deltas = category_deltas[order_status.capitalize()]
+				deltas[start_index] += 1
+				deltas[end_index + 1] -= 1
+	
+	category_counts = {}
+	for category in categories:
+		category_counts[category] = {}
+		running = 0
+		for index, date in enumerate(date_list):
+			running += category_deltas[category][index]
+			category_counts[category][date] = running
 	
 	# Calculate totals and percentages
 	date_totals = {}
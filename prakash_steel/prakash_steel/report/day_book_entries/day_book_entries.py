@@ -2,6 +2,8 @@ import frappe
 from frappe import _
 from frappe.utils import getdate, today
 
+from prakash_steel.utils.dashboard_cache import get_cached_view
+
 
 def _normalize_filter_value(value):
 	if isinstance(value, (list, tuple)):
@@ -137,76 +139,93 @@ def get_data(filters):
 	return frappe.db.sql(query, filters, as_dict=True)
 
 
+# Day Book filter suggestions are cached per date for a short while, so typing in a
+# filter box reads one cached list instead of re-running the voucher UNION per keystroke
+FILTER_OPTIONS_TTL = 60
+FILTER_OPTIONS_LIMIT = 20
+
+
 @frappe.whitelist()
 def get_filter_options(fieldname, txt="", date=None):
-	field_map = {
-		"party_name": "entries.particulars",
-		"vch_type": "entries.vch_type",
-		"vch_no": "entries.vch_no",
-	}
-	if fieldname not in field_map:
+	if fieldname not in ("party_name", "vch_type", "vch_no"):
 		return []
 
-	filters = {
-		"date": getdate(date or today()),
-		"txt": f"%{(txt or '').strip()}%",
-	}
+	date = getdate(date or today())
+	options, _etag = get_cached_view(
+		"day_book",
+		"filter_options",
+		{"date": str(date)},
+		lambda: get_all_filter_options(date),
+		ttl=FILTER_OPTIONS_TTL,
+	)
+
+	# Values starting with the typed text first, then values containing it
+	txt = (txt or "").strip().lower()
+	matches = sorted(
+		(not value.lower().startswith(txt), value) for value in options[fieldname] if txt in value.lower()
+	)
 
-	query = f"""
-		SELECT DISTINCT {field_map[fieldname]} AS value
-		FROM (
-			SELECT
-				COALESCE(pe.party, '') AS particulars,
-				COALESCE(pe.payment_type, 'Payment Entry') AS vch_type,
-				pe.name AS vch_no
-			FROM `tabPayment Entry` pe
-			WHERE pe.docstatus = 1
-				AND pe.posting_date = %(date)s
+	return [
+		{
+			"value": value,
+			"label": value,
+			"description": "",
+		}
+		for _prefix, value in matches[:FILTER_OPTIONS_LIMIT]
+	]
 
-			UNION ALL
 
-			SELECT
-				COALESCE(MAX(NULLIF(jea.party, '')), '') AS particulars,
-				COALESCE(je.voucher_type, 'Journal Entry') AS vch_type,
-				je.name AS vch_no
-			FROM `tabJournal Entry` je
-			LEFT JOIN `tabJournal Entry Account` jea
-				ON jea.parent = je.name
-			WHERE je.docstatus = 1
-				AND je.posting_date = %(date)s
-			GROUP BY je.name
+def get_all_filter_options(date):
+	"""Distinct party names, voucher types and voucher numbers of the day's vouchers."""
+	entries = frappe.db.sql(
+		"""
+		SELECT
+			COALESCE(pe.party, '') AS particulars,
+			COALESCE(pe.payment_type, 'Payment Entry') AS vch_type,
+			pe.name AS vch_no
+		FROM `tabPayment Entry` pe
+		WHERE pe.docstatus = 1
+			AND pe.posting_date = %(date)s
 
-			UNION ALL
+		UNION ALL
 
-			SELECT
-				COALESCE(si.customer, '') AS particulars,
-				'Sales Invoice' AS vch_type,
-				si.name AS vch_no
-			FROM `tabSales Invoice` si
-			WHERE si.docstatus = 1
-				AND si.posting_date = %(date)s
+		SELECT
+			COALESCE(MAX(NULLIF(jea.party, '')), '') AS particulars,
+			COALESCE(je.voucher_type, 'Journal Entry') AS vch_type,
+			je.name AS vch_no
+		FROM `tabJournal Entry` je
+		LEFT JOIN `tabJournal Entry Account` jea
+			ON jea.parent = je.name
+		WHERE je.docstatus = 1
+			AND je.posting_date = %(date)s
+		GROUP BY je.name
+
+		UNION ALL
 
-			UNION ALL
+		SELECT
+			COALESCE(si.customer, '') AS particulars,
+			'Sales Invoice' AS vch_type,
+			si.name AS vch_no
+		FROM `tabSales Invoice` si
+		WHERE si.docstatus = 1
+			AND si.posting_date = %(date)s
 
-			SELECT
-				COALESCE(pi.supplier, '') AS particulars,
-				'Purchase Invoice' AS vch_type,
-				pi.name AS vch_no
-			FROM `tabPurchase Invoice` pi
-			WHERE pi.docstatus = 1
-				AND pi.posting_date = %(date)s
-		) entries
-		WHERE {field_map[fieldname]} != ''
-			AND {field_map[fieldname]} LIKE %(txt)s
-		ORDER BY {field_map[fieldname]}
-		LIMIT 20
-	"""
+		UNION ALL
 
-	return [
-		{
-			"value": row.value,
-			"label": row.value,
-			"description": "",
-		}
-		for row in frappe.db.sql(query, filters, as_dict=True)
-	]
+		SELECT
+			COALESCE(pi.supplier, '') AS particulars,
+			'Purchase Invoice' AS vch_type,
+			pi.name AS vch_no
+		FROM `tabPurchase Invoice` pi
+		WHERE pi.docstatus = 1
+			AND pi.posting_date = %(date)s
+		""",
+		{"date": date},
+		as_dict=True,
+	)
+
+	return {
+		"party_name": sorted({row.particulars for row in entries if row.particulars}),
+		"vch_type": sorted({row.vch_type for row in entries if row.vch_type}),
+		"vch_no": sorted({row.vch_no for row in entries if row.vch_no}),
+	}
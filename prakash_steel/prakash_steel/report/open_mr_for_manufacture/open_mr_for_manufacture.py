@@ -7,6 +7,8 @@ from collections import defaultdict
 import frappe
 from frappe.utils import date_diff, flt, nowdate
 
+from prakash_steel.utils.open_demand import get_open_demand_lines, get_open_demand_map
+
 
 def execute(filters=None):
 	columns = get_columns()
@@ -296,26 +298,7 @@ def get_item_master_map(item_codes):
 
 
 def get_qualified_demand_map(item_codes):
-	if not item_codes:
-		return {}
-	today = nowdate()
-	result = frappe.db.sql(
-		"""
-		SELECT soi.item_code,
-		       SUM(GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0))) AS qd
-		FROM `tabSales Order Item` soi
-		INNER JOIN `tabSales Order` so ON so.name = soi.parent
-		WHERE so.docstatus = 1
-		  AND so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-		  AND IFNULL(soi.custom_closed, 0) = 0
-		  AND IFNULL(soi.delivery_date, '1900-01-01') <= %s
-		  AND soi.item_code IN %s
-		GROUP BY soi.item_code
-		""",
-		(today, item_codes),
-		as_dict=True,
-	)
-	return {r.item_code: flt(r.qd) for r in result}
+	return get_open_demand_map(item_codes, to_date=nowdate())
 
 
 # ---------------------------------------------------------------------------
@@ -325,38 +308,17 @@ def get_qualified_demand_map(item_codes):
 
 
 def get_open_so_map(item_codes):
-	if not item_codes:
-		return {}
-	result = frappe.db.sql(
-		"""
-		SELECT
-			soi.item_code,
-			so.transaction_date,
-			soi.delivery_date,
-			GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) AS pending_qty
-		FROM `tabSales Order Item` soi
-		INNER JOIN `tabSales Order` so ON so.name = soi.parent
-		WHERE so.docstatus = 1
-		  AND so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-		  AND IFNULL(soi.custom_closed, 0) = 0
-		  AND soi.item_code IN %s
-		  AND GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) > 0
-		ORDER BY soi.delivery_date ASC
-		""",
-		(item_codes,),
-		as_dict=True,
-	)
-
 	so_map = defaultdict(list)
-	for r in result:
-		so_map[r.item_code].append(
-			{
-				"pending_qty": flt(r.pending_qty),
-				"order_status": _compute_order_status(r.delivery_date, r.transaction_date),
-				"delivery_date": r.delivery_date,
-				"transaction_date": r.transaction_date,
-			}
-		)
+	for item_code, lines in get_open_demand_lines(item_codes).items():
+		for line in lines:
+			so_map[item_code].append(
+				{
+					"pending_qty": flt(line.open_qty),
+					"order_status": _compute_order_status(line.delivery_date, line.transaction_date),
+					"delivery_date": line.delivery_date,
+					"transaction_date": line.transaction_date,
+				}
+			)
 	return so_map
 
 
@@ -4,7 +4,10 @@ from collections import defaultdict
 import frappe
 from frappe import _
 from frappe.utils import date_diff, flt, nowdate
+from prakash_steel.utils.bom_cache import get_cached_bom
 from prakash_steel.utils.lead_time import get_default_bom
+from prakash_steel.utils.open_demand import get_open_demand_lines, get_open_demand_map
+from prakash_steel.utils.planning_context import get_or_load, in_planning_context, planning_cached
 
 
 def calculate_sku_type(buffer_flag, item_type):
@@ -479,7 +482,13 @@ def execute(filters=None):
 	return columns, data
 
 
-def save_daily_on_hand_colour():
+def save_daily_on_hand_colour(purchase_data=None, sell_data=None):
+	"""
+	Save today's on-hand colour of every buffer item (Item wise Daily On Hand Colour).
+
+	`purchase_data` / `sell_data` are report rows already computed for the purchase and
+	sell buffer views (the morning pipeline passes them); missing ones are computed here.
+	"""
 	from frappe.utils import nowdate
 
 	posting_date = nowdate()
@@ -487,60 +496,51 @@ def save_daily_on_hand_colour():
 	all_data = []
 	seen_item_codes = {}
 
-	try:
-		filters_purchase = {"purchase": 1, "buffer_flag": 1}
-		_, data_purchase = execute(filters_purchase)
-		if data_purchase:
-			for row in data_purchase:
-				item_code = row.get("item_code")
-				if item_code and item_code not in seen_item_codes:
-					seen_item_codes[item_code] = row
-	except Exception as e:
-		pass
+	for filters, data in (
+		({"purchase": 1, "buffer_flag": 1}, purchase_data),
+		({"sell": 1, "buffer_flag": 1}, sell_data),
+	):
+		try:
+			if data is None:
+				_, data = execute(filters)
+		except Exception:
+			frappe.log_error(frappe.get_traceback(), "Daily On Hand Colour Failed")
+			continue
 
-	try:
-		filters_sell = {"sell": 1, "buffer_flag": 1}
-		_, data_sell = execute(filters_sell)
-		if data_sell:
-			for row in data_sell:
-				item_code = row.get("item_code")
-				if item_code and item_code not in seen_item_codes:
-					seen_item_codes[item_code] = row
-	except Exception as e:
-		pass
+		for row in data or []:
+			item_code = row.get("item_code")
+			if item_code and item_code not in seen_item_codes:
+				seen_item_codes[item_code] = row
 
 	all_data = list(seen_item_codes.values())
 
 	if not all_data:
 		return
 
-	try:
-		doc = frappe.new_doc("Item wise Daily On Hand Colour")
-		doc.posting_date = posting_date
+	doc = frappe.new_doc("Item wise Daily On Hand Colour")
+	doc.posting_date = posting_date
 
-		saved_rows = 0
+	saved_rows = 0
 
-		for row in all_data:
-			item_code = row.get("item_code")
-			sku_type = row.get("sku_type")
-			on_hand_colour = row.get("on_hand_colour")
+	for row in all_data:
+		item_code = row.get("item_code")
+		sku_type = row.get("sku_type")
+		on_hand_colour = row.get("on_hand_colour")
 
-			if not item_code or not on_hand_colour:
-				continue
+		if not item_code or not on_hand_colour:
+			continue
 
-			child = doc.append("item_wise_on_hand_colour", {})
-			child.item_code = item_code
-			child.sku_type = sku_type
-			child.on_hand_colour = on_hand_colour
-			saved_rows += 1
+		child = doc.append("item_wise_on_hand_colour", {})
+		child.item_code = item_code
+		child.sku_type = sku_type
+		child.on_hand_colour = on_hand_colour
+		saved_rows += 1
 
-		if saved_rows == 0:
-			return
+	if saved_rows == 0:
+		return
 
-		doc.insert(ignore_permissions=True)
-		frappe.db.commit()
-	except Exception as e:
-		pass
+	doc.insert(ignore_permissions=True)
+	frappe.db.commit()
 
 
 def get_columns(filters=None):
@@ -1519,7 +1519,7 @@ def get_data(filters=None):
 
 		if bom:
 			try:
-				bom_doc = frappe.get_doc("BOM", bom)
+				bom_doc = get_cached_bom(bom)
 				bom_quantity = flt(bom_doc.quantity) or 1.0
 				# Get all child items from BOM
 				for bom_item in bom_doc.items:
@@ -2004,6 +2004,11 @@ def get_stock_map(item_codes):
 	else:
 		item_codes_tuple = tuple(item_codes)
 
+	# In the morning pipeline, every item's Bin stock is read once and shared by all views
+	if in_planning_context():
+		stock_map = get_or_load("bin_stock", _get_all_bin_stock)
+		return {item_code: stock_map[item_code] for item_code in item_codes_tuple if item_code in stock_map}
+
 	# Use current live stock from Bin
 	bin_rows = frappe.db.sql(
 		"""
@@ -2019,56 +2024,29 @@ def get_stock_map(item_codes):
 	return {d.item_code: flt(d.stock) for d in bin_rows}
 
 
-def get_sales_order_qty_map(filters):
-	so_rows = frappe.db.sql(
+def _get_all_bin_stock():
+	bin_rows = frappe.db.sql(
 		"""
-		SELECT
-			soi.item_code,
-			SUM(GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0))) as so_qty
-		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
-		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-			AND so.docstatus = 1
-			AND IFNULL(soi.custom_closed, 0) = 0
-		GROUP BY
-			soi.item_code
+		SELECT item_code, SUM(actual_qty) as stock
+		FROM `tabBin`
+		GROUP BY item_code
 		""",
 		as_dict=True,
 	)
 
-	return {d.item_code: flt(d.so_qty) for d in so_rows}
+	return {d.item_code: flt(d.stock) for d in bin_rows}
 
 
-def get_qualified_demand_map():
-	from frappe.utils import today
+@planning_cached("open_so_qty")
+def get_sales_order_qty_map(filters):
+	return get_open_demand_map()
 
-	today_date = today()
 
-	so_rows = frappe.db.sql(
-		"""
-		SELECT
-			soi.item_code,
-			SUM(GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0))) as so_qty
-		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
-		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-			AND so.docstatus = 1
-			AND IFNULL(soi.custom_closed, 0) = 0
-			AND IFNULL(soi.delivery_date, '1900-01-01') <= %s
-		GROUP BY
-			soi.item_code
-		""",
-		(today_date,),
-		as_dict=True,
-	)
+@planning_cached("qualified_demand")
+def get_qualified_demand_map():
+	from frappe.utils import today
 
-	till_today_map = {d.item_code: flt(d.so_qty) for d in so_rows}
+	till_today_map = get_open_demand_map(to_date=today())
 	spike_map = {item_code: 0.0 for item_code in till_today_map}
 
 	return till_today_map, spike_map
@@ -2286,6 +2264,7 @@ def get_qualified_demand_for_item(
 		return qualified_demand, till_today, spike
 
 
+@planning_cached("wip")
 def get_wip_map():
 	# Get Production Plan Settings
 	try:
@@ -2389,6 +2368,7 @@ def get_wip_map():
 	return wip_map
 
 
+@planning_cached("mrq")
 def get_mrq_map():
 	mrq_rows = frappe.db.sql(
 		"""
@@ -2411,6 +2391,7 @@ def get_mrq_map():
 	return {d.item_code: flt(d.mrq_qty) for d in mrq_rows}
 
 
+@planning_cached("open_po")
 def get_open_po_map():
 	# Get all Purchase Order Items with their qty and received_qty
 	po_rows = frappe.db.sql(
@@ -2453,39 +2434,15 @@ def get_open_so_map_for_priority(item_codes):
 	Returns {item_code: [{pending_qty, order_status}, ...]}
 	All open SOs (Total SO), sorted by delivery_date ASC — used for FIFO priority calculation.
 	"""
-	if not item_codes:
-		return {}
-	if len(item_codes) == 1:
-		items_tuple = (next(iter(item_codes)),)
-	else:
-		items_tuple = tuple(item_codes)
-	result = frappe.db.sql(
-		"""
-		SELECT
-			soi.item_code,
-			so.transaction_date,
-			soi.delivery_date,
-			GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) AS pending_qty
-		FROM `tabSales Order Item` soi
-		INNER JOIN `tabSales Order` so ON so.name = soi.parent
-		WHERE so.docstatus = 1
-		  AND so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-		  AND IFNULL(soi.custom_closed, 0) = 0
-		  AND soi.item_code IN %s
-		  AND GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) > 0
-		ORDER BY soi.delivery_date ASC
-		""",
-		(items_tuple,),
-		as_dict=True,
-	)
 	so_map = defaultdict(list)
-	for r in result:
-		so_map[r.item_code].append(
-			{
-				"pending_qty": flt(r.pending_qty),
-				"order_status": _compute_order_status(r.delivery_date, r.transaction_date),
-			}
-		)
+	for item_code, lines in get_open_demand_lines(item_codes).items():
+		for line in lines:
+			so_map[item_code].append(
+				{
+					"pending_qty": flt(line.open_qty),
+					"order_status": _compute_order_status(line.delivery_date, line.transaction_date),
+				}
+			)
 	return so_map
 
 
@@ -2528,27 +2485,13 @@ def get_priority_breakdown(item_code):
 		level_formula = f"Stock ({stock}) + WIP ({wip})"
 
 	# Open SOs with full FIFO detail (including delivery_date)
-	so_rows = frappe.db.sql(
-		"""
-		SELECT so.transaction_date, soi.delivery_date,
-		       GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) AS pending_qty
-		FROM `tabSales Order Item` soi
-		INNER JOIN `tabSales Order` so ON so.name = soi.parent
-		WHERE so.docstatus = 1
-		  AND so.status NOT IN ('Stopped','On Hold','Closed','Cancelled','Completed')
-		  AND IFNULL(soi.custom_closed, 0) = 0
-		  AND soi.item_code = %s
-		  AND GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) > 0
-		ORDER BY soi.delivery_date ASC
-		""",
-		(item_code,), as_dict=True,
-	)
+	so_rows = get_open_demand_lines([item_code]).get(item_code, [])
 
 	available = flt(level)
 	worst_priority = 0
 	fifo_detail = []
 	for so in so_rows:
-		required = flt(so.pending_qty)
+		required = flt(so.open_qty)
 		allocated = min(required, available)
 		shortage = required - allocated
 		available -= allocated
@@ -2675,7 +2618,7 @@ def traverse_bom_for_parent_demand_simple(
 		return
 
 	try:
-		bom_doc = frappe.get_doc("BOM", bom)
+		bom_doc = get_cached_bom(bom)
 		bom_quantity = flt(bom_doc.quantity)
 		if bom_quantity <= 0:
 			bom_quantity = 1.0
@@ -2751,7 +2694,7 @@ def traverse_bom_for_parent_demand(
 		return
 
 	try:
-		bom_doc = frappe.get_doc("BOM", bom)
+		bom_doc = get_cached_bom(bom)
 		bom_quantity = flt(bom_doc.quantity)  # Quantity of parent item produced by this BOM
 		if bom_quantity <= 0:
 			bom_quantity = 1.0  # Default to 1 if BOM quantity is 0 or negative
@@ -2894,7 +2837,7 @@ def traverse_bom_for_po(
 		return
 
 	try:
-		bom_doc = frappe.get_doc("BOM", bom)
+		bom_doc = get_cached_bom(bom)
 
 		# Process each child item in BOM
 		for bom_item in bom_doc.items:
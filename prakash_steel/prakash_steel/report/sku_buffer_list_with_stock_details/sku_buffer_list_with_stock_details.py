@@ -5,6 +5,8 @@ import frappe
 from frappe import _
 from frappe.utils import flt, today
 
+from prakash_steel.utils.open_demand import get_open_demand_map
+
 
 def calculate_sku_type(buffer_flag, item_type):
 	"""Calculate SKU type based on buffer flag and item type"""
@@ -29,29 +31,7 @@ def calculate_sku_type(buffer_flag, item_type):
 
 def get_qualified_demand_map(filters):
 	"""Get qualified demand map for all items"""
-	today_date = today()
-
-	so_rows = frappe.db.sql(
-		"""
-		SELECT
-			soi.item_code,
-			SUM(soi.qty - IFNULL(soi.delivered_qty, 0)) as so_qty
-		FROM
-			`tabSales Order` so
-		INNER JOIN
-			`tabSales Order Item` soi ON soi.parent = so.name
-		WHERE
-			so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
-			AND so.docstatus = 1
-			AND IFNULL(soi.delivery_date, '1900-01-01') <= %s
-		GROUP BY
-			soi.item_code
-		""",
-		(today_date,),
-		as_dict=True,
-	)
-
-	return {d.item_code: flt(d.so_qty) for d in so_rows}
+	return get_open_demand_map(to_date=today())
 
 
 def execute(filters=None):
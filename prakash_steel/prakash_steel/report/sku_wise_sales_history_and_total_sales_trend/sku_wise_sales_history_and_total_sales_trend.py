@@ -2,7 +2,7 @@
 # For license information, please see license.txt
 
 import frappe
-from frappe.utils import getdate, add_days
+from frappe.utils import getdate, add_days, get_first_day, get_last_day
 from datetime import datetime, timedelta
 from collections import defaultdict
 
@@ -149,46 +149,29 @@ def get_allowed_customers_for_user():
 		return None
 
 
+# Same buckets as get_week_key: week 1 runs from Jan 1 to the first Sunday, later weeks
+# Monday to Sunday, capped at 52
+WEEK_KEY_SQL = """CONCAT('week_', YEAR(si.posting_date), '_', LPAD(LEAST(
+	1 + (DAYOFYEAR(si.posting_date) - 1 + WEEKDAY(MAKEDATE(YEAR(si.posting_date), 1))) DIV 7, 52), 2, '0'))"""
+MONTH_KEY_SQL = "DATE_FORMAT(si.posting_date, 'month_%%Y_%%m')"
+
+
 def get_data(from_date, to_date, calculation_mode, allowed_customers=None):
-	"""Get sales invoice data grouped by item and period"""
-	
-	# Build query with customer filter if user has restrictions
-	query = """
-		SELECT
-			sii.item_code,
-			i.custom_item_type as item_type,
-			si.posting_date,
-			sii.qty
-		FROM
-			`tabSales Invoice` si
-		INNER JOIN
-			`tabSales Invoice Item` sii ON sii.parent = si.name
-		LEFT JOIN
-			`tabItem` i ON i.name = sii.item_code
-		WHERE
-			si.docstatus = 1
-			AND si.posting_date BETWEEN %(from_date)s AND %(to_date)s
-	"""
-	
-	# Add customer filter if user has restrictions
+	"""Get sales invoice qty grouped by item and period (summed in SQL)"""
 	query_params = {
 		"from_date": from_date,
 		"to_date": to_date
 	}
 	
+	# Add customer filter if user has restrictions
 	if allowed_customers is not None:
 		if len(allowed_customers) > 0:
-			query += " AND si.customer IN %(allowed_customers)s"
 			query_params["allowed_customers"] = allowed_customers
 		else:
 			# User has no associated customers, return empty result
 			return []
 	
-	query += " ORDER BY sii.item_code, si.posting_date"
-	
-	sales_data = frappe.db.sql(query, query_params, as_dict=True)
-	
-	# Get period keys based on calculation mode
+	# Get period keys and per-(item, period) totals based on calculation mode
 	if calculation_mode == "Monthly":
 		# Generate period keys for all months in range
 		period_keys = []
@@ -204,51 +187,26 @@ def get_data(from_date, to_date, calculation_mode, allowed_customers=None):
 				current_date = datetime(year + 1, 1, 1)
 			else:
 				current_date = datetime(year, month + 1, 1)
+		
+		sales_data = get_monthly_sales(from_date, to_date, query_params)
 	else:  # Weekly
 		# Get period keys for all weeks in range
 		week_info = get_weeks_in_range(from_date, to_date)
 		period_keys = [fieldname for _, fieldname in week_info]
+		
+		sales_data = get_invoice_sales(WEEK_KEY_SQL, query_params)
 	
 	# Group data by item and period
-	item_period_data = defaultdict(lambda: defaultdict(float))
-	all_items = set()
+	item_period_data = defaultdict(dict)
+	item_types = {}
 	
 	for row in sales_data:
-		item_code = row.get("item_code")
-		if not item_code:
-			continue
-			
-		all_items.add(item_code)
-		posting_date = getdate(row.get("posting_date"))
-		qty = row.get("qty") or 0
-		
-		if calculation_mode == "Monthly":
-			# Group by month and year - aggregate all quantities in that month
-			year = posting_date.year
-			month = posting_date.month
-			period_key = f"month_{year}_{month:02d}"
-			item_period_data[item_code][period_key] += qty
-		else:  # Weekly
-			# Group by week (Monday to Sunday)
-			period_key = get_week_key(posting_date)
-			if period_key:
-				item_period_data[item_code][period_key] += qty
-	
-	# Get item types for all items
-	item_types = {}
-	if all_items:
-		items_data = frappe.db.sql("""
-			SELECT name, custom_item_type
-			FROM `tabItem`
-			WHERE name IN %(items)s
-		""", {"items": list(all_items)}, as_dict=True)
-		
-		for item in items_data:
-			item_types[item.name] = item.get("custom_item_type") or ""
+		item_period_data[row.item_code][row.period_key] = row.qty or 0
+		item_types[row.item_code] = row.item_type or ""
 	
 	# Build result data
 	result = []
-	for item_code in sorted(all_items):
+	for item_code in sorted(item_period_data):
 		row_data = {
 			"item_code": item_code,
 			"item_type": item_types.get(item_code, ""),
@@ -264,6 +222,92 @@ def get_data(from_date, to_date, calculation_mode, allowed_customers=None):
 	return result
 
 
+def get_monthly_sales(from_date, to_date, query_params):
+	"""
+	Monthly totals per item: whole months come from the Item Customer Monthly Sales
+	rollup, the partial months at either end of the range from the invoices.
+	"""
+	full_from = from_date if from_date.day == 1 else add_days(get_last_day(from_date), 1)
+	full_to = to_date if to_date == get_last_day(to_date) else add_days(get_first_day(to_date), -1)
+	
+	if full_from > full_to:
+		return get_invoice_sales(MONTH_KEY_SQL, query_params)
+	
+	params = dict(query_params, full_from=full_from, full_to=full_to)
+	customer_condition = ""
+	if "allowed_customers" in params:
+		customer_condition = "AND ms.customer IN %(allowed_customers)s"
+	
+	rollup_query = f"""
+		SELECT
+			ms.item_code,
+			CONCAT('month_', DATE_FORMAT(ms.month_start, '%%Y_%%m')) AS period_key,
+			ms.qty
+		FROM `tabItem Customer Monthly Sales` ms
+		WHERE ms.month_start BETWEEN %(full_from)s AND %(full_to)s
+			{customer_condition}
+	"""
+	edge_query = get_invoice_lines_query(
+		MONTH_KEY_SQL,
+		params,
+		"AND (si.posting_date < %(full_from)s OR si.posting_date > %(full_to)s)",
+	)
+	
+	return frappe.db.sql(f"""
+		SELECT
+			sales.item_code,
+			i.custom_item_type AS item_type,
+			sales.period_key,
+			SUM(sales.qty) AS qty
+		FROM (
+			{rollup_query}
+			UNION ALL
+			{edge_query}
+		) sales
+		LEFT JOIN `tabItem` i ON i.name = sales.item_code
+		GROUP BY sales.item_code, i.custom_item_type, sales.period_key
+	""", params, as_dict=True)
+
+
+def get_invoice_sales(period_key_sql, query_params):
+	"""Totals per item and period summed straight from the submitted invoice lines"""
+	return frappe.db.sql(f"""
+		SELECT
+			sales.item_code,
+			i.custom_item_type AS item_type,
+			sales.period_key,
+			SUM(sales.qty) AS qty
+		FROM (
+			{get_invoice_lines_query(period_key_sql, query_params)}
+		) sales
+		LEFT JOIN `tabItem` i ON i.name = sales.item_code
+		GROUP BY sales.item_code, i.custom_item_type, sales.period_key
+	""", query_params, as_dict=True)
+
+
+def get_invoice_lines_query(period_key_sql, query_params, extra_condition=""):
+	customer_condition = ""
+	if "allowed_customers" in query_params:
+		customer_condition = "AND si.customer IN %(allowed_customers)s"
+	
+	return f"""
+		SELECT
+			sii.item_code,
+			{period_key_sql} AS period_key,
+			sii.qty
+		FROM
+			`tabSales Invoice` si
+		INNER JOIN
+			`tabSales Invoice Item` sii ON sii.parent = si.name
+		WHERE
+			si.docstatus = 1
+			AND si.posting_date BETWEEN %(from_date)s AND %(to_date)s
+			AND IFNULL(sii.item_code, '') != ''
+			{customer_condition}
+			{extra_condition}
+	"""
+
+
 def get_week_number(date):
 	"""
 	Get week number for a date within its year (Monday to Sunday weeks)
@@ -96,43 +96,6 @@ def get_data(from_date, to_date, sku_type, item_code_filter=None):
 		date_list.append(current_date)
 		current_date = add_days(current_date, 1)
 	
-	# Query Item wise Daily On Hand Colour for the date range
-	parent_docs = frappe.db.sql("""
-		SELECT name, posting_date
-		FROM `tabItem wise Daily On Hand Colour`
-		WHERE posting_date BETWEEN %s AND %s
-		ORDER BY posting_date
-	""", (from_date, to_date), as_dict=True)
-	
-	# Build a map: {date: {item_code: on_hand_colour}}
-	date_item_colour_map = {}
-	for date in date_list:
-		date_item_colour_map[date] = {}
-	
-	# Process each parent document
-	for parent_doc in parent_docs:
-		posting_date = getdate(parent_doc.posting_date)
-		
-		# Get child table data for this parent
-		child_data = frappe.db.sql("""
-			SELECT item_code, on_hand_colour
-			FROM `tabOn hand colour table`
-			WHERE parent = %s AND sku_type = %s
-		""", (parent_doc.name, sku_type), as_dict=True)
-		
-		# Store the on_hand_colour for each item on this date
-		if posting_date in date_item_colour_map:
-			for child in child_data:
-				item_code = child.item_code
-				on_hand_colour = child.on_hand_colour
-				if item_code:
-					date_item_colour_map[posting_date][item_code] = on_hand_colour or ""
-	
-	# Get all unique items across all dates for the selected SKU type
-	all_items = set()
-	for date in date_list:
-		all_items.update(date_item_colour_map[date].keys())
-	
 	# Process item_code filter - convert to list if it's a string or list
 	filtered_item_codes = None
 	if item_code_filter:
@@ -142,53 +105,56 @@ def get_data(from_date, to_date, sku_type, item_code_filter=None):
 		elif isinstance(item_code_filter, list):
 			filtered_item_codes = [item for item in item_code_filter if item]
 	
-	# Get current buffer status and item type for all items
-	# Only include items that are currently buffer items with the selected SKU type
-	valid_items = set()
-	if all_items:
-		items_data = frappe.db.sql("""
-			SELECT name, item_name, custom_buffer_flag, custom_item_type
-			FROM `tabItem`
-			WHERE name IN ({})
-		""".format(','.join(['%s'] * len(all_items))), tuple(all_items), as_dict=True)
-		
-		for item in items_data:
-			buffer_flag = item.get("custom_buffer_flag") or "Non-Buffer"
-			item_type = item.get("custom_item_type")
-			current_sku_type = calculate_sku_type(buffer_flag, item_type)
-			
-			# Only include items that currently have the selected SKU type
-			if current_sku_type == sku_type:
-				# Apply item_code filter if provided
-				if filtered_item_codes is None or item.name in filtered_item_codes:
-					valid_items.add(item.name)
-	
-	# Get item names for valid items only
-	item_names = {}
-	if valid_items:
-		items_data = frappe.db.sql("""
-			SELECT name, item_name
-			FROM `tabItem`
-			WHERE name IN ({})
-		""".format(','.join(['%s'] * len(valid_items))), tuple(valid_items), as_dict=True)
-		
-		for item in items_data:
-			item_names[item.name] = item.item_name or item.name
-	
-	# Build report data rows - only for items that are currently buffer items
+	item_condition = ""
+	values = {"sku_type": sku_type, "from_date": from_date, "to_date": to_date}
+	if filtered_item_codes is not None:
+		if not filtered_item_codes:
+			return []
+		item_condition = "AND child.item_code IN %(item_codes)s"
+		values["item_codes"] = tuple(filtered_item_codes)
+	
+	# One join over the whole range (uses the (sku_type, item_code) index on the child table),
+	# ordered so each item's dates arrive together
+	colour_rows = frappe.db.sql(f"""
+		SELECT
+			child.item_code,
+			parent.posting_date,
+			child.on_hand_colour,
+			item.custom_buffer_flag,
+			item.custom_item_type
+		FROM `tabOn hand colour table` child
+		INNER JOIN `tabItem wise Daily On Hand Colour` parent ON parent.name = child.parent
+		INNER JOIN `tabItem` item ON item.name = child.item_code
+		WHERE child.sku_type = %(sku_type)s
+			AND parent.posting_date BETWEEN %(from_date)s AND %(to_date)s
+			{item_condition}
+		ORDER BY child.item_code, parent.posting_date, parent.name
+	""", values, as_dict=True)
+	
+	# Build report data rows in a single pass - only for items that currently have the
+	# selected SKU type (buffer flag / item type on the Item master)
 	data = []
-	for item_code in sorted(valid_items):
-		row = {
-			"item_name": item_code,  # Use item_code for Link field
-			"item_code": item_code   # Store item_code for reference
-		}
+	row = None
+	for colour_row in colour_rows:
+		item_code = colour_row.item_code
+		if not row or row["item_code"] != item_code:
+			buffer_flag = colour_row.custom_buffer_flag or "Non-Buffer"
+			if calculate_sku_type(buffer_flag, colour_row.custom_item_type) != sku_type:
+				row = {"item_code": item_code, "skip": True}
+				continue
+			
+			row = {
+				"item_name": item_code,  # Use item_code for Link field
+				"item_code": item_code   # Store item_code for reference
+			}
+			for date in date_list:
+				row[f"date_{date.strftime('%Y_%m_%d')}"] = ""
+			data.append(row)
 		
-		# Add on_hand_colour for each date
-		for date in date_list:
-			fieldname = f"date_{date.strftime('%Y_%m_%d')}"
-			on_hand_colour = date_item_colour_map[date].get(item_code, "")
-			row[fieldname] = on_hand_colour
+		if row.get("skip"):
+			continue
 		
-		data.append(row)
+		fieldname = f"date_{getdate(colour_row.posting_date).strftime('%Y_%m_%d')}"
+		row[fieldname] = colour_row.on_hand_colour or ""
 	
 	return data
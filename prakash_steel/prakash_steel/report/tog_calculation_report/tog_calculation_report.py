@@ -5,6 +5,7 @@ import frappe
 from frappe import _
 from frappe.utils import cint, flt, today, add_days
 
+from prakash_steel.utils.bom_cache import get_cached_bom
 from prakash_steel.utils.lead_time import get_default_bom
 
 
@@ -423,7 +424,7 @@ def _compute_parent_sell_from_lines(
 
 	def _get_bom_doc(bom_name: str):
 		if bom_name not in bom_doc_cache:
-			bom_doc_cache[bom_name] = frappe.get_doc("BOM", bom_name)
+			bom_doc_cache[bom_name] = get_cached_bom(bom_name)
 		return bom_doc_cache[bom_name]
 
 	def _propagate(
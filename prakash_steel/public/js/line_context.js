@@ -0,0 +1,43 @@
+// Line context (last rate, last purchase / production, stock) for item rows, from
+// prakash_steel.api.get_line_context.get_line_context
+// Shared by the Sales Order and Material Request forms through app_include_js
+
+frappe.provide("prakash_steel.line_context");
+
+// Rows whose item changed are fetched together: adding or pasting many rows fires
+// item_code once per row, and the short delay folds those into one call
+//
+// opts.child_doctype: item table doctype, e.g. "Sales Order Item"
+// opts.get_args(frm): extra arguments for get_line_context (optional)
+// opts.apply(frm, row, line): sets the row fields from that item's context
+prakash_steel.line_context.queue = function (frm, cdn, opts) {
+    frm.__line_context_rows = frm.__line_context_rows || new Set();
+    frm.__line_context_rows.add(cdn);
+
+    clearTimeout(frm.__line_context_timer);
+    frm.__line_context_timer = setTimeout(() => prakash_steel.line_context.fetch(frm, opts), 50);
+};
+
+prakash_steel.line_context.fetch = function (frm, opts) {
+    const rows = Array.from(frm.__line_context_rows || [])
+        .map(cdn => locals[opts.child_doctype][cdn])
+        .filter(row => row && row.item_code);
+    frm.__line_context_rows = new Set();
+    if (!rows.length) return;
+
+    frappe.call({
+        method: "prakash_steel.api.get_line_context.get_line_context",
+        args: Object.assign(
+            { item_codes: rows.map(row => row.item_code) },
+            opts.get_args ? opts.get_args(frm) : {}
+        ),
+        callback: function (r) {
+            const context = r.message || {};
+            rows.forEach(row => opts.apply(frm, row, context[row.item_code] || {}));
+            frm.refresh_field("items");
+        },
+        error: function (err) {
+            console.error("Error fetching line context from server:", err);
+        }
+    });
+};
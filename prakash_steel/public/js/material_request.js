@@ -63,23 +63,21 @@
 
 
 
-function set_last_rate_for_row(frm, cdt, cdn, item_code) {
-    if (!item_code) {
-        frappe.model.set_value(cdt, cdn, "custom_last_rate", 0);
-        return;
+const MR_LINE_CONTEXT = {
+    child_doctype: "Material Request Item",
+    get_args: frm => ({ company: frm.doc.company || "" }),
+    apply: function (frm, row, line) {
+        const last = line.last_purchase_or_production || {};
+        // Company-wise latest purchase invoice rate
+        frappe.model.set_value(row.doctype, row.name, "custom_last_rate", line.last_purchase_rate || 0);
+        // Latest purchase or production date & quantity
+        frappe.model.set_value(row.doctype, row.name, "custom_last_purchase_or_production", last.date || null);
+        frappe.model.set_value(row.doctype, row.name, "custom_purchase_or_production_quantity_in_kg", last.qty || 0);
+        // TOTAL STOCK across all warehouses, also shown in custom_item_size
+        frappe.model.set_value(row.doctype, row.name, "custom_quantity_available_in_kg", line.available_stock || 0);
+        frappe.model.set_value(row.doctype, row.name, "custom_item_size", line.available_stock || 0);
     }
-
-    frappe.call({
-        method: "prakash_steel.api.get_last_purchase_invoice_rate.get_last_purchase_invoice_rate",
-        args: {
-            item_code: item_code,
-            company: frm.doc.company || ""
-        },
-        callback: function (r) {
-            frappe.model.set_value(cdt, cdn, "custom_last_rate", r.message || 0);
-        }
-    });
-}
+};
 
 frappe.ui.form.on("Material Request", {
     refresh: function (frm) {
@@ -100,10 +98,9 @@ frappe.ui.form.on("Material Request", {
         // Recompute last rate for all existing rows when company changes.
         (frm.doc.items || []).forEach(function (row) {
             if (row.item_code) {
-                set_last_rate_for_row(frm, row.doctype, row.name, row.item_code);
+                prakash_steel.line_context.queue(frm, row.name, MR_LINE_CONTEXT);
             }
         });
-        frm.refresh_field("items");
     },
 
     before_cancel: function (frm) {
@@ -225,64 +222,7 @@ frappe.ui.form.on("Material Request Item", {
             return;
         }
 
-        // Fetch company-wise latest purchase invoice rate.
-        set_last_rate_for_row(frm, cdt, cdn, row.item_code);
-
-        // Fetch latest purchase or production date & quantity for this item
-        frappe.call({
-            method: "prakash_steel.api.get_last_purchase_or_production.get_last_purchase_or_production",
-            args: {
-                item_code: row.item_code
-            },
-            callback: function (r) {
-                const data = r.message || {};
-                // Date field on child row
-                frappe.model.set_value(
-                    cdt,
-                    cdn,
-                    "custom_last_purchase_or_production",
-                    data.date || null
-                );
-                // Quantity field on child row
-                frappe.model.set_value(
-                    cdt,
-                    cdn,
-                    "custom_purchase_or_production_quantity_in_kg",
-                    data.qty || 0
-                );
-            },
-            error: function () {
-                frappe.model.set_value(cdt, cdn, "custom_last_purchase_or_production", null);
-                frappe.model.set_value(cdt, cdn, "custom_purchase_or_production_quantity_in_kg", 0);
-            },
-        });
-
-        console.log("Calling Server Script API: get_available_stock");
-        frappe.call({
-            method: "prakash_steel.api.get_available_stock.get_available_stock",
-            args: {
-                item_code: row.item_code
-            },
-            callback: function (res) {
-                console.log("Server response for stock:", res); // Corrected typo
-                if (res.message !== undefined) {
-                    console.log("Available stock received:", res.message);
-                    frappe.model.set_value(cdt, cdn, 'custom_quantity_available_in_kg', res.message);
-                    // Populate TOTAL STOCK across all warehouses into custom_item_size
-                    frappe.model.set_value(cdt, cdn, 'custom_item_size', res.message);
-                } else {
-                    console.log("No stock returned from server. Setting 0");
-                    frappe.model.set_value(cdt, cdn, 'custom_quantity_available_in_kg', 0);
-                    frappe.model.set_value(cdt, cdn, 'custom_item_size', 0);
-                }
-                frm.refresh_field("items");
-            },
-            error: function (err) {
-                console.error("Error fetching stock from server:", err);
-                frappe.model.set_value(cdt, cdn, 'custom_quantity_available_in_kg', 0);
-                frappe.model.set_value(cdt, cdn, 'custom_item_size', 0);
-                frm.refresh_field("items");
-            }
-        });
+        // Rate, last purchase/production and stock come in one call for all changed rows
+        prakash_steel.line_context.queue(frm, cdn, MR_LINE_CONTEXT);
     }
 });
\ No newline at end of file
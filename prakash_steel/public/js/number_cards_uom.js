@@ -2,49 +2,29 @@
 // UOM is configured via "Number Card UOM Setting" DocType
 
 (function () {
-    // Cache for UOM settings (keyed by Number Card name)
+    // UOM settings keyed by Number Card name, delivered in frappe.boot (see
+    // prakash_steel.api.number_card_uom.boot_session) and pushed again when they change
     let uom_settings = {};
-    let settings_loaded = false;
-
-    // Fetch UOM settings from server
-    function load_uom_settings(callback) {
-        if (settings_loaded) {
-            callback && callback();
-            return;
-        }
-
-        frappe.call({
-            method: "prakash_steel.api.number_card_uom.get_all_uom_settings",
-            async: true,
-            callback: function (r) {
-                uom_settings = r.message || {};
-                settings_loaded = true;
-                console.log("UOM Settings loaded:", uom_settings);
-                callback && callback();
-            }
-        });
+    let uom_version = null;
+    let pending_frame = null;
+
+    function set_uom_settings(payload) {
+        if (!payload || payload.version === uom_version) return;
+        uom_settings = payload.settings || {};
+        uom_version = payload.version;
+        schedule_apply();
     }
 
     function append_uom_to_number_cards() {
-        if (!settings_loaded) return;
+        pending_frame = null;
 
         $(".number-widget-box").each(function () {
             const $widget = $(this);
             const widget_name = $widget.attr("data-widget-name");
             const widget_label = $widget.find(".ellipsis").first().text().trim();
 
-            // Skip if already processed
-            if ($widget.attr("data-uom-done") === "true") return;
-
             // Try to find UOM by widget name first, then by label
-            let uom = uom_settings[widget_name] || uom_settings[widget_label];
-
-            // Debug logging
-            if (!$widget.attr("data-uom-logged")) {
-                console.log("Widget:", widget_name, "| Label:", widget_label, "| UOM found:", uom);
-                $widget.attr("data-uom-logged", "true");
-            }
-
+            const uom = uom_settings[widget_name] || uom_settings[widget_label];
             if (!uom) return;
 
             // Find the value element
@@ -54,39 +34,42 @@
             // Skip if value not loaded yet
             if (!$value.length || !current_text) return;
 
-            // Append UOM if not already there
+            // Append UOM if not already there (a card refresh rewrites the value)
             if (!current_text.endsWith(uom)) {
                 $value.text(current_text + " " + uom);
-                $widget.attr("data-uom-done", "true");
-                console.log("✅ Applied UOM:", current_text, "->", current_text + " " + uom);
             }
         });
     }
 
-    // Polling function - keeps checking for new cards
-    function startPolling() {
-        setInterval(function () {
-            if (settings_loaded) {
-                append_uom_to_number_cards();
-            }
-        }, 1000);
+    // Coalesce bursts of DOM mutations into one pass per animation frame
+    function schedule_apply() {
+        if (pending_frame || $.isEmptyObject(uom_settings)) return;
+        pending_frame = window.requestAnimationFrame(append_uom_to_number_cards);
     }
 
-    // Start when DOM is ready
-    $(document).ready(function () {
-        // Load settings then start polling
-        load_uom_settings(function () {
-            append_uom_to_number_cards();
-            startPolling();
-        });
+    function touches_number_card(mutation) {
+        const target = mutation.target.nodeType === Node.ELEMENT_NODE
+            ? mutation.target
+            : mutation.target.parentElement;
+        if (target && target.closest(".number-widget-box")) return true;
 
-        // Reload settings and reset on page change
-        $(document).on("page-change", function () {
-            $(".number-widget-box").removeAttr("data-uom-done").removeAttr("data-uom-logged");
-            settings_loaded = false;
-            load_uom_settings();
-        });
+        return Array.from(mutation.addedNodes).some(node =>
+            node.nodeType === Node.ELEMENT_NODE
+            && (node.matches(".number-widget-box") || node.querySelector(".number-widget-box"))
+        );
+    }
+
+    $(document).on("app_ready", function () {
+        set_uom_settings(frappe.boot.number_card_uom);
+
+        // Cards render (and re-render their value) asynchronously; react to that instead of polling
+        new MutationObserver(function (mutations) {
+            if (mutations.some(touches_number_card)) {
+                schedule_apply();
+            }
+        }).observe(document.body, { childList: true, subtree: true, characterData: true });
 
-        console.log("Number Card UOM override loaded!");
+        // Settings edited while this desk is open
+        frappe.realtime.on("number_card_uom_updated", set_uom_settings);
     });
-})();
\ No newline at end of file
+})();
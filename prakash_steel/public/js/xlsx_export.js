@@ -0,0 +1,16 @@
+// Download link for background XLSX exports (prakash_steel/utils/xlsx_export.py)
+// Registered once for the desk so every dashboard that queues an export gets it
+
+$(document).on("app_ready", function () {
+    frappe.realtime.on("xlsx_export_ready", function (data) {
+        if (data.error) {
+            frappe.msgprint({ title: data.file_name, indicator: "red", message: data.error });
+            return;
+        }
+        frappe.msgprint({
+            title: __("Export Ready"),
+            indicator: "green",
+            message: `<a href="${encodeURI(data.file_url)}" target="_blank">${frappe.utils.escape_html(data.file_name)}</a>`,
+        });
+    });
+});
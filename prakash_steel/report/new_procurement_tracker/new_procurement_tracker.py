@@ -81,80 +81,58 @@ def get_columns():
 
 
 def get_data(filters):
+	# The MR -> PO -> PR -> PI line chain is kept in Procurement Chain Entry; statuses and
+	# the PO grand total change without document events, so they come from the headers
 	conditions = """
-        mr.docstatus = 1
-        AND mr.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+        pce.indent_date BETWEEN %(from_date)s AND %(to_date)s
     """
 
 	if filters.get("item_code"):
-		conditions += " AND mri.item_code = %(item_code)s"
+		conditions += " AND pce.item_code = %(item_code)s"
 
 	query = f"""
         SELECT
-            mr.name AS material_request,
-            mr.transaction_date AS indent_date,
+            pce.material_request,
+            pce.indent_date,
             mr.status AS mr_status,
 
-            mri.item_code,
-            mri.item_name,
-            mri.qty AS requested_qty,
-            mri.uom,
+            pce.item_code,
+            pce.item_name,
+            pce.requested_qty,
+            pce.uom,
 
-            po.name AS purchase_order,
+            pce.purchase_order,
             po.workflow_state AS po_status,
             po.status AS po_doc_status,
-            poi.qty AS ordered_qty,
-            poi.uom AS po_uom,
-            poi.rate AS po_rate,
-            poi.discount_amount AS discount,
-            poi.amount AS item_amount,
-            po.supplier,
-            po.transaction_date AS po_date,
-            po.schedule_date AS required_by,
+            pce.ordered_qty,
+            pce.po_uom,
+            pce.po_rate,
+            pce.discount,
+            pce.item_amount,
+            pce.supplier,
+            pce.po_date,
+            pce.required_by,
             po.grand_total AS po_grand_total,
 
-            pr.name AS purchase_receipt,
-            pri.qty AS received_qty,
-            pr.posting_date AS receipt_date,
-            pr.grand_total AS pr_grand_total,
+            pce.purchase_receipt,
+            pce.received_qty,
+            pce.receipt_date,
+            pce.pr_grand_total,
 
-            pi.name AS purchase_invoice,
-            pii.qty AS invoiced_qty,
-            pi.posting_date AS invoice_date
+            pce.purchase_invoice,
+            pce.invoiced_qty,
+            pce.invoice_date
 
         FROM
-            `tabMaterial Request` mr
+            `tabProcurement Chain Entry` pce
+        INNER JOIN
+            `tabMaterial Request` mr ON mr.name = pce.material_request
         LEFT JOIN
-            `tabMaterial Request Item` mri ON mri.parent = mr.name
-        LEFT JOIN
-            `tabPurchase Order Item` poi 
-                ON poi.material_request_item = mri.name
-                AND EXISTS (
-                    SELECT 1 
-                    FROM `tabPurchase Order` po_sub 
-                    WHERE po_sub.name = poi.parent 
-                    AND po_sub.docstatus = 1 
-                    AND po_sub.workflow_state != 'Cancelled'
-                )
-        LEFT JOIN
-            `tabPurchase Order` po 
-                ON po.name = poi.parent 
-                AND po.docstatus = 1 
-                AND po.workflow_state != 'Cancelled'
-        LEFT JOIN
-            `tabPurchase Receipt Item` pri ON pri.purchase_order_item = poi.name
-        LEFT JOIN
-            `tabPurchase Receipt` pr ON pr.name = pri.parent AND pr.docstatus = 1
-        LEFT JOIN
-            `tabPurchase Invoice Item` pii ON pii.purchase_receipt = pr.name
-                AND pii.item_code = pri.item_code
-                AND pii.docstatus = 1
-        LEFT JOIN
-            `tabPurchase Invoice` pi ON pi.name = pii.parent AND pi.docstatus = 1
+            `tabPurchase Order` po ON po.name = pce.purchase_order
 
         WHERE {conditions}
 
-        ORDER BY mr.name, mri.item_code
+        ORDER BY pce.material_request, pce.item_code
     """
 
 	return frappe.db.sql(query, filters, as_dict=True)
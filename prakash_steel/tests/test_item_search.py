@@ -0,0 +1,65 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+from frappe.tests.utils import FrappeTestCase
+
+from prakash_steel.utils import item_search
+
+
+def _item(name, item_name, is_stock_item=1):
+	return {
+		"name": name,
+		"item_name": item_name,
+		"item_group": "Products",
+		"is_stock_item": is_stock_item,
+		"grade": "",
+		"category": "",
+		"desc_code": "",
+	}
+
+
+def _index():
+	return item_search._build_index(
+		{
+			"items": [
+				_item("BAR-10", "Round Bar 10mm"),
+				_item("BAR-100", "Round Bar 100mm"),
+				_item("BAR-11", "Bar 11mm"),
+				_item("FLT-01", "Flat cut from BAR-10 stock"),
+				_item("ROD-5", "Rod bar"),
+				_item("SQ-01", "Square xbar-10"),
+				_item("SRV-BAR-10", "Cutting service BAR-10", is_stock_item=0),
+			],
+			"categories": [],
+		}
+	)
+
+
+class TestItemSearch(FrappeTestCase):
+	def search(self, txt, **kwargs):
+		with patch.object(item_search, "_get_index", return_value=_index()):
+			return [item["name"] for item in item_search.search_items(txt, **kwargs)]
+
+	def test_ranking_tiers(self):
+		# exact code, code prefix, word prefix, substring, then fuzzy; ROD-5 shares too few trigrams
+		self.assertEqual(self.search("bar-10"), ["BAR-10", "BAR-100", "FLT-01", "SQ-01", "BAR-11"])
+
+	def test_tier_ties_sort_by_item_code(self):
+		self.assertEqual(self.search("round"), ["BAR-10", "BAR-100"])
+
+	def test_short_query_scans_without_trigrams(self):
+		self.assertEqual(self.search("ba"), ["BAR-10", "BAR-100", "BAR-11", "FLT-01", "ROD-5", "SQ-01"])
+
+	def test_similarity_threshold(self):
+		# BAR-11 shares 3 of the 4 trigrams of "bar-10"
+		with patch.object(item_search, "MIN_SIMILARITY", 0.75):
+			self.assertIn("BAR-11", self.search("bar-10"))
+		with patch.object(item_search, "MIN_SIMILARITY", 0.8):
+			self.assertNotIn("BAR-11", self.search("bar-10"))
+
+	def test_stock_only_and_limit(self):
+		self.assertNotIn("SRV-BAR-10", self.search("bar-10"))
+		self.assertIn("SRV-BAR-10", self.search("bar-10", stock_only=False))
+		self.assertEqual(self.search("bar-10", limit=2), ["BAR-10", "BAR-100"])
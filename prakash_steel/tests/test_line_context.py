@@ -0,0 +1,87 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+import frappe
+from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.stock.doctype.item.test_item import make_item
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+from prakash_steel.api.get_available_stock import get_available_stock
+from prakash_steel.api.get_last_purchase_invoice_rate import get_last_purchase_invoice_rate
+from prakash_steel.api.get_last_purchase_or_production import get_last_purchase_or_production
+from prakash_steel.api.get_last_sales_invoice_rate import get_last_sales_invoice_rate
+from prakash_steel.api.get_last_sales_invoice_sold_qty import get_last_sales_invoice_sold_qty
+from prakash_steel.api.get_line_context import get_line_context
+
+TRADED_ITEM = "_Test Line Context Item"
+NEW_ITEM = "_Test Line Context New Item"
+
+
+class TestLineContext(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_item(TRADED_ITEM, {"is_stock_item": 0})
+		make_item(NEW_ITEM, {"is_stock_item": 0})
+		frappe.db.set_value("Item", NEW_ITEM, "last_purchase_rate", 42)
+
+		# _Test Company bought earlier at 100; _Test Company 1 holds the latest invoice, at 130
+		_submit_purchase_invoice(item_code=TRADED_ITEM, qty=1, rate=100, posting_date=add_days(today(), -3))
+		_submit_purchase_invoice(
+			item_code=TRADED_ITEM,
+			qty=1,
+			rate=130,
+			posting_date=add_days(today(), -1),
+			company="_Test Company 1",
+			warehouse="Stores - _TC1",
+			cost_center="Main - _TC1",
+			expense_account="Cost of Goods Sold - _TC1",
+			credit_to="Creditors - _TC1",
+		)
+		create_sales_invoice(item_code=TRADED_ITEM, qty=7, rate=150, posting_date=add_days(today(), -1))
+
+	def test_matches_single_item_endpoints(self):
+		for company in (None, "_Test Company", "_Test Company 1", "_Test Company with perpetual inventory"):
+			context = get_line_context(frappe.as_json([TRADED_ITEM, NEW_ITEM]), company=company)
+
+			for item_code in (TRADED_ITEM, NEW_ITEM):
+				line = context[item_code]
+				self.assertEqual(line["last_sale_rate"], get_last_sales_invoice_rate(item_code))
+				self.assertEqual(line["last_sold_qty"], get_last_sales_invoice_sold_qty(item_code))
+				self.assertEqual(
+					line["last_purchase_rate"], get_last_purchase_invoice_rate(item_code, company=company)
+				)
+				self.assertEqual(
+					line["last_purchase_or_production"], get_last_purchase_or_production(item_code)
+				)
+				self.assertEqual(line["available_stock"], get_available_stock(item_code))
+
+	def test_company_specific_purchase_rate(self):
+		def rate(company):
+			return get_line_context([TRADED_ITEM], company=company)[TRADED_ITEM]["last_purchase_rate"]
+
+		self.assertEqual(rate(None), 130)
+		self.assertEqual(rate("_Test Company 1"), 130)
+		# The latest invoice is another company's: this company's own latest invoice
+		self.assertEqual(rate("_Test Company"), 100)
+		# No invoice in this company: the Item master value, as get_last_purchase_invoice_rate
+		self.assertEqual(
+			rate("_Test Company with perpetual inventory"),
+			frappe.db.get_value("Item", TRADED_ITEM, "last_purchase_rate") or 0,
+		)
+
+	def test_item_without_history_falls_back_to_item_master(self):
+		line = get_line_context([NEW_ITEM], company="_Test Company")[NEW_ITEM]
+		self.assertEqual(line["last_purchase_rate"], 42)
+		self.assertEqual(line["last_sale_rate"], 0)
+		self.assertEqual(line["last_purchase_or_production"], {"date": None, "qty": 0})
+
+
+def _submit_purchase_invoice(**args):
+	pi = make_purchase_invoice(do_not_save=True, **args)
+	pi.custom_purchase_type = "Raw Material"
+	pi.insert()
+	pi.submit()
+	return pi
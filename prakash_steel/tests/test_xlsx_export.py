@@ -0,0 +1,64 @@
+# Copyright (c) 2026, beetashoke chakraborty and Contributors
+# See license.txt
+
+import datetime
+from unittest.mock import patch
+
+from frappe.tests.utils import FrappeTestCase
+from openpyxl import load_workbook
+
+from prakash_steel.api import get_item_insight_data as item_insight
+from prakash_steel.utils.xlsx_export import make_xlsx_file
+
+
+class TestXlsxExport(FrappeTestCase):
+	def test_make_xlsx_file_writes_rows_from_a_generator(self):
+		columns = [{"label": "Item"}, {"label": "Date", "number_format": "DD-MM-YYYY"}, {"label": "Qty"}]
+		rows = ([f"ITEM-{i}", datetime.date(2026, 1, i + 1), i * 1.5] for i in range(3))
+
+		output = make_xlsx_file("Items", columns, rows, header_style=True)
+
+		worksheet = load_workbook(output)["Items"]
+		self.assertEqual([cell.value for cell in worksheet[1]], ["Item", "Date", "Qty"])
+		self.assertTrue(worksheet["A1"].font.bold)
+		self.assertEqual(worksheet.max_row, 4)
+		self.assertEqual(worksheet["A4"].value, "ITEM-2")
+		self.assertEqual(worksheet["B2"].number_format, "DD-MM-YYYY")
+		self.assertEqual(worksheet["B2"].value.date(), datetime.date(2026, 1, 1))
+		self.assertEqual(worksheet["C3"].value, 1.5)
+		# the generator is consumed in the single pass
+		self.assertIsNone(next(rows, None))
+
+	def test_make_xlsx_file_leaves_empty_formatted_values(self):
+		columns = [{"label": "Date", "number_format": "DD-MM-YYYY"}]
+
+		worksheet = load_workbook(make_xlsx_file("Sheet", columns, [[None], [""]])).active
+
+		self.assertEqual(worksheet.max_row, 3)
+		self.assertIsNone(worksheet["A2"].value)
+
+	def test_item_insight_sheet_walks_pages(self):
+		pages = {
+			None: {"data": [_insight_item("A", ["Stores", "Finished"])], "next_cursor": '["A", "A"]'},
+			'["A", "A"]': {"data": [_insight_item("B", []), _insight_item("C", [])], "next_cursor": None},
+		}
+		with patch.object(
+			item_insight, "get_item_insight_page", side_effect=lambda **kwargs: pages[kwargs["cursor"]]
+		) as get_page:
+			_sheet_name, columns, rows, _header_style = item_insight.get_item_insight_sheet({"limit": 2})
+			rows = list(rows)
+
+		# one row per warehouse, one row for an item without stock, stopped at the limit
+		self.assertEqual([row[0] for row in rows], ["A", "A", "B"])
+		self.assertEqual([row[16] for row in rows], ["Stores", "Finished", ""])
+		self.assertEqual(len(rows[0]), len(columns))
+		self.assertEqual(get_page.call_count, 2)
+
+
+def _insight_item(item_code, warehouses):
+	return {
+		"item_code": item_code,
+		"item_name": item_code,
+		"total_stock_on_hand": 10 * len(warehouses),
+		"warehouse_stock": [{"warehouse": warehouse, "stock_qty": 10} for warehouse in warehouses],
+	}
@@ -0,0 +1,192 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Site-level Redis cache of default BOMs.
+
+Two Redis hashes are kept per site:
+	- DEFAULT_BOM_CACHE_KEY: item_code -> default BOM name
+	- BOM_CACHE_KEY: BOM name -> header (name, item, quantity) and its items
+
+Both are filled in bulk on first use and dropped by the BOM doc events wired in
+hooks.py, so lookups are a single hash read instead of up to three queries.
+
+Clearing also bumps a version counter. A fill only writes if the version is still the
+one it read before querying, so a fill that raced with a BOM change cannot write stale
+entries back after the clear.
+"""
+
+import pickle
+
+import frappe
+import redis
+from frappe import _
+from frappe.utils import flt
+
+DEFAULT_BOM_CACHE_KEY = "prakash_steel:default_bom"
+BOM_CACHE_KEY = "prakash_steel:bom"
+BOM_CACHE_VERSION_KEY = "prakash_steel:bom_version"
+
+# Marker field written last, so a reader that sees it knows the hash is complete
+_LOADED_FIELD = "__loaded__"
+
+
+def get_default_bom(item_code):
+	"""
+	Return the default BOM name for an item from the cache.
+
+	Priority (same as the previous per-call queries):
+		1. Active, default and submitted BOM
+		2. Any active submitted BOM
+		3. Any active BOM (even if not submitted)
+	Latest created BOM wins within each tier.
+	"""
+	if not item_code:
+		return None
+
+	cache = frappe.cache()
+	if not cache.hget(DEFAULT_BOM_CACHE_KEY, _LOADED_FIELD):
+		_load_bom_cache()
+
+	return cache.hget(DEFAULT_BOM_CACHE_KEY, item_code) or None
+
+
+def get_default_bom_map():
+	"""Return {item_code: default BOM name} for every item that has an active BOM."""
+	cache = frappe.cache()
+	if not cache.hget(DEFAULT_BOM_CACHE_KEY, _LOADED_FIELD):
+		return _load_bom_cache()
+
+	bom_map = cache.hgetall(DEFAULT_BOM_CACHE_KEY)
+	return {
+		frappe.safe_decode(item_code): bom_name
+		for item_code, bom_name in bom_map.items()
+		if frappe.safe_decode(item_code) != _LOADED_FIELD
+	}
+
+
+def get_cached_bom(bom_name):
+	"""
+	Return a lightweight BOM (name, item, quantity, items) from the cache.
+
+	`items` is a list of dicts with item_code, qty, stock_qty and uom, ordered by idx,
+	so it can be used in place of `frappe.get_doc("BOM", bom_name)` by read-only callers.
+	Raises frappe.DoesNotExistError like get_doc when the BOM is missing.
+	"""
+	cache = frappe.cache()
+	bom = cache.hget(BOM_CACHE_KEY, bom_name)
+	if bom is None:
+		# Non-default BOMs are not part of the bulk fill; cache them on demand
+		version = _get_version()
+		bom = _fetch_boms([bom_name]).get(bom_name)
+		if not bom:
+			frappe.throw(_("BOM {0} not found").format(bom_name), frappe.DoesNotExistError)
+		_write_hashes(version, {BOM_CACHE_KEY: {bom_name: bom}})
+
+	return _as_bom(bom)
+
+
+def clear_bom_cache(doc=None, method=None):
+	"""Doc event handler: drop both cache hashes whenever a BOM changes."""
+	cache = frappe.cache()
+	# Bump first, so a fill already in flight no longer matches and skips its write
+	cache.incr(cache.make_key(BOM_CACHE_VERSION_KEY))
+	cache.delete_value([DEFAULT_BOM_CACHE_KEY, BOM_CACHE_KEY])
+
+
+def _load_bom_cache():
+	"""Build the default BOM map with one query and write both hashes."""
+	version = _get_version()
+	rows = frappe.db.sql(
+		"""
+		SELECT name, item
+		FROM `tabBOM`
+		WHERE is_active = 1
+		ORDER BY
+			item,
+			(is_default = 1 AND docstatus = 1) DESC,
+			(docstatus = 1) DESC,
+			creation DESC
+		""",
+		as_dict=True,
+	)
+
+	bom_map = {}
+	for row in rows:
+		# Rows are ordered by priority within each item, so the first one wins
+		if row.item and row.item not in bom_map:
+			bom_map[row.item] = row.name
+
+	boms = _fetch_boms(list(set(bom_map.values())))
+
+	_write_hashes(
+		version,
+		{
+			BOM_CACHE_KEY: boms,
+			# The marker goes in the same transaction, so it is never seen without the map
+			DEFAULT_BOM_CACHE_KEY: dict(bom_map, **{_LOADED_FIELD: 1}),
+		},
+	)
+
+	return bom_map
+
+
+def _get_version():
+	cache = frappe.cache()
+	return cache.get(cache.make_key(BOM_CACHE_VERSION_KEY))
+
+
+def _write_hashes(version, hashes):
+	"""Write {cache key: {field: value}} in one transaction, unless the cache was cleared since `version` was read."""
+	cache = frappe.cache()
+	version_key = cache.make_key(BOM_CACHE_VERSION_KEY)
+
+	with cache.pipeline() as pipe:
+		try:
+			pipe.watch(version_key)
+			if pipe.get(version_key) != version:
+				return
+			pipe.multi()
+			for key, fields in hashes.items():
+				if fields:
+					# Pickled like RedisWrapper.hset, so hget / hgetall read them back
+					pipe.hset(
+						cache.make_key(key),
+						mapping={field: pickle.dumps(value) for field, value in fields.items()},
+					)
+			pipe.execute()
+		except redis.exceptions.WatchError:
+			# Cleared while writing; the next reader loads again
+			pass
+
+
+def _fetch_boms(bom_names):
+	"""Fetch BOM headers and items for the given BOMs with two queries."""
+	if not bom_names:
+		return {}
+
+	headers = frappe.get_all(
+		"BOM",
+		filters={"name": ["in", bom_names]},
+		fields=["name", "item", "quantity"],
+	)
+	boms = {
+		h.name: {"name": h.name, "item": h.item, "quantity": flt(h.quantity), "items": []} for h in headers
+	}
+
+	bom_items = frappe.get_all(
+		"BOM Item",
+		filters={"parent": ["in", list(boms)], "parenttype": "BOM"},
+		fields=["parent", "item_code", "qty", "stock_qty", "uom"],
+		order_by="parent asc, idx asc",
+	)
+	for bi in bom_items:
+		boms[bi.parent]["items"].append(
+			{"item_code": bi.item_code, "qty": flt(bi.qty), "stock_qty": flt(bi.stock_qty), "uom": bi.uom}
+		)
+
+	return boms
+
+
+def _as_bom(bom):
+	return frappe._dict(bom, items=[frappe._dict(i) for i in bom.get("items") or []])
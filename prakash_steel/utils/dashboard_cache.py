@@ -0,0 +1,62 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Short-lived Redis cache of dashboard API responses.
+
+Responses are cached per namespace, view and normalised filter set for a few minutes,
+together with an ETag (a hash of the response). A client that sends back the ETag it
+already holds gets a small not-modified reply instead of the rows.
+
+Every key carries the namespace's generation token. The doc events wired in hooks.py
+drop the token, which orphans all cached views of that namespace at once; the orphaned
+entries then expire on their own.
+"""
+
+import hashlib
+
+import frappe
+
+DEFAULT_TTL = 300
+
+
+def get_cached_view(namespace, view, filters, build, ttl=DEFAULT_TTL):
+	"""Return (data, etag) for a view and filter set, calling build() on a cache miss."""
+	cache = frappe.cache()
+	key = f"prakash_steel:dashboard:{namespace}:{_get_generation(namespace)}:{view}:{_hash(filters)}"
+
+	cached = cache.get_value(key)
+	if cached is None:
+		data = build()
+		cached = {"data": data, "etag": _hash(data)}
+		cache.set_value(key, cached, expires_in_sec=ttl)
+
+	return cached["data"], cached["etag"]
+
+
+def conditional_response(data, etag, if_none_match=None):
+	"""API reply for a cached view: just the ETag when the client already has this version."""
+	if if_none_match and if_none_match == etag:
+		return {"not_modified": 1, "etag": etag}
+	return dict(data, etag=etag)
+
+
+def clear_dashboard_cache(namespace):
+	frappe.cache().delete_value(_generation_key(namespace))
+
+
+def _get_generation(namespace):
+	cache = frappe.cache()
+	generation = cache.get_value(_generation_key(namespace))
+	if not generation:
+		generation = frappe.generate_hash(length=8)
+		cache.set_value(_generation_key(namespace), generation)
+	return generation
+
+
+def _generation_key(namespace):
+	return f"prakash_steel:dashboard_generation:{namespace}"
+
+
+def _hash(value):
+	return hashlib.sha1(frappe.as_json(value).encode()).hexdigest()
@@ -23,49 +23,62 @@ def get_data(
 
 	precision = cint(frappe.db.get_single_value("System Settings", "float_precision"))
 
-	for item in items:
-		# Sum qty still pending (qty - delivered_qty) from custom_closed SO items
-		result = frappe.db.sql(
-			"""
-			SELECT COALESCE(SUM(soi.qty - soi.delivered_qty), 0) AS closed_qty
-			FROM `tabSales Order Item` soi
-			INNER JOIN `tabSales Order` so ON so.name = soi.parent
-			WHERE soi.item_code = %s
-			  AND soi.warehouse = %s
-			  AND so.docstatus = 1
-			  AND so.status NOT IN ('Closed', 'Completed', 'Cancelled')
-			  AND soi.custom_closed = 1
-			  AND soi.qty > soi.delivered_qty
-			""",
-			(item.item_code, item.warehouse),
-		)
+	item_codes = tuple({item.item_code for item in items})
+	warehouses = tuple({item.warehouse for item in items})
+
+	# Qty still pending (qty - delivered_qty) from custom_closed SO items
+	so_closed_qty = _get_closed_qty_by_bin(
+		"""
+		SELECT soi.item_code, soi.warehouse, SUM(soi.qty - soi.delivered_qty) AS closed_qty
+		FROM `tabSales Order Item` soi
+		INNER JOIN `tabSales Order` so ON so.name = soi.parent
+		WHERE soi.item_code IN %(item_codes)s
+		  AND soi.warehouse IN %(warehouses)s
+		  AND so.docstatus = 1
+		  AND so.status NOT IN ('Closed', 'Completed', 'Cancelled')
+		  AND soi.custom_closed = 1
+		  AND soi.qty > soi.delivered_qty
+		GROUP BY soi.item_code, soi.warehouse
+		""",
+		item_codes,
+		warehouses,
+	)
 
-		closed_qty = flt(result[0][0] if result else 0, precision)
+	# Qty still pending (qty - received_qty) from custom_closed PO items
+	po_closed_qty = _get_closed_qty_by_bin(
+		"""
+		SELECT poi.item_code, poi.warehouse, SUM(poi.qty - poi.received_qty) AS closed_qty
+		FROM `tabPurchase Order Item` poi
+		INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
+		WHERE poi.item_code IN %(item_codes)s
+		  AND poi.warehouse IN %(warehouses)s
+		  AND po.docstatus = 1
+		  AND po.status NOT IN ('Closed', 'Completed', 'Cancelled')
+		  AND poi.custom_closed = 1
+		  AND poi.qty > poi.received_qty
+		GROUP BY poi.item_code, poi.warehouse
+		""",
+		item_codes,
+		warehouses,
+	)
+
+	for item in items:
+		closed_qty = flt(so_closed_qty.get((item.item_code, item.warehouse), 0), precision)
 
 		if closed_qty > 0:
 			item["reserved_qty"] = flt(item.get("reserved_qty", 0) - closed_qty, precision)
 			item["projected_qty"] = flt(item.get("projected_qty", 0) + closed_qty, precision)
 
-		# Sum qty still pending (qty - received_qty) from custom_closed PO items
-		po_result = frappe.db.sql(
-			"""
-			SELECT COALESCE(SUM(poi.qty - poi.received_qty), 0) AS closed_qty
-			FROM `tabPurchase Order Item` poi
-			INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
-			WHERE poi.item_code = %s
-			  AND poi.warehouse = %s
-			  AND po.docstatus = 1
-			  AND po.status NOT IN ('Closed', 'Completed', 'Cancelled')
-			  AND poi.custom_closed = 1
-			  AND poi.qty > poi.received_qty
-			""",
-			(item.item_code, item.warehouse),
-		)
+		closed_qty = flt(po_closed_qty.get((item.item_code, item.warehouse), 0), precision)
 
-		po_closed_qty = flt(po_result[0][0] if po_result else 0, precision)
-
-		if po_closed_qty > 0:
-			item["ordered_qty"] = flt(item.get("ordered_qty", 0) - po_closed_qty, precision)
-			item["projected_qty"] = flt(item.get("projected_qty", 0) + po_closed_qty, precision)
+		if closed_qty > 0:
+			item["ordered_qty"] = flt(item.get("ordered_qty", 0) - closed_qty, precision)
+			item["projected_qty"] = flt(item.get("projected_qty", 0) + closed_qty, precision)
 
 	return items
+
+
+def _get_closed_qty_by_bin(query, item_codes, warehouses):
+	"""Run a closed-qty query for all dashboard rows at once; returns {(item_code, warehouse): qty}."""
+	rows = frappe.db.sql(query, {"item_codes": item_codes, "warehouses": warehouses}, as_dict=True)
+	return {(row.item_code, row.warehouse): row.closed_qty for row in rows}
@@ -0,0 +1,214 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Item Last Activity summary.
+
+One Item Last Activity row per item holds its latest submitted Sales Invoice, Purchase
+Invoice, Purchase Order and production (Finish Weight / Bright Bar Production), so the
+"last rate / last qty" endpoints are a primary-key read instead of sorting the history.
+
+The doc events in hooks.py rebuild the affected section for the voucher's items from
+the submitted history, so a cancel falls back to the previous record and back-dated
+entries land in the right place.
+"""
+
+import frappe
+
+# section -> (query returning the latest row per item, {summary field: query column})
+# Each query ranks the submitted history per item with the same ordering the endpoints
+# used; {item_condition} narrows it to the items being rebuilt.
+SECTIONS = {
+	"sale": (
+		"""
+		SELECT * FROM (
+			SELECT
+				sii.item_code, si.customer AS party, si.posting_date AS tx_date,
+				sii.qty, sii.rate, si.name AS voucher,
+				ROW_NUMBER() OVER (
+					PARTITION BY sii.item_code
+					ORDER BY si.posting_date DESC, si.posting_time DESC, si.creation DESC, sii.idx ASC
+				) AS row_no
+			FROM `tabSales Invoice Item` sii
+			INNER JOIN `tabSales Invoice` si ON si.name = sii.parent
+			WHERE si.docstatus = 1 {item_condition}
+		) ranked
+		WHERE row_no = 1
+		""",
+		{
+			"last_sale_party": "party",
+			"last_sale_date": "tx_date",
+			"last_sale_qty": "qty",
+			"last_sale_rate": "rate",
+			"last_sale_voucher": "voucher",
+		},
+	),
+	"purchase": (
+		"""
+		SELECT * FROM (
+			SELECT
+				pii.item_code, pi.supplier AS party, pi.posting_date AS tx_date,
+				pii.qty, pii.rate, pi.company, pi.name AS voucher,
+				ROW_NUMBER() OVER (
+					PARTITION BY pii.item_code
+					ORDER BY pi.posting_date DESC, pi.posting_time DESC, pii.creation DESC, pii.idx ASC
+				) AS row_no
+			FROM `tabPurchase Invoice Item` pii
+			INNER JOIN `tabPurchase Invoice` pi ON pi.name = pii.parent
+			WHERE pi.docstatus = 1 {item_condition}
+		) ranked
+		WHERE row_no = 1
+		""",
+		{
+			"last_purchase_party": "party",
+			"last_purchase_date": "tx_date",
+			"last_purchase_qty": "qty",
+			"last_purchase_rate": "rate",
+			"last_purchase_company": "company",
+			"last_purchase_voucher": "voucher",
+		},
+	),
+	"purchase_order": (
+		"""
+		SELECT * FROM (
+			SELECT
+				poi.item_code, po.supplier AS party, po.transaction_date AS tx_date,
+				poi.qty, po.name AS voucher,
+				ROW_NUMBER() OVER (
+					PARTITION BY poi.item_code
+					ORDER BY po.transaction_date DESC, po.creation DESC, poi.idx ASC
+				) AS row_no
+			FROM `tabPurchase Order Item` poi
+			INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
+			WHERE po.docstatus = 1 {item_condition}
+		) ranked
+		WHERE row_no = 1
+		""",
+		{
+			"last_po_party": "party",
+			"last_po_date": "tx_date",
+			"last_po_qty": "qty",
+			"last_po_voucher": "voucher",
+		},
+	),
+	"production": (
+		"""
+		SELECT * FROM (
+			SELECT
+				production.*,
+				ROW_NUMBER() OVER (
+					PARTITION BY production.item_code
+					ORDER BY production.tx_date DESC, production.creation DESC
+				) AS row_no
+			FROM (
+				SELECT
+					item_code, posting_date AS tx_date, finish_weight AS qty, creation,
+					'Finish Weight' AS voucher_type, name AS voucher
+				FROM `tabFinish Weight`
+				WHERE docstatus = 1 {item_condition}
+
+				UNION ALL
+
+				SELECT
+					finished_good AS item_code, production_date AS tx_date, fg_weight AS qty, creation,
+					'Bright Bar Production' AS voucher_type, name AS voucher
+				FROM `tabBright Bar Production`
+				WHERE docstatus = 1 {bright_item_condition}
+			) production
+		) ranked
+		WHERE row_no = 1
+		""",
+		{
+			"last_production_date": "tx_date",
+			"last_production_qty": "qty",
+			"last_production_voucher_type": "voucher_type",
+			"last_production_voucher": "voucher",
+		},
+	),
+}
+
+# Item condition column per section (the production query needs one per source table)
+_ITEM_COLUMNS = {
+	"sale": {"item_condition": "sii.item_code"},
+	"purchase": {"item_condition": "pii.item_code"},
+	"purchase_order": {"item_condition": "poi.item_code"},
+	"production": {"item_condition": "item_code", "bright_item_condition": "finished_good"},
+}
+
+# Voucher doctype -> (section, child table, item field)
+VOUCHER_SECTIONS = {
+	"Sales Invoice": ("sale", "items", "item_code"),
+	"Purchase Invoice": ("purchase", "items", "item_code"),
+	"Purchase Order": ("purchase_order", "items", "item_code"),
+	"Finish Weight": ("production", None, "item_code"),
+	"Bright Bar Production": ("production", None, "finished_good"),
+}
+
+
+def get_item_last_activity(item_code):
+	"""Return the Item Last Activity row of an item (an empty dict when it has none)."""
+	if not item_code:
+		return frappe._dict()
+	return frappe.db.get_value("Item Last Activity", item_code, "*", as_dict=True) or frappe._dict()
+
+
+def update_item_last_activity(doc, method=None):
+	"""Doc event (on_submit / on_cancel): rebuild the voucher's section for its items."""
+	section, table_field, item_field = VOUCHER_SECTIONS[doc.doctype]
+	if table_field:
+		item_codes = {row.get(item_field) for row in doc.get(table_field) or []}
+	else:
+		item_codes = {doc.get(item_field)}
+
+	item_codes = [item_code for item_code in item_codes if item_code]
+	if item_codes:
+		rebuild_item_last_activity(item_codes, sections=[section])
+
+
+def rebuild_item_last_activity(item_codes=None, sections=None):
+	"""Recompute the given sections (default all) for item_codes (default every item with history)."""
+	values = {}
+	if item_codes is not None:
+		if not item_codes:
+			return
+		values["item_codes"] = tuple(item_codes)
+
+	summaries = {}
+	for section in sections or SECTIONS:
+		query, field_map = SECTIONS[section]
+		conditions = {
+			key: f"AND {column} IN %(item_codes)s" if item_codes is not None else ""
+			for key, column in _ITEM_COLUMNS[section].items()
+		}
+		latest = {
+			row.item_code: row for row in frappe.db.sql(query.format(**conditions), values, as_dict=True)
+		}
+
+		# Items without any submitted voucher left have the section cleared
+		for item_code in item_codes if item_codes is not None else latest:
+			row = latest.get(item_code) or {}
+			summary = summaries.setdefault(item_code, {})
+			for fieldname, column in field_map.items():
+				summary[fieldname] = row.get(column)
+
+	for item_code, summary in summaries.items():
+		_save_summary(item_code, summary)
+
+
+def _save_summary(item_code, summary):
+	if frappe.db.exists("Item Last Activity", item_code):
+		frappe.db.set_value("Item Last Activity", item_code, summary, update_modified=False)
+		return
+
+	if not any(value is not None for value in summary.values()):
+		return
+	if not frappe.db.exists("Item", item_code):
+		return
+
+	try:
+		frappe.get_doc({"doctype": "Item Last Activity", "item_code": item_code, **summary}).insert(
+			ignore_permissions=True
+		)
+	except frappe.DuplicateEntryError:
+		# Created by a concurrent submit; update that row instead
+		frappe.db.set_value("Item Last Activity", item_code, summary, update_modified=False)
@@ -0,0 +1,201 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+In-memory item search index for dashboards and pickers.
+
+The searchable Item fields (code, name, grade, category, description code) and the Item
+Categories are loaded with two queries and published in Redis under a version token.
+Each worker process builds a trigram index from that snapshot once per version and
+answers queries from memory:
+
+	1. exact item code
+	2. item code prefix
+	3. word prefix (item name, grade, category, description code)
+	4. substring of all query words
+	5. typo-tolerant: enough query trigrams shared with the item (see MIN_SIMILARITY)
+
+Ties sort by item code. The Item / Item Category doc events in hooks.py drop the version
+so every worker rebuilds on its next search.
+"""
+
+from collections import Counter
+
+import frappe
+
+INDEX_KEY = "prakash_steel:item_search_index"
+VERSION_KEY = "prakash_steel:item_search_version"
+
+# Share of the query's trigrams an item must contain to count as a fuzzy match
+MIN_SIMILARITY = 0.5
+
+# site -> (version, built index) for this worker process
+_local_indexes = {}
+
+
+def search_items(txt, limit=20, stock_only=True, item_grade=None, category_name=None):
+	"""Return up to `limit` ranked items ({name, item_name, item_group}) matching txt."""
+	index = _get_index()
+	query = _normalize(txt)
+
+	def allowed(item):
+		return (
+			(not stock_only or item["is_stock_item"])
+			and (not item_grade or item["grade"] == item_grade)
+			and (not category_name or item["category"] == category_name)
+		)
+
+	if not query:
+		matches = [
+			(0, 0, item["name"], position) for position, item in enumerate(index["items"]) if allowed(item)
+		]
+	else:
+		matches = []
+		for position, (tier, similarity) in _match(index, query).items():
+			item = index["items"][position]
+			if allowed(item):
+				matches.append((tier, -similarity, item["name"], position))
+
+	matches.sort()
+	return [
+		{
+			"name": index["items"][position]["name"],
+			"item_name": index["items"][position]["item_name"],
+			"item_group": index["items"][position]["item_group"],
+		}
+		for *_sort_key, position in matches[: int(limit)]
+	]
+
+
+def search_item_categories(txt, item_grade=None, start=0, page_len=20):
+	"""Return [(name, category_name)] of Item Categories matching txt, limited to categories used by items of item_grade."""
+	index = _get_index()
+	query = _normalize(txt)
+
+	used = None
+	if item_grade:
+		used = {
+			item["category"] for item in index["items"] if item["grade"] == item_grade and item["category"]
+		}
+
+	categories = [
+		(name, category_name)
+		for name, category_name in index["categories"]
+		if (used is None or name in used)
+		and (not query or query in _normalize(name) or query in _normalize(category_name))
+	]
+	return categories[int(start) : int(start) + int(page_len)]
+
+
+def clear_item_search_index(doc=None, method=None):
+	"""Doc event handler: an Item or Item Category changed."""
+	frappe.cache().delete_value([INDEX_KEY, VERSION_KEY])
+
+
+def _get_index():
+	cache = frappe.cache()
+	version = cache.get_value(VERSION_KEY)
+
+	local = _local_indexes.get(frappe.local.site)
+	if version and local and local[0] == version:
+		return local[1]
+
+	snapshot = cache.get_value(INDEX_KEY) if version else None
+	if not snapshot:
+		snapshot = _load_snapshot()
+		version = frappe.generate_hash(length=8)
+		cache.set_value(INDEX_KEY, snapshot)
+		cache.set_value(VERSION_KEY, version)
+
+	index = _build_index(snapshot)
+	_local_indexes[frappe.local.site] = (version, index)
+	return index
+
+
+def _load_snapshot():
+	items = frappe.db.sql(
+		"""
+		SELECT
+			name, item_name, item_group, is_stock_item,
+			custom_grade AS grade,
+			custom_category_name AS category,
+			custom_desc_code AS desc_code
+		FROM `tabItem`
+		WHERE disabled = 0
+		ORDER BY name
+		""",
+		as_dict=True,
+	)
+	categories = frappe.db.sql(
+		"""
+		SELECT name, category_name
+		FROM `tabItem Category`
+		ORDER BY name
+		"""
+	)
+	return {
+		"items": [dict(item) for item in items],
+		"categories": [tuple(category) for category in categories],
+	}
+
+
+def _build_index(snapshot):
+	items = snapshot["items"]
+	postings = {}
+	for position, item in enumerate(items):
+		item["code_key"] = _normalize(item["name"])
+		item["text"] = " ".join(
+			_normalize(item.get(field)) for field in ("name", "item_name", "grade", "category", "desc_code")
+		)
+		item["words"] = item["text"].split()
+		for trigram in _trigrams(item["text"]):
+			postings.setdefault(trigram, []).append(position)
+
+	return {"items": items, "categories": snapshot["categories"], "postings": postings}
+
+
+def _match(index, query):
+	"""Return {item position: (tier, similarity)} for every item matching the query."""
+	items = index["items"]
+	query_words = query.split()
+	query_trigrams = _trigrams(query)
+
+	if query_trigrams:
+		counts = Counter()
+		for trigram in query_trigrams:
+			counts.update(index["postings"].get(trigram, ()))
+		candidates = {
+			position: count / len(query_trigrams)
+			for position, count in counts.items()
+			if count / len(query_trigrams) >= MIN_SIMILARITY
+		}
+	else:
+		# One or two characters: too short for trigrams, scan for prefixes / substrings
+		candidates = {position: 0 for position, item in enumerate(items) if query in item["text"]}
+
+	matches = {}
+	for position, similarity in candidates.items():
+		item = items[position]
+		if item["code_key"] == query:
+			tier = 0
+		elif item["code_key"].startswith(query):
+			tier = 1
+		elif all(any(word.startswith(query_word) for word in item["words"]) for query_word in query_words):
+			tier = 2
+		elif all(query_word in item["text"] for query_word in query_words):
+			tier = 3
+		elif query_trigrams:
+			tier = 4
+		else:
+			continue
+		matches[position] = (tier, similarity)
+
+	return matches
+
+
+def _trigrams(text):
+	return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _normalize(value):
+	return " ".join(str(value or "").lower().split())
@@ -3,6 +3,8 @@
 
 import frappe
 
+from prakash_steel.utils import bom_cache
+
 
 def calculate_decoupled_lead_time(item_code):
 	if not item_code:
@@ -71,9 +73,9 @@ def _calculate_lead_time_recursive(item_code, visited_items, item_groups_cache=N
 		if not bom:
 			return item_lead_time
 
-		# Get BOM document
+		# Get BOM header and items from the BOM cache
 		try:
-			bom_doc = frappe.get_doc("BOM", bom)
+			bom_doc = bom_cache.get_cached_bom(bom)
 		except Exception as e:
 			frappe.log_error(
 				f"Error getting BOM {bom} for item {item_code}: {str(e)}", "Lead Time Calculation Error"
@@ -174,33 +176,16 @@ def get_default_bom(item_code):
 	"""
 	Get the default BOM for an item.
 
+	Resolved from the site-level BOM cache (see prakash_steel.utils.bom_cache),
+	which is invalidated by BOM doc events.
+
 	Args:
 		item_code (str): Item code
 
 	Returns:
 		str: BOM name if found, None otherwise
 	"""
-	# First try to get default active BOM (submitted)
-	bom = frappe.db.get_value(
-		"BOM",
-		{"item": item_code, "is_active": 1, "is_default": 1, "docstatus": 1},
-		"name",
-		order_by="creation desc",
-	)
-
-	# If no default submitted BOM, try any active submitted BOM
-	if not bom:
-		bom = frappe.db.get_value(
-			"BOM", {"item": item_code, "is_active": 1, "docstatus": 1}, "name", order_by="creation desc"
-		)
-
-	# If still no BOM, try any active BOM (even if not submitted)
-	if not bom:
-		bom = frappe.db.get_value(
-			"BOM", {"item": item_code, "is_active": 1}, "name", order_by="creation desc"
-		)
-
-	return bom
+	return bom_cache.get_default_bom(item_code)
 
 
 @frappe.whitelist()
@@ -290,6 +275,116 @@ def update_decoupled_lead_time_for_finished_goods():
 	return updated_count
 
 
+def load_bom_tree_items(item_codes):
+	"""
+	Load item details for the given items and everything below them in their default BOMs.
+
+	The BOM graph comes from the BOM cache and items are fetched one query per BOM level,
+	so a whole tree costs a handful of queries instead of a get_doc per node.
+
+	Args:
+		item_codes (list): Root item codes
+
+	Returns:
+		dict: {item_code: frappe._dict(item_name, item_group, lead_time_days, custom_buffer_flag)}
+	"""
+	items = {}
+	frontier = {code for code in item_codes if code}
+	seen = set(frontier)
+
+	while frontier:
+		rows = frappe.get_all(
+			"Item",
+			filters={"name": ["in", list(frontier)]},
+			fields=["name", "item_name", "item_group", "lead_time_days", "custom_buffer_flag"],
+		)
+		next_frontier = set()
+		for row in rows:
+			items[row.name] = row
+			# Raw Materials don't have BOMs (end of branch)
+			if row.item_group == "Raw Material":
+				continue
+			bom = get_default_bom(row.name)
+			if not bom:
+				continue
+			for bom_item in bom_cache.get_cached_bom(bom).items:
+				if bom_item.item_code and bom_item.item_code not in seen:
+					next_frontier.add(bom_item.item_code)
+
+		seen.update(next_frontier)
+		frontier = next_frontier
+
+	return items
+
+
+def get_decoupled_lead_time_map(item_codes, items=None):
+	"""
+	Bulk, memoized counterpart of calculate_decoupled_lead_time.
+
+	Each item in the tree is evaluated once; a child already on the current path
+	contributes nothing, as in the per-item recursion.
+
+	Args:
+		item_codes (list): Item codes to calculate
+		items (dict): Optional result of load_bom_tree_items covering the trees
+
+	Returns:
+		dict: {item_code: decoupled lead time}
+	"""
+	if items is None:
+		items = load_bom_tree_items(item_codes)
+
+	memo = {}
+	in_progress = set()
+
+	def _lead_time(item_code):
+		if item_code in memo:
+			return memo[item_code]
+
+		item = items.get(item_code)
+		if not item:
+			return 0
+
+		item_lead_time = flt(item.lead_time_days or 0)
+		bom = None if item.item_group == "Raw Material" else get_default_bom(item_code)
+		if not bom:
+			memo[item_code] = item_lead_time
+			return item_lead_time
+
+		in_progress.add(item_code)
+		child_contributions = []
+		for bom_item in bom_cache.get_cached_bom(bom).items:
+			child_code = bom_item.item_code
+			child = items.get(child_code)
+			if not child or child_code in in_progress:
+				continue
+			if child.item_group == "Raw Material":
+				child_contributions.append(flt(child.lead_time_days or 0))
+			elif child.custom_buffer_flag == "Buffer":
+				# Buffer item: the path ends here and contributes nothing to the parent
+				child_contributions.append(0)
+			else:
+				child_contributions.append(_lead_time(child_code))
+		in_progress.discard(item_code)
+
+		result = item_lead_time + (max(child_contributions) if child_contributions else 0)
+		memo[item_code] = result
+		return result
+
+	lead_times = {}
+	for item_code in item_codes:
+		try:
+			lead_times[item_code] = _lead_time(item_code)
+		except Exception as e:
+			frappe.log_error(
+				f"Error calculating lead time for item {item_code}: {str(e)}\nTraceback: {frappe.get_traceback()}",
+				"Lead Time Calculation Error",
+			)
+			lead_times[item_code] = 0
+
+	return lead_times
+
+
 def flt(value, precision=None):
 	"""Wrapper for frappe.utils.flt"""
 	from frappe.utils import flt as _flt
@@ -347,7 +442,7 @@ def debug_lead_time_calculation(item_code):
 			debug_info["bom_name"] = bom
 
 			# Get BOM items info
-			bom_doc = frappe.get_doc("BOM", bom)
+			bom_doc = bom_cache.get_cached_bom(bom)
 			bom_items_info = []
 			for bom_item in bom_doc.items:
 				try:
@@ -454,9 +549,9 @@ def _calculate_lead_time_recursive_with_trace(
 		trace_entry["has_bom"] = True
 		trace_entry["bom_name"] = bom
 
-		# Get BOM document
+		# Get BOM header and items from the BOM cache
 		try:
-			bom_doc = frappe.get_doc("BOM", bom)
+			bom_doc = bom_cache.get_cached_bom(bom)
 		except Exception as e:
 			frappe.log_error(
 				f"Error getting BOM {bom} for item {item_code}: {str(e)}", "Lead Time Calculation Error"
@@ -0,0 +1,221 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Morning planning pipeline.
+
+One scheduled job replaces the separate 04:00-04:03 snapshot captures and the 08:05
+on-hand colour job. It runs in two phases:
+
+	1. Load: every report the snapshots are built from runs inside one planning context
+	   and one database transaction with no commits in between, so all of them read the
+	   same consistent view and share the Bin / open SO / open PO / WIP / MRQ loads.
+	2. Write: each snapshot is written from the loaded rows and committed on its own.
+
+Every stage is timed and recorded in a Planning Pipeline Log. A failed stage is rolled
+back, logged to the Error Log and recorded as Failed; the remaining stages still run.
+The snapshot captures handle their own errors and save a Failed snapshot, so a capture
+stage is recorded as Failed when the snapshot it returns is not Success.
+"""
+
+import time
+
+import frappe
+from frappe.utils import now_datetime, today
+
+from prakash_steel.utils.planning_context import planning_context
+
+# (purchase, sell, buffer_flag, label) of the PO Recommendation snapshots captured daily
+PO_SNAPSHOT_COMBINATIONS = [
+	(1, 0, 1, "Purchase + Buffer"),
+	(1, 0, 0, "Purchase"),
+	(0, 1, 1, "Manufacture + Buffer"),
+	(0, 1, 0, "Manufacture"),
+]
+
+
+def run_morning_pipeline():
+	"""Scheduled job (hooks.py): queue the pipeline on the long queue, never twice at once."""
+	frappe.enqueue(
+		"prakash_steel.utils.morning_pipeline.execute_pipeline",
+		queue="long",
+		timeout=3600,
+		job_id="morning_planning_pipeline",
+		deduplicate=True,
+	)
+
+
+def execute_pipeline(trigger="Scheduled"):
+	from prakash_steel.po_recommendation_history.doctype.po_recommendation_snapshot import (
+		po_recommendation_snapshot as po_snapshot,
+	)
+	from prakash_steel.prakash_steel.doctype.purchase_order_recommendation_snapshot import (
+		purchase_order_recommendation_snapshot as open_po_snapshot,
+	)
+	from prakash_steel.prakash_steel.doctype.so_recommendation_snapshot import (
+		so_recommendation_snapshot as so_snapshot,
+	)
+	from prakash_steel.prakash_steel.doctype.stock_balance_snapshot import stock_balance_snapshot
+	from prakash_steel.prakash_steel.report.po_recomendation_for_psp import po_recomendation_for_psp
+
+	log = frappe.new_doc("Planning Pipeline Log")
+	log.run_date = today()
+	log.trigger = trigger
+	log.started_at = now_datetime()
+	started = time.monotonic()
+
+	# Start the load phase on a fresh transaction; its first read fixes the view all loads see
+	frappe.db.commit()
+
+	data = {}
+	with planning_context():
+		for purchase, sell, buffer_flag, label in PO_SNAPSHOT_COMBINATIONS:
+			filters = frappe._dict(purchase=purchase, sell=sell, buffer_flag=buffer_flag)
+			data[(purchase, sell, buffer_flag)] = _run_stage(
+				log,
+				f"Load PO Recommendation ({label})",
+				lambda filters=filters: _run_report(po_recomendation_for_psp.execute, filters),
+				rollback=False,
+			)
+
+		data["open_so"] = _run_stage(log, "Load Open SO Analysis", _load_open_so_analysis, rollback=False)
+		data["stock_balance"] = _run_stage(
+			log, "Load Item Wise Stock Balance", _load_item_wise_stock_balance, rollback=False
+		)
+		data["open_po"] = _run_stage(log, "Load Open PO Analysis", _load_open_po_analysis, rollback=False)
+
+		# End the read view and keep any Error Logs from the load phase out of later rollbacks
+		frappe.db.commit()
+
+		# Captures fall back to running their report when its load failed, and record a
+		# Failed snapshot if it fails again
+		for purchase, sell, buffer_flag, label in PO_SNAPSHOT_COMBINATIONS:
+			_run_stage(
+				log,
+				f"PO Recommendation Snapshot ({label})",
+				lambda purchase=purchase, sell=sell, buffer_flag=buffer_flag: _check_snapshot(
+					"PO Recommendation Snapshot",
+					po_snapshot._capture_snapshot(
+						purchase=purchase,
+						sell=sell,
+						buffer_flag=buffer_flag,
+						trigger=trigger,
+						data=data.get((purchase, sell, buffer_flag)),
+					),
+				),
+			)
+
+		_run_stage(
+			log,
+			"SO Recommendation Snapshot",
+			lambda: _check_snapshot(
+				"SO Recommendation Snapshot",
+				so_snapshot._capture_snapshot(trigger=trigger, data=data.get("open_so")),
+			),
+		)
+		_run_stage(
+			log,
+			"Stock Balance Snapshot",
+			lambda: _check_snapshot(
+				"Stock Balance Snapshot",
+				stock_balance_snapshot._capture_snapshot(trigger=trigger, data=data.get("stock_balance")),
+			),
+		)
+		_run_stage(
+			log,
+			"Purchase Order Recommendation Snapshot",
+			lambda: _check_snapshot(
+				"Purchase Order Recommendation Snapshot",
+				open_po_snapshot._capture_snapshot(trigger=trigger, data=data.get("open_po")),
+			),
+		)
+		_run_stage(
+			log,
+			"Daily On Hand Colour",
+			lambda: po_recomendation_for_psp.save_daily_on_hand_colour(
+				purchase_data=data.get((1, 0, 1)),
+				sell_data=data.get((0, 1, 1)),
+			),
+		)
+
+	failed = [stage for stage in log.stages if stage.status == "Failed"]
+	if not failed:
+		log.status = "Success"
+	elif len(failed) == len(log.stages):
+		log.status = "Failed"
+	else:
+		log.status = "Partial Success"
+
+	log.finished_at = now_datetime()
+	log.total_duration = round(time.monotonic() - started, 3)
+	log.insert(ignore_permissions=True)
+	frappe.db.commit()
+	return log.name
+
+
+@frappe.whitelist()
+def run_manual_pipeline():
+	frappe.only_for("System Manager")
+	frappe.enqueue(
+		"prakash_steel.utils.morning_pipeline.execute_pipeline",
+		queue="long",
+		timeout=3600,
+		job_id="morning_planning_pipeline",
+		deduplicate=True,
+		trigger="Manual",
+	)
+
+
+def _run_stage(log, stage, fn, rollback=True):
+	"""Run one stage and record its duration and outcome on the log; returns fn's result, or None if it failed."""
+	started = time.monotonic()
+	result, status, error = None, "Success", None
+	try:
+		result = fn()
+	except Exception:
+		# Load stages write nothing; rolling them back would end the shared read view
+		if rollback:
+			frappe.db.rollback()
+		status, error = "Failed", frappe.get_traceback()
+		frappe.log_error(error, f"Morning Pipeline: {stage} Failed")
+
+	log.append(
+		"stages",
+		{
+			"stage": stage,
+			"status": status,
+			"duration": round(time.monotonic() - started, 3),
+			"error": error,
+		},
+	)
+	return result
+
+
+def _check_snapshot(doctype, snapshot_name):
+	"""Raise when a capture saved a Failed snapshot, so its stage is recorded as Failed."""
+	if frappe.db.get_value(doctype, snapshot_name, "status") != "Success":
+		# The capture already logged its own traceback to the Error Log
+		frappe.throw(f"{doctype} {snapshot_name} was saved as Failed, see the Error Log for the cause")
+	return snapshot_name
+
+
+def _run_report(execute, filters):
+	return execute(filters)[1]
+
+
+def _load_open_so_analysis():
+	from prakash_steel.prakash_steel.report.open_so_analysis.open_so_analysis import execute
+
+	return _run_report(execute, frappe._dict(from_date="2000-01-01", to_date=today()))
+
+
+def _load_item_wise_stock_balance():
+	from prakash_steel.prakash_steel.report.item_wise_stock_balance.item_wise_stock_balance import execute
+
+	return _run_report(execute, frappe._dict(include_zero_stock=1))
+
+
+def _load_open_po_analysis():
+	from prakash_steel.prakash_steel.report.open_po_analysis.open_po_analysis import execute
+
+	return _run_report(execute, frappe._dict(from_date="2000-01-01", to_date=today()))
@@ -0,0 +1,178 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Open Demand Entry ledger.
+
+One row per open Sales Order line: item, delivery date, order date and the qty still to
+deliver. Planning reports and pages used to compute this with their own GROUP BY over
+`tabSales Order Item`, each treating custom_closed and over-delivery slightly
+differently. They now read this table, with one definition of open demand:
+
+- submitted Sales Order not Stopped / On Hold / Closed / Cancelled / Completed
+- line not custom_closed
+- open qty = max(0, qty - delivered_qty), lines with nothing left are not stored
+
+Rows are rebuilt per Sales Order on its on_change (submit, cancel, update after submit and
+status changes made through db_set) and on submit / cancel of the Delivery Notes and Sales
+Invoices delivering against it.
+"""
+
+from collections import defaultdict
+
+import frappe
+from frappe.utils import flt
+
+OPEN_DEMAND_QUERY = """
+	SELECT
+		soi.name AS sales_order_item,
+		so.name AS sales_order,
+		soi.item_code,
+		soi.delivery_date,
+		so.transaction_date,
+		GREATEST(0, soi.qty - IFNULL(soi.delivered_qty, 0)) AS open_qty
+	FROM
+		`tabSales Order` so
+	INNER JOIN
+		`tabSales Order Item` soi ON soi.parent = so.name
+	WHERE
+		so.name IN %(sales_orders)s
+		AND so.docstatus = 1
+		AND so.status NOT IN ('Stopped', 'On Hold', 'Closed', 'Cancelled', 'Completed')
+		AND IFNULL(soi.custom_closed, 0) = 0
+		AND soi.qty - IFNULL(soi.delivered_qty, 0) > 0
+"""
+
+REBUILD_BATCH_SIZE = 500
+
+
+def get_open_demand_map(item_codes=None, from_date=None, to_date=None):
+	"""Return {item_code: open qty}, optionally for some items and a delivery date range.
+
+	Lines without a delivery date count as due on 1900-01-01, as the old queries did.
+	"""
+	if item_codes is not None and not item_codes:
+		return {}
+
+	conditions = ""
+	values = {}
+	if item_codes is not None:
+		conditions += " AND item_code IN %(item_codes)s"
+		values["item_codes"] = tuple(item_codes)
+	if from_date:
+		conditions += " AND IFNULL(delivery_date, '1900-01-01') >= %(from_date)s"
+		values["from_date"] = from_date
+	if to_date:
+		conditions += " AND IFNULL(delivery_date, '1900-01-01') <= %(to_date)s"
+		values["to_date"] = to_date
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT item_code, SUM(open_qty) AS open_qty
+		FROM `tabOpen Demand Entry`
+		WHERE 1 = 1 {conditions}
+		GROUP BY item_code
+		""",
+		values,
+		as_dict=True,
+	)
+	return {row.item_code: flt(row.open_qty) for row in rows}
+
+
+def get_open_demand_lines(item_codes):
+	"""Return {item_code: [{open_qty, delivery_date, transaction_date}, ...]}, delivery date ascending."""
+	if not item_codes:
+		return {}
+
+	rows = frappe.db.sql(
+		"""
+		SELECT item_code, delivery_date, transaction_date, open_qty
+		FROM `tabOpen Demand Entry`
+		WHERE item_code IN %(item_codes)s
+		ORDER BY delivery_date ASC
+		""",
+		{"item_codes": tuple(item_codes)},
+		as_dict=True,
+	)
+
+	lines = defaultdict(list)
+	for row in rows:
+		lines[row.item_code].append(row)
+	return lines
+
+
+def update_open_demand(doc, method=None):
+	"""Doc event: Sales Order on_change, Delivery Note / Sales Invoice on_submit and on_cancel."""
+	sales_orders = get_affected_sales_orders(doc)
+	if sales_orders:
+		rebuild_open_demand(sales_orders)
+
+
+def get_affected_sales_orders(doc):
+	"""Sales Orders whose open qty a document can change."""
+	if doc.doctype == "Sales Order":
+		return [doc.name]
+
+	if doc.doctype == "Delivery Note":
+		return list({row.against_sales_order for row in doc.items if row.against_sales_order})
+
+	if doc.doctype == "Sales Invoice":
+		return list({row.sales_order for row in doc.items if row.sales_order})
+
+	return []
+
+
+def rebuild_open_demand(sales_orders=None):
+	"""Rebuild the rows of the given Sales Orders (default: every submitted Sales Order)."""
+	if sales_orders is None:
+		frappe.db.delete("Open Demand Entry")
+		sales_orders = frappe.db.sql_list(
+			"SELECT name FROM `tabSales Order` WHERE docstatus = 1 ORDER BY name"
+		)
+
+	sales_orders = list(sales_orders)
+	for start in range(0, len(sales_orders), REBUILD_BATCH_SIZE):
+		_rebuild_batch(sales_orders[start : start + REBUILD_BATCH_SIZE])
+
+
+def _rebuild_batch(sales_orders):
+	rows = frappe.db.sql(OPEN_DEMAND_QUERY, {"sales_orders": tuple(sales_orders)}, as_dict=True)
+
+	frappe.db.delete("Open Demand Entry", {"sales_order": ["in", sales_orders]})
+	if not rows:
+		return
+
+	now = frappe.utils.now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Open Demand Entry",
+		[
+			"name",
+			"sales_order",
+			"sales_order_item",
+			"item_code",
+			"delivery_date",
+			"transaction_date",
+			"open_qty",
+			"owner",
+			"modified_by",
+			"creation",
+			"modified",
+		],
+		[
+			(
+				frappe.generate_hash(length=10),
+				row.sales_order,
+				row.sales_order_item,
+				row.item_code,
+				row.delivery_date,
+				row.transaction_date,
+				row.open_qty,
+				user,
+				user,
+				now,
+				now,
+			)
+			for row in rows
+		],
+	)
@@ -0,0 +1,57 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Shared planning data for the morning pipeline.
+
+While a planning context is open (see utils/morning_pipeline.py), loaders wrapped with
+planning_cached / get_or_load run once and every later call in the same run gets a copy
+of the first result. Outside a context they query as before, so reports opened from the
+desk always see live data.
+"""
+
+import copy
+import functools
+from contextlib import contextmanager
+
+import frappe
+
+
+@contextmanager
+def planning_context():
+	"""Open a planning context for the duration of the `with` block."""
+	previous = getattr(frappe.local, "planning_context", None)
+	frappe.local.planning_context = {}
+	try:
+		yield frappe.local.planning_context
+	finally:
+		frappe.local.planning_context = previous
+
+
+def in_planning_context():
+	return getattr(frappe.local, "planning_context", None) is not None
+
+
+def get_or_load(key, loader):
+	"""Return the value cached under `key` in the open context, loading it on first use."""
+	context = getattr(frappe.local, "planning_context", None)
+	if context is None:
+		return loader()
+
+	if key not in context:
+		context[key] = loader()
+	# Callers adjust the maps they get back (e.g. spike_map.update), so hand out copies
+	return copy.deepcopy(context[key])
+
+
+def planning_cached(key):
+	"""Decorator for argument-independent loaders whose result can be shared within a context."""
+
+	def decorator(fn):
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			return get_or_load(key, lambda: fn(*args, **kwargs))
+
+		return wrapper
+
+	return decorator
@@ -0,0 +1,198 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Procurement Chain Entry fact table.
+
+Holds the MR item -> PO item -> PR item -> PI item chain the procurement trackers used
+to join on every run: one row per Material Request item line and each linked
+PO / PR / PI line (a line with several receipts or invoices gets one row per path).
+
+Rows are rebuilt per Material Request from the submitted documents whenever an MR, PO,
+PR or PI touching it is submitted, cancelled or updated after submit. Header statuses
+(MR status, PO workflow state / status / grand total) change without document events,
+so readers join those live from the parent by name.
+"""
+
+import frappe
+
+CHAIN_FIELDS = [
+	"material_request",
+	"mr_item",
+	"indent_date",
+	"item_code",
+	"item_name",
+	"requested_qty",
+	"uom",
+	"purchase_order",
+	"po_item",
+	"supplier",
+	"po_date",
+	"required_by",
+	"ordered_qty",
+	"po_uom",
+	"po_rate",
+	"discount",
+	"item_amount",
+	"purchase_receipt",
+	"pr_item",
+	"received_qty",
+	"receipt_date",
+	"pr_grand_total",
+	"purchase_invoice",
+	"pi_item",
+	"invoiced_qty",
+	"invoice_date",
+]
+
+# Same links and conditions the New Procurement Tracker joined through
+CHAIN_QUERY = """
+	SELECT
+		mr.name AS material_request,
+		mri.name AS mr_item,
+		mr.transaction_date AS indent_date,
+		mri.item_code,
+		mri.item_name,
+		mri.qty AS requested_qty,
+		mri.uom,
+
+		po.name AS purchase_order,
+		poi.name AS po_item,
+		po.supplier,
+		po.transaction_date AS po_date,
+		po.schedule_date AS required_by,
+		poi.qty AS ordered_qty,
+		poi.uom AS po_uom,
+		poi.rate AS po_rate,
+		poi.discount_amount AS discount,
+		poi.amount AS item_amount,
+
+		pr.name AS purchase_receipt,
+		pri.name AS pr_item,
+		pri.qty AS received_qty,
+		pr.posting_date AS receipt_date,
+		pr.grand_total AS pr_grand_total,
+
+		pi.name AS purchase_invoice,
+		pii.name AS pi_item,
+		pii.qty AS invoiced_qty,
+		pi.posting_date AS invoice_date
+
+	FROM
+		`tabMaterial Request` mr
+	LEFT JOIN
+		`tabMaterial Request Item` mri ON mri.parent = mr.name
+	LEFT JOIN
+		`tabPurchase Order Item` poi
+			ON poi.material_request_item = mri.name
+			AND EXISTS (
+				SELECT 1
+				FROM `tabPurchase Order` po_sub
+				WHERE po_sub.name = poi.parent
+				AND po_sub.docstatus = 1
+				AND po_sub.workflow_state != 'Cancelled'
+			)
+	LEFT JOIN
+		`tabPurchase Order` po
+			ON po.name = poi.parent
+			AND po.docstatus = 1
+			AND po.workflow_state != 'Cancelled'
+	LEFT JOIN
+		`tabPurchase Receipt Item` pri ON pri.purchase_order_item = poi.name
+	LEFT JOIN
+		`tabPurchase Receipt` pr ON pr.name = pri.parent AND pr.docstatus = 1
+	LEFT JOIN
+		`tabPurchase Invoice Item` pii ON pii.purchase_receipt = pr.name
+			AND pii.item_code = pri.item_code
+			AND pii.docstatus = 1
+	LEFT JOIN
+		`tabPurchase Invoice` pi ON pi.name = pii.parent AND pi.docstatus = 1
+
+	WHERE mr.docstatus = 1
+		AND mr.name IN %(material_requests)s
+"""
+
+REBUILD_BATCH_SIZE = 500
+
+
+def update_procurement_chain(doc, method=None):
+	"""Doc event (on_submit / on_cancel / on_update_after_submit) of MR, PO, PR and PI."""
+	material_requests = get_affected_material_requests(doc)
+	if material_requests:
+		rebuild_procurement_chain(material_requests)
+
+
+def get_affected_material_requests(doc):
+	"""Material Requests whose chain rows a document can add, change or remove."""
+	if doc.doctype == "Material Request":
+		return [doc.name]
+
+	if doc.doctype == "Purchase Order":
+		return list({row.material_request for row in doc.items if row.material_request})
+
+	if doc.doctype == "Purchase Receipt":
+		po_items = list({row.purchase_order_item for row in doc.items if row.purchase_order_item})
+		if not po_items:
+			return []
+		return frappe.db.sql_list(
+			"""
+			SELECT DISTINCT material_request
+			FROM `tabProcurement Chain Entry`
+			WHERE po_item IN %(po_items)s
+			""",
+			{"po_items": tuple(po_items)},
+		)
+
+	if doc.doctype == "Purchase Invoice":
+		receipts = list({row.purchase_receipt for row in doc.items if row.purchase_receipt})
+		if not receipts:
+			return []
+		return frappe.db.sql_list(
+			"""
+			SELECT DISTINCT material_request
+			FROM `tabProcurement Chain Entry`
+			WHERE purchase_receipt IN %(receipts)s
+			""",
+			{"receipts": tuple(receipts)},
+		)
+
+	return []
+
+
+def rebuild_procurement_chain(material_requests=None):
+	"""Rebuild the chain rows of the given Material Requests (default: every submitted MR)."""
+	if material_requests is None:
+		frappe.db.delete("Procurement Chain Entry")
+		material_requests = frappe.db.sql_list(
+			"SELECT name FROM `tabMaterial Request` WHERE docstatus = 1 ORDER BY name"
+		)
+
+	material_requests = list(material_requests)
+	for start in range(0, len(material_requests), REBUILD_BATCH_SIZE):
+		_rebuild_batch(material_requests[start : start + REBUILD_BATCH_SIZE])
+
+
+def _rebuild_batch(material_requests):
+	rows = frappe.db.sql(CHAIN_QUERY, {"material_requests": tuple(material_requests)}, as_dict=True)
+
+	frappe.db.delete("Procurement Chain Entry", {"material_request": ["in", material_requests]})
+	if not rows:
+		return
+
+	now = frappe.utils.now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Procurement Chain Entry",
+		["name", *CHAIN_FIELDS, "owner", "modified_by", "creation", "modified"],
+		[
+			(
+				frappe.generate_hash(length=10),
+				*(row.get(fieldname) for fieldname in CHAIN_FIELDS),
+				user,
+				user,
+				now,
+				now,
+			)
+			for row in rows
+		],
+	)
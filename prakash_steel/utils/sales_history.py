@@ -0,0 +1,91 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Item Customer Monthly Sales rollup.
+
+One row per (item, customer, month) holding the submitted Sales Invoice qty, so sales
+history reports read pre-summed months instead of every invoice line. Rows are rebuilt
+from the invoices rather than incremented, which keeps them correct across submit,
+cancel and amend in any order.
+"""
+
+import frappe
+from frappe.utils import get_first_day, get_last_day, getdate
+
+
+def update_monthly_sales_on_invoice(doc, method=None):
+	"""Sales Invoice on_submit / on_cancel: rebuild the invoice's (item, customer, month) rows."""
+	item_codes = list({item.item_code for item in doc.items if item.item_code})
+	if not item_codes or not doc.customer or not doc.posting_date:
+		return
+
+	rebuild_monthly_sales(doc.posting_date, customer=doc.customer, item_codes=item_codes)
+
+
+def rebuild_monthly_sales(month_date, customer=None, item_codes=None):
+	"""Rebuild the rollup rows of the month containing month_date, optionally for one customer / some items."""
+	month_start = get_first_day(getdate(month_date))
+	month_end = get_last_day(month_start)
+
+	conditions = ""
+	values = {"month_start": month_start, "month_end": month_end}
+	delete_filters = {"month_start": month_start}
+	if customer:
+		conditions += " AND si.customer = %(customer)s"
+		values["customer"] = customer
+		delete_filters["customer"] = customer
+	if item_codes:
+		conditions += " AND sii.item_code IN %(item_codes)s"
+		values["item_codes"] = tuple(item_codes)
+		delete_filters["item_code"] = ["in", list(item_codes)]
+
+	totals = frappe.db.sql(
+		f"""
+		SELECT sii.item_code, si.customer, SUM(sii.qty) AS qty
+		FROM `tabSales Invoice` si
+		INNER JOIN `tabSales Invoice Item` sii ON sii.parent = si.name
+		WHERE si.docstatus = 1
+			AND si.posting_date BETWEEN %(month_start)s AND %(month_end)s
+			AND IFNULL(sii.item_code, '') != ''
+			{conditions}
+		GROUP BY sii.item_code, si.customer
+		""",
+		values,
+		as_dict=True,
+	)
+
+	frappe.db.delete("Item Customer Monthly Sales", delete_filters)
+	if not totals:
+		return
+
+	now = frappe.utils.now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Item Customer Monthly Sales",
+		[
+			"name",
+			"item_code",
+			"customer",
+			"month_start",
+			"qty",
+			"owner",
+			"modified_by",
+			"creation",
+			"modified",
+		],
+		[
+			(
+				frappe.generate_hash(length=10),
+				row.item_code,
+				row.customer,
+				month_start,
+				row.qty or 0,
+				user,
+				user,
+				now,
+				now,
+			)
+			for row in totals
+		],
+	)
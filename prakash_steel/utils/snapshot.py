@@ -0,0 +1,741 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Snapshot storage helpers.
+
+Snapshots of the kinds in SNAPSHOT_TYPES are delta-encoded: a snapshot stores only
+the rows that changed since the previous snapshot of the same kind, with a full
+keyframe every `keyframe_interval` snapshots (Snapshot Settings). Every stored row
+carries a `row_key`; removed rows are stored as `is_deleted` markers.
+
+Only rows whose values changed are stored, wherever they moved to. A delta snapshot keeps
+its full row order once, as the list of row keys in `row_order`, and the rebuilt rows are
+sorted by it, so they come out in the same order as a full capture.
+
+Readers must go through get_snapshot_rows, which rebuilds the full snapshot from
+its keyframe and deltas in SQL. The Items table of a delta snapshot's Desk form shows
+only the stored (changed) rows.
+"""
+
+import frappe
+from frappe.model import no_value_fields, numeric_fieldtypes
+from frappe.utils import add_days, cint, flt, getdate, now_datetime, today
+
+# Rows per multi-row INSERT when writing snapshot child tables
+SNAPSHOT_CHUNK_SIZE = 1000
+
+DEFAULT_KEYFRAME_INTERVAL = 7
+
+# A delta larger than this share of the snapshot is stored as a full keyframe instead
+MAX_DELTA_RATIO = 0.5
+
+# Rows per page returned by get_snapshot_page
+DEFAULT_PAGE_LENGTH = 500
+
+SNAPSHOT_TYPES = {
+	"PO Recommendation Snapshot": {
+		"child_doctype": "PO Recommendation Snapshot Item",
+		"count_field": "item_count",
+		# Parent fields that must match for two snapshots to be "the same kind"
+		"kind_fields": ("purchase", "sell", "buffer_flag", "sku_type_filter", "item_code_filter"),
+		# Child fields identifying a row across snapshots
+		"key_fields": ("item_code", "sku_type", "child_item_code"),
+	},
+	"SO Recommendation Snapshot": {
+		"child_doctype": "SO Recommendation Snapshot Item",
+		"count_field": "row_count",
+		"kind_fields": (),
+		"key_fields": ("sales_order", "item_code"),
+	},
+	"Stock Balance Snapshot": {
+		"child_doctype": "Stock Balance Snapshot Item",
+		"count_field": "row_count",
+		"kind_fields": (),
+		"key_fields": ("item_code",),
+	},
+}
+
+
+def insert_snapshot(snap, child_doctype, rows, parentfield="items", count_field="row_count"):
+	"""
+	Insert a snapshot parent once through the ORM and write its child rows in bulk.
+
+	Child rows skip per-row ORM validation/naming and go in as chunked multi-row
+	INSERTs, which keeps capture time and lock duration low for large snapshots.
+	Snapshot kinds listed in SNAPSHOT_TYPES are stored as deltas where possible.
+
+	Args:
+		snap: New (unsaved) snapshot Document with header fields set
+		child_doctype (str): Child table DocType, e.g. "SO Recommendation Snapshot Item"
+		rows (list): List of dicts keyed by child fieldname (all with the same keys)
+		parentfield (str): Table fieldname on the parent
+		count_field (str): Parent field holding the number of rows
+
+	Returns:
+		str: Snapshot document name
+	"""
+	stored_rows = rows
+	config = SNAPSHOT_TYPES.get(snap.doctype)
+	if config:
+		rows = _with_row_keys(rows, config["key_fields"])
+		stored_rows = _encode_snapshot(snap, rows, config)
+
+	snap.insert(ignore_permissions=True)
+	bulk_insert_child_rows(snap, child_doctype, stored_rows, parentfield=parentfield)
+	# before_save counts snap.items, which is empty here — store the real count
+	snap.db_set(count_field, len(rows), update_modified=False)
+	return snap.name
+
+
+def bulk_insert_child_rows(parent_doc, child_doctype, rows, parentfield="items", start_idx=1):
+	"""Write child rows for an already inserted parent with chunked multi-row INSERTs."""
+	if not rows:
+		return
+
+	row_fields = list(rows[0])
+	# Numeric columns are NOT NULL; coerce None to 0 like the ORM does
+	meta = frappe.get_meta(child_doctype)
+	numeric_fields = {
+		fieldname
+		for fieldname in row_fields
+		if (df := meta.get_field(fieldname)) and df.fieldtype in numeric_fieldtypes
+	}
+
+	fields = [
+		"name",
+		"parent",
+		"parenttype",
+		"parentfield",
+		"idx",
+		"docstatus",
+		"owner",
+		"modified_by",
+		"creation",
+		"modified",
+		*row_fields,
+	]
+
+	now = now_datetime()
+	user = frappe.session.user
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			parent_doc.name,
+			parent_doc.doctype,
+			parentfield,
+			idx,
+			parent_doc.docstatus or 0,
+			user,
+			user,
+			now,
+			now,
+			*(
+				(row.get(fieldname) or 0) if fieldname in numeric_fields else row.get(fieldname)
+				for fieldname in row_fields
+			),
+		)
+		for idx, row in enumerate(rows, start=start_idx)
+	]
+
+	frappe.db.bulk_insert(child_doctype, fields, values, chunk_size=SNAPSHOT_CHUNK_SIZE)
+
+
+def get_snapshot_rows(doctype, snapshot_name, fields=None, filters=None, order_by=None, limit=None, start=0):
+	"""
+	Return the full rows of a snapshot, rebuilding delta snapshots from their chain.
+
+	Args:
+		doctype (str): Snapshot DocType
+		snapshot_name (str): Snapshot name
+		fields (list): Child fieldnames to return (all data fields if not given)
+		filters (dict): {fieldname: value} or {fieldname: [operator, value]} applied to the rebuilt rows
+		order_by (str): ORDER BY clause over child fieldnames
+		limit (int): Page length (all rows if not given)
+		start (int): Page offset
+
+	Returns:
+		list: frappe._dict rows
+	"""
+	config = SNAPSHOT_TYPES[doctype]
+	child_doctype = config["child_doctype"]
+	fields = fields or get_snapshot_row_fields(child_doctype)
+	filters = filters or {}
+
+	snapshot = frappe.db.get_value(
+		doctype,
+		snapshot_name,
+		["name", "storage_mode", "keyframe_snapshot", "delta_seq", "row_order"],
+		as_dict=True,
+	)
+	if not snapshot:
+		return []
+
+	if snapshot.storage_mode != "Delta":
+		return frappe.get_all(
+			child_doctype,
+			filters={"parent": snapshot.name, **filters},
+			fields=fields,
+			order_by=order_by or "idx asc",
+			limit_start=start,
+			limit_page_length=limit or 0,
+		)
+
+	source, values = _snapshot_source(doctype, snapshot, child_doctype, filters)
+	select_fields = ", ".join(f"`{fieldname}`" for fieldname in fields)
+
+	if order_by:
+		limit_clause = f"LIMIT {cint(start)}, {cint(limit)}" if limit else ""
+		return frappe.db.sql(
+			f"""
+			SELECT {select_fields}
+			FROM ({source}) src
+			ORDER BY {order_by}
+			{limit_clause}
+			""",
+			values,
+			as_dict=True,
+		)
+
+	# Unchanged rows keep the idx of the snapshot that stored them, so the capture order comes
+	# from row_order; idx only orders deltas stored before row_order existed
+	rows = frappe.db.sql(
+		f"SELECT {select_fields}, `row_key` AS _row_key FROM ({source}) src ORDER BY idx asc",
+		values,
+		as_dict=True,
+	)
+	positions = {row_key: i for i, row_key in enumerate(frappe.parse_json(snapshot.row_order) or [])}
+	rows.sort(key=lambda row: positions.get(row._row_key, len(positions)))
+	for row in rows:
+		del row["_row_key"]
+
+	return rows[cint(start) : cint(start) + cint(limit)] if limit else rows[cint(start) :]
+
+
+def get_snapshot_page(
+	doctype,
+	snapshot_name,
+	fields,
+	sort_keys,
+	sort_order="asc",
+	cursor=None,
+	page_length=DEFAULT_PAGE_LENGTH,
+	filters=None,
+	conditions=None,
+	child_doctype=None,
+):
+	"""
+	Return one keyset-paginated page of a snapshot's rows.
+
+	Rows are ordered by `sort_keys` and then by row name, all in `sort_order`. The
+	cursor returned with a page holds the sort values of its last row, so the next
+	page is a range read instead of an OFFSET scan over the rows already sent.
+
+	Args:
+		doctype (str): Snapshot DocType
+		snapshot_name (str): Snapshot name
+		fields (list): Child fieldnames to return
+		sort_keys (list): SQL expressions over child columns; callers must only pass allowlisted fields
+		sort_order (str): "asc" or "desc"
+		cursor (str): `next_cursor` of the previous page; first page if not given
+		page_length (int): Rows per page; 0 returns every row in one page
+		filters (dict): Same format as get_snapshot_rows
+		conditions (list): Extra SQL conditions over the rebuilt rows, aliased `src`
+		child_doctype (str): Child table DocType, for snapshots not listed in SNAPSHOT_TYPES
+
+	Returns:
+		frappe._dict: data (rows), next_cursor (None on the last page) and total
+		(row count on the first page only, None otherwise)
+	"""
+	sort_order = (sort_order or "asc").lower()
+	if sort_order not in ("asc", "desc"):
+		frappe.throw(frappe._("Invalid sort order: {0}").format(sort_order))
+
+	child_doctype = child_doctype or SNAPSHOT_TYPES[doctype]["child_doctype"]
+	storage_fields = ["name"]
+	if doctype in SNAPSHOT_TYPES:
+		storage_fields += ["storage_mode", "keyframe_snapshot", "delta_seq"]
+	snapshot = frappe.db.get_value(doctype, snapshot_name, storage_fields, as_dict=True)
+	if not snapshot:
+		return frappe._dict(data=[], next_cursor=None, total=0)
+
+	source, values = _snapshot_source(doctype, snapshot, child_doctype, filters or {})
+	source_where = " AND ".join(f"({condition})" for condition in conditions or [])
+	source_where = f"WHERE {source_where}" if source_where else ""
+
+	total = None
+	if not cursor:
+		total = frappe.db.sql(f"SELECT COUNT(*) FROM ({source}) src {source_where}", values)[0][0]
+
+	sort_columns = [f"_sort_{i}" for i in range(len(sort_keys))] + ["_row_name"]
+	cursor_clause = _get_cursor_clause(cursor, sort_columns, sort_order, values)
+
+	select_fields = ", ".join(f"src.`{fieldname}`" for fieldname in fields)
+	sort_select = ", ".join(f"{expression} AS _sort_{i}" for i, expression in enumerate(sort_keys))
+	limit_clause = f"LIMIT {cint(page_length) + 1}" if cint(page_length) else ""
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT *
+		FROM (
+			SELECT {select_fields}, {sort_select + "," if sort_select else ""} src.name AS _row_name
+			FROM ({source}) src
+			{source_where}
+		) page
+		{cursor_clause}
+		ORDER BY {", ".join(f"{column} {sort_order}" for column in sort_columns)}
+		{limit_clause}
+		""",
+		values,
+		as_dict=True,
+	)
+
+	rows, next_cursor = _split_page(rows, sort_columns, page_length)
+	for row in rows:
+		for column in sort_columns:
+			row.pop(column, None)
+
+	return frappe._dict(data=rows, next_cursor=next_cursor, total=total)
+
+
+def diff_snapshots(
+	doctype,
+	old_snapshot_name,
+	new_snapshot_name,
+	compare_fields,
+	filters=None,
+	cursor=None,
+	page_length=DEFAULT_PAGE_LENGTH,
+):
+	"""
+	Return the rows that differ between two snapshots of the same kind.
+
+	Both snapshots are rebuilt and joined on their key fields in one SQL statement
+	(a full outer join, as a LEFT JOIN plus an anti-join), so only changed rows reach
+	Python. Rows are ordered by key fields and paged with a cursor like get_snapshot_page.
+
+	Args:
+		doctype (str): Snapshot DocType listed in SNAPSHOT_TYPES
+		old_snapshot_name (str): Snapshot to compare from
+		new_snapshot_name (str): Snapshot to compare to
+		compare_fields (list): Child fieldnames whose changes are reported
+		filters (dict): Same format as get_snapshot_rows, applied to both snapshots
+		cursor (str): `next_cursor` of the previous page; first page if not given
+		page_length (int): Rows per page; 0 returns every changed row in one page
+
+	Returns:
+		frappe._dict: data, next_cursor and summary ({change_type: count}, first page only).
+		Each row has the key fields, change_type ("Added", "Removed" or "Changed") and
+		old_<field> / new_<field> for every compare field, plus <field>_delta for numeric ones.
+	"""
+	config = SNAPSHOT_TYPES[doctype]
+	child_doctype = config["child_doctype"]
+	key_fields = config["key_fields"]
+	meta = frappe.get_meta(child_doctype)
+	numeric_fields = {
+		fieldname
+		for fieldname in compare_fields
+		if (df := meta.get_field(fieldname)) and df.fieldtype in numeric_fieldtypes
+	}
+
+	storage_fields = ["name", "storage_mode", "keyframe_snapshot", "delta_seq"]
+	old_snapshot = frappe.db.get_value(doctype, old_snapshot_name, storage_fields, as_dict=True)
+	new_snapshot = frappe.db.get_value(doctype, new_snapshot_name, storage_fields, as_dict=True)
+	if not old_snapshot or not new_snapshot:
+		return frappe._dict(data=[], next_cursor=None, summary={})
+
+	old_source, values = _snapshot_source(doctype, old_snapshot, child_doctype, filters or {}, prefix="old_")
+	new_source, new_values = _snapshot_source(
+		doctype, new_snapshot, child_doctype, filters or {}, prefix="new_"
+	)
+	values.update(new_values)
+
+	# Repeated keys within a snapshot are matched by occurrence, like row_key
+	partition = ", ".join(f"IFNULL(src.`{fieldname}`, '')" for fieldname in key_fields)
+	join = " AND ".join(
+		f"IFNULL(n.`{fieldname}`, '') = IFNULL(o.`{fieldname}`, '')" for fieldname in key_fields
+	)
+	join += " AND n._occurrence = o._occurrence"
+
+	changed = []
+	new_columns, removed_columns = [], []
+	for fieldname in compare_fields:
+		new_columns += [f"o.`{fieldname}` AS `old_{fieldname}`", f"n.`{fieldname}` AS `new_{fieldname}`"]
+		removed_columns += [f"o.`{fieldname}` AS `old_{fieldname}`", f"NULL AS `new_{fieldname}`"]
+		if fieldname in numeric_fields:
+			changed.append(f"ABS(IFNULL(n.`{fieldname}`, 0) - IFNULL(o.`{fieldname}`, 0)) > 0.000001")
+			new_columns.append(
+				f"IFNULL(n.`{fieldname}`, 0) - IFNULL(o.`{fieldname}`, 0) AS `{fieldname}_delta`"
+			)
+			removed_columns.append(f"0 - IFNULL(o.`{fieldname}`, 0) AS `{fieldname}_delta`")
+		else:
+			changed.append(f"IFNULL(n.`{fieldname}`, '') != IFNULL(o.`{fieldname}`, '')")
+
+	diff = f"""
+		WITH
+			old_rows AS (
+				SELECT src.*, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY src.idx) AS _occurrence
+				FROM ({old_source}) src
+			),
+			new_rows AS (
+				SELECT src.*, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY src.idx) AS _occurrence
+				FROM ({new_source}) src
+			),
+			diff AS (
+				SELECT
+					{", ".join(f"IFNULL(n.`{fieldname}`, '') AS `{fieldname}`" for fieldname in key_fields)},
+					n._occurrence AS _occurrence,
+					IF(o._occurrence IS NULL, 'Added', 'Changed') AS change_type,
+					{", ".join(new_columns)}
+				FROM new_rows n
+				LEFT JOIN old_rows o ON {join}
+				WHERE o._occurrence IS NULL OR {" OR ".join(changed)}
+				UNION ALL
+				SELECT
+					{", ".join(f"IFNULL(o.`{fieldname}`, '') AS `{fieldname}`" for fieldname in key_fields)},
+					o._occurrence AS _occurrence,
+					'Removed' AS change_type,
+					{", ".join(removed_columns)}
+				FROM old_rows o
+				LEFT JOIN new_rows n ON {join}
+				WHERE n._occurrence IS NULL
+			)
+	"""
+
+	summary = None
+	if not cursor:
+		summary = dict(
+			frappe.db.sql(f"{diff} SELECT change_type, COUNT(*) FROM diff GROUP BY change_type", values)
+		)
+
+	sort_columns = [*key_fields, "_occurrence"]
+	cursor_clause = _get_cursor_clause(cursor, sort_columns, "asc", values)
+	limit_clause = f"LIMIT {cint(page_length) + 1}" if cint(page_length) else ""
+
+	rows = frappe.db.sql(
+		f"""
+		{diff}
+		SELECT * FROM diff
+		{cursor_clause}
+		ORDER BY {", ".join(f"`{column}`" for column in sort_columns)}
+		{limit_clause}
+		""",
+		values,
+		as_dict=True,
+	)
+
+	rows, next_cursor = _split_page(rows, sort_columns, page_length)
+	for row in rows:
+		row.pop("_occurrence", None)
+
+	return frappe._dict(data=rows, next_cursor=next_cursor, summary=summary)
+
+
+def get_snapshot_row_fields(child_doctype):
+	"""Return the data fieldnames of a snapshot child DocType."""
+	return [
+		df.fieldname for df in frappe.get_meta(child_doctype).fields if df.fieldtype not in no_value_fields
+	]
+
+
+def compact_old_snapshots():
+	"""
+	Scheduled job: compact snapshots older than Snapshot Settings' retention age.
+
+	"Keep Month End" keeps the last successful snapshot of each month per kind, stored
+	in full, and deletes the rest; "Delete" removes everything past the retention age.
+	"""
+	retention_days = cint(frappe.db.get_single_value("Snapshot Settings", "retention_days"))
+	if retention_days <= 0:
+		return
+
+	retention_mode = frappe.db.get_single_value("Snapshot Settings", "retention_mode") or "Keep Month End"
+	cutoff = add_days(today(), -retention_days)
+
+	for doctype, config in SNAPSHOT_TYPES.items():
+		try:
+			_compact_snapshots(doctype, config, cutoff, keep_month_end=retention_mode == "Keep Month End")
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(frappe.get_traceback(), f"{doctype} Compaction Failed")
+
+
+def _with_row_keys(rows, key_fields):
+	"""Add a row_key to every row; repeated keys get an occurrence suffix."""
+	seen = {}
+	keyed_rows = []
+	for row in rows:
+		base_key = "|".join(str(row.get(fieldname) or "") for fieldname in key_fields)
+		occurrence = seen.get(base_key, 0)
+		seen[base_key] = occurrence + 1
+		keyed_rows.append({**row, "row_key": f"{base_key}|{occurrence}", "is_deleted": 0})
+	return keyed_rows
+
+
+def _encode_snapshot(snap, rows, config):
+	"""Decide between a keyframe and a delta, set the storage fields on snap and return the rows to store."""
+	snap.storage_mode = "Full"
+	snap.keyframe_snapshot = None
+	snap.delta_seq = 0
+	snap.row_order = None
+
+	keyframe_interval = (
+		cint(frappe.db.get_single_value("Snapshot Settings", "keyframe_interval"))
+		or DEFAULT_KEYFRAME_INTERVAL
+	)
+	previous = _get_previous_snapshot(snap, config)
+	if not rows or not previous or cint(previous.delta_seq) + 1 >= keyframe_interval:
+		return rows
+
+	fields = list(rows[0])
+	previous_rows = get_snapshot_rows(snap.doctype, previous.name, fields=fields)
+	if any(not row.row_key for row in previous_rows):
+		# Captured before delta storage; start a new chain
+		return rows
+
+	previous_by_key = {row.row_key: row for row in previous_rows}
+	current_keys = {row["row_key"] for row in rows}
+
+	# Only changed rows are stored; a row that just moved is placed by row_order on read
+	delta_rows = [row for row in rows if _row_changed(row, previous_by_key.get(row["row_key"]), fields)]
+	delta_rows.extend(
+		{**row, "is_deleted": 1} for key, row in previous_by_key.items() if key not in current_keys
+	)
+
+	if len(delta_rows) > len(rows) * MAX_DELTA_RATIO:
+		return rows
+
+	snap.storage_mode = "Delta"
+	snap.keyframe_snapshot = previous.keyframe_snapshot if previous.storage_mode == "Delta" else previous.name
+	snap.delta_seq = cint(previous.delta_seq) + 1
+	snap.row_order = frappe.as_json([row["row_key"] for row in rows], indent=None)
+	return delta_rows
+
+
+def _get_previous_snapshot(snap, config):
+	meta = frappe.get_meta(snap.doctype)
+	filters = {"status": "Success"}
+	for fieldname in config["kind_fields"]:
+		if meta.get_field(fieldname).fieldtype in numeric_fieldtypes:
+			filters[fieldname] = cint(snap.get(fieldname))
+		else:
+			filters[fieldname] = snap.get(fieldname) or ""
+
+	previous = frappe.get_all(
+		snap.doctype,
+		filters=filters,
+		fields=["name", "storage_mode", "keyframe_snapshot", "delta_seq"],
+		order_by="snapshot_date desc, snapshot_time desc, creation desc",
+		limit=1,
+	)
+	return previous[0] if previous else None
+
+
+def _row_changed(row, previous_row, fields):
+	if not previous_row:
+		return True
+	return any(
+		_normalize(row.get(fieldname)) != _normalize(previous_row.get(fieldname)) for fieldname in fields
+	)
+
+
+def _normalize(value):
+	if value is None or value == "":
+		return ""
+	if isinstance(value, int | float) or type(value).__name__ == "Decimal":
+		# Float columns are stored with 9 decimals; compare at a safe precision
+		return flt(value, 6) or ""
+	return str(value)
+
+
+def _snapshot_source(doctype, snapshot, child_doctype, filters, prefix=""):
+	"""
+	Return (sql, values) for a subquery yielding the full rows of a snapshot with filters applied.
+
+	`prefix` namespaces the query parameters so two sources can share one statement.
+
+	Delta snapshots are rebuilt from their chain: the latest version of each row wins
+	and deleted markers drop the row. Rows without a row_key (captured before delta
+	storage) are never superseded. Filters on key fields are applied before rebuilding,
+	since every version of a row shares them, so they can use the child table indexes.
+	"""
+	if snapshot.get("storage_mode") != "Delta":
+		conditions, values = _build_conditions(filters, prefix=f"{prefix}filter")
+		values[f"{prefix}snapshot"] = snapshot.name
+		return (
+			f"SELECT t.* FROM `tab{child_doctype}` t WHERE t.parent = %({prefix}snapshot)s {conditions}",
+			values,
+		)
+
+	key_fields = SNAPSHOT_TYPES[doctype]["key_fields"]
+	key_conditions, values = _build_conditions(
+		{fieldname: value for fieldname, value in filters.items() if fieldname in key_fields},
+		prefix=f"{prefix}key",
+		alias="t",
+	)
+	conditions, row_values = _build_conditions(
+		{fieldname: value for fieldname, value in filters.items() if fieldname not in key_fields},
+		prefix=f"{prefix}filter",
+	)
+	values.update(row_values)
+	values[f"{prefix}chain"] = tuple(
+		[
+			snapshot.keyframe_snapshot,
+			*frappe.get_all(
+				doctype,
+				filters={
+					"keyframe_snapshot": snapshot.keyframe_snapshot,
+					"storage_mode": "Delta",
+					"delta_seq": ["<=", snapshot.delta_seq],
+				},
+				pluck="name",
+			),
+		]
+	)
+
+	return (
+		f"""
+		SELECT *
+		FROM (
+			SELECT
+				t.*,
+				ROW_NUMBER() OVER (
+					PARTITION BY COALESCE(t.row_key, t.name)
+					ORDER BY IFNULL(s.delta_seq, 0) DESC
+				) AS _version
+			FROM `tab{child_doctype}` t
+			INNER JOIN `tab{doctype}` s ON s.name = t.parent
+			WHERE t.parent IN %({prefix}chain)s {key_conditions}
+		) rebuilt
+		WHERE _version = 1 AND is_deleted = 0 {conditions}
+		""",
+		values,
+	)
+
+
+def _get_cursor_clause(cursor, sort_columns, sort_order, values):
+	"""Return a WHERE clause selecting rows after `cursor` in (sort_columns) order, adding its values."""
+	if not cursor:
+		return ""
+
+	cursor_values = frappe.parse_json(cursor)
+	if not isinstance(cursor_values, list) or len(cursor_values) != len(sort_columns):
+		frappe.throw(frappe._("Invalid cursor"))
+
+	placeholders = []
+	for i, value in enumerate(cursor_values):
+		values[f"cursor_{i}"] = value
+		placeholders.append(f"%(cursor_{i})s")
+
+	comparison = ">" if sort_order == "asc" else "<"
+	columns = ", ".join(f"`{column}`" for column in sort_columns)
+	return f"WHERE ({columns}) {comparison} ({', '.join(placeholders)})"
+
+
+def _split_page(rows, sort_columns, page_length):
+	"""Trim the look-ahead row fetched past page_length and return (rows, next_cursor)."""
+	page_length = cint(page_length)
+	if not page_length or len(rows) <= page_length:
+		return rows, None
+
+	rows = rows[:page_length]
+	return rows, frappe.as_json([rows[-1][column] for column in sort_columns], indent=None)
+
+
+def _build_conditions(filters, prefix="filter", alias=None):
+	operators = {"=", "!=", "<", ">", "<=", ">=", "in", "not in", "like"}
+	conditions = []
+	values = {}
+	for i, (fieldname, condition) in enumerate(filters.items()):
+		operator, value = condition if isinstance(condition, list | tuple) else ("=", condition)
+		operator = operator.lower()
+		if operator not in operators:
+			frappe.throw(frappe._("Unsupported snapshot filter operator: {0}").format(operator))
+		key = f"{prefix}_{i}"
+		if operator in ("in", "not in"):
+			value = tuple(value) or ("",)
+		column = f"{alias}.`{fieldname}`" if alias else f"`{fieldname}`"
+		conditions.append(f"AND {column} {operator} %({key})s")
+		values[key] = value
+	return " ".join(conditions), values
+
+
+def _compact_snapshots(doctype, config, cutoff, keep_month_end=True):
+	kind_fields = list(config["kind_fields"])
+	old_snapshots = frappe.get_all(
+		doctype,
+		filters={"snapshot_date": ["<", cutoff]},
+		fields=["name", "snapshot_date", "status", *kind_fields],
+		order_by="snapshot_date asc, snapshot_time asc, creation asc",
+	)
+	if not old_snapshots:
+		return
+
+	keep = {}
+	kinds = {}
+	for snapshot in old_snapshots:
+		if snapshot.status != "Success":
+			continue
+		kind = tuple(snapshot.get(fieldname) or "" for fieldname in kind_fields)
+		kinds[kind] = dict(zip(kind_fields, kind, strict=True))
+		if keep_month_end:
+			# Ordered ascending, so the last snapshot of each month wins
+			month = getdate(snapshot.snapshot_date).strftime("%Y-%m")
+			keep[(kind, month)] = snapshot.name
+
+	# The first snapshot past the cutoff may be a delta on top of snapshots about to go
+	for kind_filters in kinds.values():
+		first_retained = frappe.get_all(
+			doctype,
+			filters={"snapshot_date": [">=", cutoff], "status": "Success", **kind_filters},
+			order_by="snapshot_date asc, snapshot_time asc, creation asc",
+			pluck="name",
+			limit=1,
+		)
+		if first_retained:
+			_materialize_snapshot(doctype, first_retained[0], config)
+
+	keep_names = set(keep.values())
+	for snapshot in old_snapshots:
+		if snapshot.name in keep_names:
+			_materialize_snapshot(doctype, snapshot.name, config)
+
+	for snapshot in old_snapshots:
+		if snapshot.name not in keep_names:
+			frappe.delete_doc(
+				doctype, snapshot.name, ignore_permissions=True, force=True, delete_permanently=True
+			)
+
+
+def _materialize_snapshot(doctype, snapshot_name, config):
+	"""Rewrite a delta snapshot as a full keyframe and re-point the deltas that followed it."""
+	snapshot = frappe.db.get_value(
+		doctype, snapshot_name, ["name", "storage_mode", "keyframe_snapshot", "delta_seq"], as_dict=True
+	)
+	if not snapshot or snapshot.storage_mode != "Delta":
+		return
+
+	child_doctype = config["child_doctype"]
+	fields = get_snapshot_row_fields(child_doctype)
+	rows = [dict(row) for row in get_snapshot_rows(doctype, snapshot_name, fields=fields)]
+
+	frappe.db.delete(child_doctype, {"parent": snapshot_name})
+	bulk_insert_child_rows(
+		frappe._dict(name=snapshot_name, doctype=doctype, docstatus=0), child_doctype, rows
+	)
+
+	frappe.db.sql(
+		f"""
+		UPDATE `tab{doctype}`
+		SET keyframe_snapshot = %(name)s, delta_seq = delta_seq - %(seq)s
+		WHERE keyframe_snapshot = %(keyframe)s AND delta_seq > %(seq)s
+		""",
+		{"name": snapshot_name, "seq": cint(snapshot.delta_seq), "keyframe": snapshot.keyframe_snapshot},
+	)
+	frappe.db.set_value(
+		doctype,
+		snapshot_name,
+		{"storage_mode": "Full", "keyframe_snapshot": None, "delta_seq": 0, "row_order": None},
+		update_modified=False,
+	)
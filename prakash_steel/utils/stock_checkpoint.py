@@ -0,0 +1,278 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Month-end stock checkpoints for as-of-date stock queries.
+
+Stock Closing Checkpoint holds, per month end, item and warehouse, the
+qty_after_transaction of the last non-cancelled Stock Ledger Entry on or before that date
+(zero balances are not stored). Stock as of any date D is then, per item and warehouse,
+the last SLE on or before D when there is one after the latest checkpoint, else that
+checkpoint, instead of reading every SLE since the beginning.
+
+Balances always come from qty_after_transaction, never from a sum of actual_qty: a Stock
+Reconciliation entry sets the balance itself, and its actual_qty, like that of entries
+posted before it, is only final once reposting has run.
+
+- build_stock_checkpoints (daily) adds the month ends that are missing, each from the
+  previous checkpoint and that month's SLEs.
+- refresh_item_checkpoints resets one item / warehouse's checkpoints from a date on.
+  - update_checkpoints_for_sle (Stock Ledger Entry on_submit) queues it after commit for
+    an entry posted on or before the latest checkpoint.
+  - refresh_checkpoints_after_repost (Repost Item Valuation on_change) runs it for the
+    repost's items and warehouses once the repost is Completed.
+"""
+
+import hashlib
+
+import frappe
+from frappe.utils import add_days, add_months, flt, get_last_day, getdate, today
+
+# Month ends seeded when no checkpoint exists yet
+CHECKPOINT_HISTORY_MONTHS = 12
+
+
+def get_stock_as_of(as_of_date, item_codes=None, warehouse=None):
+	"""Return {item_code: qty} as of the end of as_of_date, optionally for some items / one warehouse."""
+	as_of_date = getdate(as_of_date)
+	if item_codes is not None and not item_codes:
+		return {}
+
+	conditions = ""
+	values = {"as_of_date": as_of_date}
+	if item_codes is not None:
+		conditions += " AND item_code IN %(item_codes)s"
+		values["item_codes"] = tuple(item_codes)
+	if warehouse:
+		conditions += " AND warehouse = %(warehouse)s"
+		values["warehouse"] = warehouse
+
+	checkpoint_date = frappe.db.sql(
+		"""
+		SELECT MAX(checkpoint_date)
+		FROM `tabStock Closing Checkpoint`
+		WHERE checkpoint_date <= %(as_of_date)s
+		""",
+		values,
+	)[0][0]
+
+	balances = {}
+	if checkpoint_date:
+		values["checkpoint_date"] = checkpoint_date
+		for item_code, row_warehouse, qty in frappe.db.sql(
+			f"""
+			SELECT item_code, warehouse, qty
+			FROM `tabStock Closing Checkpoint`
+			WHERE checkpoint_date = %(checkpoint_date)s {conditions}
+			""",
+			values,
+		):
+			balances[(item_code, row_warehouse)] = flt(qty)
+
+	balances.update(_get_ledger_balances(as_of_date, checkpoint_date, conditions, values))
+
+	stock = {}
+	for (item_code, _warehouse), qty in balances.items():
+		stock[item_code] = stock.get(item_code, 0) + qty
+	return stock
+
+
+def build_stock_checkpoints():
+	"""Scheduler: add every missing month-end checkpoint up to the last completed month."""
+	last_month_end = get_last_day(add_months(today(), -1))
+	latest = frappe.db.sql("SELECT MAX(checkpoint_date) FROM `tabStock Closing Checkpoint`")[0][0]
+
+	if latest:
+		checkpoint_date = get_last_day(add_days(latest, 1))
+	else:
+		checkpoint_date = get_last_day(add_months(last_month_end, 1 - CHECKPOINT_HISTORY_MONTHS))
+
+	while checkpoint_date <= last_month_end:
+		build_checkpoint(checkpoint_date)
+		frappe.db.commit()
+		checkpoint_date = get_last_day(add_days(checkpoint_date, 1))
+
+
+def build_checkpoint(checkpoint_date):
+	"""(Re)build one checkpoint: the previous checkpoint, overridden by the last SLE since for each item / warehouse."""
+	checkpoint_date = getdate(checkpoint_date)
+	previous = frappe.db.sql(
+		"""
+		SELECT MAX(checkpoint_date)
+		FROM `tabStock Closing Checkpoint`
+		WHERE checkpoint_date < %s
+		""",
+		checkpoint_date,
+	)[0][0]
+
+	balances = {}
+	if previous:
+		for item_code, warehouse, qty in frappe.db.sql(
+			"""
+			SELECT item_code, warehouse, qty
+			FROM `tabStock Closing Checkpoint`
+			WHERE checkpoint_date = %s
+			""",
+			previous,
+		):
+			balances[(item_code, warehouse)] = flt(qty)
+
+	balances.update(_get_ledger_balances(checkpoint_date, previous))
+
+	frappe.db.delete("Stock Closing Checkpoint", {"checkpoint_date": checkpoint_date})
+
+	now = frappe.utils.now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Stock Closing Checkpoint",
+		[
+			"name",
+			"checkpoint_date",
+			"item_code",
+			"warehouse",
+			"qty",
+			"owner",
+			"modified_by",
+			"creation",
+			"modified",
+		],
+		[
+			(
+				_checkpoint_name(checkpoint_date, item_code, warehouse),
+				checkpoint_date,
+				item_code,
+				warehouse,
+				qty,
+				user,
+				user,
+				now,
+				now,
+			)
+			for (item_code, warehouse), qty in balances.items()
+			if flt(qty, 9)
+		],
+	)
+
+
+def update_checkpoints_for_sle(doc, method=None):
+	"""Stock Ledger Entry on_submit: refresh the checkpoints after a back-dated entry."""
+	if not doc.item_code or not doc.warehouse:
+		return
+
+	if not frappe.db.exists(
+		"Stock Closing Checkpoint", {"checkpoint_date": [">=", getdate(doc.posting_date)]}
+	):
+		return
+
+	# qty_after_transaction is set after on_submit, so refresh once the entry is committed
+	frappe.enqueue(
+		"prakash_steel.utils.stock_checkpoint.refresh_item_checkpoints",
+		item_code=doc.item_code,
+		warehouse=doc.warehouse,
+		from_date=doc.posting_date,
+		enqueue_after_commit=True,
+	)
+
+
+def refresh_checkpoints_after_repost(doc, method=None):
+	"""Repost Item Valuation on_change: refresh the reposted item / warehouses once Completed."""
+	if doc.status != "Completed" or not doc.has_value_changed("status"):
+		return
+
+	if doc.based_on == "Item and Warehouse":
+		item_warehouses = [(doc.item_code, doc.warehouse)]
+	else:
+		item_warehouses = frappe.db.sql(
+			"""
+			SELECT DISTINCT item_code, warehouse
+			FROM `tabStock Ledger Entry`
+			WHERE voucher_type = %s AND voucher_no = %s
+			""",
+			(doc.voucher_type, doc.voucher_no),
+		)
+
+	for item_code, warehouse in item_warehouses:
+		if item_code and warehouse:
+			refresh_item_checkpoints(item_code, warehouse, doc.posting_date)
+
+
+def refresh_item_checkpoints(item_code, warehouse, from_date):
+	"""Reset the item / warehouse checkpoints on or after from_date from the stock ledger."""
+	checkpoint_dates = frappe.db.sql_list(
+		"""
+		SELECT DISTINCT checkpoint_date
+		FROM `tabStock Closing Checkpoint`
+		WHERE checkpoint_date >= %s
+		ORDER BY checkpoint_date
+		""",
+		getdate(from_date),
+	)
+
+	now = frappe.utils.now_datetime()
+	user = frappe.session.user
+	for checkpoint_date in checkpoint_dates:
+		name = _checkpoint_name(checkpoint_date, item_code, warehouse)
+		qty = _get_ledger_balances(
+			checkpoint_date,
+			conditions=" AND item_code = %(item_code)s AND warehouse = %(warehouse)s",
+			values={"item_code": item_code, "warehouse": warehouse},
+		).get((item_code, warehouse), 0)
+
+		if not flt(qty, 9):
+			frappe.db.delete("Stock Closing Checkpoint", {"name": name})
+			continue
+
+		frappe.db.sql(
+			"""
+			INSERT INTO `tabStock Closing Checkpoint`
+				(name, checkpoint_date, item_code, warehouse, qty, owner, modified_by, creation, modified)
+			VALUES
+				(%(name)s, %(checkpoint_date)s, %(item_code)s, %(warehouse)s, %(qty)s, %(user)s, %(user)s, %(now)s, %(now)s)
+			ON DUPLICATE KEY UPDATE qty = VALUES(qty), modified = VALUES(modified)
+			""",
+			{
+				"name": name,
+				"checkpoint_date": checkpoint_date,
+				"item_code": item_code,
+				"warehouse": warehouse,
+				"qty": qty,
+				"user": user,
+				"now": now,
+			},
+		)
+
+
+def _get_ledger_balances(to_date, after_date=None, conditions="", values=None):
+	"""
+	Return {(item_code, warehouse): qty_after_transaction} of the last SLE on or before
+	to_date, for the item / warehouses with an SLE after after_date (any, if not given).
+	"""
+	values = {**(values or {}), "to_date": to_date, "after_date": after_date}
+	if after_date:
+		conditions += " AND posting_date > %(after_date)s"
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT item_code, warehouse, qty_after_transaction
+		FROM (
+			SELECT
+				item_code, warehouse, qty_after_transaction,
+				ROW_NUMBER() OVER (
+					PARTITION BY item_code, warehouse
+					ORDER BY posting_date DESC, posting_time DESC, creation DESC
+				) AS row_no
+			FROM `tabStock Ledger Entry`
+			WHERE is_cancelled = 0
+				AND posting_date <= %(to_date)s
+				{conditions}
+		) latest
+		WHERE row_no = 1
+		""",
+		values,
+	)
+	return {(item_code, warehouse): flt(qty) for item_code, warehouse, qty in rows}
+
+
+def _checkpoint_name(checkpoint_date, item_code, warehouse):
+	# Deterministic, so a refresh can upsert the row by primary key
+	return hashlib.md5(f"{checkpoint_date}|{item_code}|{warehouse}".encode()).hexdigest()[:20]
@@ -0,0 +1,113 @@
+# Copyright (c) 2026, beetashoke chakraborty and contributors
+# For license information, please see license.txt
+
+"""
+Streaming XLSX exports for dashboards.
+
+make_xlsx_file writes a header and rows through a write-only openpyxl workbook in one
+pass, applying column number formats as it goes, so rows can come from a generator and
+memory stays flat however long the sheet is.
+
+Exports above BACKGROUND_EXPORT_ROWS are queued with enqueue_xlsx_export: the job builds
+the sheet, saves it as a private File and sends the link to the requesting user with the
+"xlsx_export_ready" realtime event.
+"""
+
+from io import BytesIO
+
+import frappe
+from frappe import _
+from frappe.utils.file_manager import save_file
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Font, PatternFill, Side
+
+BACKGROUND_EXPORT_ROWS = 5000
+
+_HEADER_FONT = Font(bold=True)
+_HEADER_FILL = PatternFill(start_color="D7E4BC", end_color="D7E4BC", fill_type="solid")
+_THIN_SIDE = Side(style="thin")
+_HEADER_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+
+
+def make_xlsx_file(sheet_name, columns, rows, header_style=False):
+	"""
+	Build an XLSX in a single pass and return it as a BytesIO.
+
+	columns: list of dicts with "label" and optionally "number_format" (e.g. "DD-MM-YYYY")
+	rows: iterable of value lists in column order; consumed once
+	header_style: bold, filled and bordered header cells
+	"""
+	workbook = Workbook(write_only=True)
+	worksheet = workbook.create_sheet(title=(sheet_name or "Sheet1")[:31])
+
+	header = []
+	for column in columns:
+		cell = WriteOnlyCell(worksheet, value=column["label"])
+		if header_style:
+			cell.font = _HEADER_FONT
+			cell.fill = _HEADER_FILL
+			cell.border = _HEADER_BORDER
+		header.append(cell)
+	worksheet.append(header)
+
+	formats = [
+		(index, column["number_format"])
+		for index, column in enumerate(columns)
+		if column.get("number_format")
+	]
+	for row in rows:
+		if formats:
+			row = list(row)
+			for index, number_format in formats:
+				if row[index] not in (None, ""):
+					cell = WriteOnlyCell(worksheet, value=row[index])
+					cell.number_format = number_format
+					row[index] = cell
+		worksheet.append(row)
+
+	output = BytesIO()
+	workbook.save(output)
+	output.seek(0)
+	return output
+
+
+def enqueue_xlsx_export(export_method, file_name, **kwargs):
+	"""
+	Queue an export on the long queue. export_method is the dotted path of a function that
+	takes kwargs and returns (sheet_name, columns, rows, header_style) for make_xlsx_file.
+	"""
+	frappe.enqueue(
+		"prakash_steel.utils.xlsx_export.run_xlsx_export",
+		queue="long",
+		timeout=1800,
+		export_method=export_method,
+		file_name=file_name,
+		export_kwargs=kwargs,
+		user=frappe.session.user,
+	)
+	return {"queued": 1}
+
+
+def run_xlsx_export(export_method, file_name, export_kwargs, user):
+	"""Background job: build the sheet, save it as a private File and notify the user."""
+	try:
+		sheet_name, columns, rows, header_style = frappe.get_attr(export_method)(**export_kwargs)
+		content = make_xlsx_file(sheet_name, columns, rows, header_style).getvalue()
+		saved_file = save_file(fname=file_name, content=content, dt=None, dn=None, is_private=1)
+		frappe.db.commit()
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(frappe.get_traceback(), f"XLSX Export Failed: {file_name}")
+		frappe.publish_realtime(
+			"xlsx_export_ready",
+			{"file_name": file_name, "error": _("Export failed, see Error Log")},
+			user=user,
+		)
+		return
+
+	frappe.publish_realtime(
+		"xlsx_export_ready",
+		{"file_name": file_name, "file_url": saved_file.file_url},
+		user=user,
+	)